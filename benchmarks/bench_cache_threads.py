@@ -0,0 +1,89 @@
+"""
+Threaded cache benchmark
+========================
+
+Measures `CacheManager` and `ShardedCacheManager` throughput under a
+read-heavy workload (90% get, 10% set by default) at increasing thread
+counts.
+
+Usage:
+    python benchmarks/bench_cache_threads.py [--threads 1,2,4,8,16]
+        [--ops 100000] [--keys 10000] [--write-ratio 0.1] [--shards 16]
+
+On a GIL build the sharded cache wins by not serializing readers on one
+lock; on free-threaded builds with several cores it should also scale
+with the thread count.
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from typing import Callable, List
+
+from awesome_cli.core.crypto.cache import CacheManager, ShardedCacheManager
+
+
+def run(
+    cache: CacheManager, threads: int, ops: int, keys: int, write_ratio: float
+) -> float:
+    """Run `ops` operations spread across `threads`; return ops/second."""
+    key_names = [f"asset:{i}" for i in range(keys)]
+    cache.set_many({key: {"rank": i} for i, key in enumerate(key_names)})
+    per_thread = ops // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        picks = [rng.randrange(keys) for _ in range(per_thread)]
+        writes = [rng.random() < write_ratio for _ in range(per_thread)]
+        get, set_ = cache.get, cache.set
+        barrier.wait()
+        for index, write in zip(picks, writes, strict=True):
+            if write:
+                set_(key_names[index], {"rank": index})
+            else:
+                get(key_names[index])
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in workers:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in workers:
+        t.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--threads", default="1,2,4,8,16")
+    parser.add_argument("--ops", type=int, default=100_000)
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--shards", type=int, default=16)
+    args = parser.parse_args()
+    thread_counts = [int(n) for n in args.threads.split(",")]
+
+    candidates: List[tuple[str, Callable[[], CacheManager]]] = [
+        ("CacheManager", lambda: CacheManager(max_entries=args.keys * 2)),
+        (
+            f"Sharded x{args.shards}",
+            lambda: ShardedCacheManager(max_entries=args.keys * 2, shards=args.shards),
+        ),
+    ]
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        f"{args.ops} ops over {args.keys} keys, {args.write_ratio:.0%} writes "
+        f"(GIL {'enabled' if gil else 'disabled'})"
+    )
+    print(f"  {'threads':>7}" + "".join(f"  {label:>16}" for label, _ in candidates))
+    for threads in thread_counts:
+        row = [run(factory(), threads, args.ops, args.keys, args.write_ratio)
+               for _, factory in candidates]
+        print(f"  {threads:>7}" + "".join(f"  {rate:>12,.0f} op/s" for rate in row))
+
+
+if __name__ == "__main__":
+    main()
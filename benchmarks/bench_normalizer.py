@@ -0,0 +1,125 @@
+"""
+Normalizer micro-benchmark
+==========================
+
+Compares the original per-field `_normalize_response` implementation with
+the current row normalizer and the columnar variant on synthetic
+`coins/markets` payloads.
+
+Usage:
+    python benchmarks/bench_normalizer.py [--coins 10000] [--repeat 5]
+"""
+
+import argparse
+import functools
+import random
+import timeit
+from typing import Any, Dict, List, Optional
+
+from awesome_cli.core.crypto.normalizer import (
+    normalize_markets,
+    normalize_markets_columnar,
+)
+
+
+def make_payload(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Build synthetic market entries resembling CoinGecko responses."""
+    rng = random.Random(seed)
+    payload = []
+    for i in range(count):
+        price = rng.uniform(0.0001, 60000)
+        payload.append({
+            "id": f"coin-{i}",
+            "symbol": f"c{i}",
+            "name": f"Coin {i}",
+            "image": f"https://example.invalid/{i}.png",
+            "current_price": price,
+            "market_cap": price * rng.randint(1_000, 10_000_000),
+            "market_cap_rank": i + 1,
+            # Mix of ints, strings and None, like real payloads
+            "total_volume": rng.choice(
+                [rng.uniform(1, 1e9), rng.randint(1, 10**9), None]
+            ),
+            "high_24h": price * 1.05,
+            "low_24h": str(price * 0.95),
+            "price_change_percentage_24h": rng.uniform(-20, 20),
+            "price_change_percentage_7d_in_currency": rng.uniform(-40, 40),
+            "ath": price * 2,
+            "atl": price / 2,
+            "last_updated": "2024-01-01T00:00:00.000Z",
+        })
+    return payload
+
+
+def _legacy_to_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def legacy_normalize(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The pre-schema implementation, kept here as the baseline."""
+    normalized_data = []
+    for item in data:
+        try:
+            if not item.get("id") or not item.get("symbol"):
+                continue
+            coin = {
+                "id": item.get("id"),
+                "symbol": item.get("symbol", "").upper(),
+                "name": item.get("name"),
+                "image": item.get("image"),
+                "current_price": _legacy_to_float(item.get("current_price")),
+                "market_cap": _legacy_to_float(item.get("market_cap")),
+                "market_cap_rank": item.get("market_cap_rank"),
+                "total_volume": _legacy_to_float(item.get("total_volume")),
+                "high_24h": _legacy_to_float(item.get("high_24h")),
+                "low_24h": _legacy_to_float(item.get("low_24h")),
+                "price_change_percentage_24h": _legacy_to_float(
+                    item.get("price_change_percentage_24h")
+                ),
+                "price_change_percentage_7d_in_currency": _legacy_to_float(
+                    item.get("price_change_percentage_7d_in_currency")
+                ),
+                "ath": _legacy_to_float(item.get("ath")),
+                "atl": _legacy_to_float(item.get("atl")),
+                "last_updated": item.get("last_updated"),
+            }
+            normalized_data.append(coin)
+        except Exception:
+            continue
+    return normalized_data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--coins", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = make_payload(args.coins)
+    assert legacy_normalize(payload) == normalize_markets(payload)
+
+    candidates = [
+        ("legacy", legacy_normalize),
+        ("rows", normalize_markets),
+        ("columnar", normalize_markets_columnar),
+    ]
+    baseline = None
+    print(f"Normalizing {args.coins} synthetic coins (best of {args.repeat})")
+    for label, func in candidates:
+        run = functools.partial(func, payload)
+        best = min(timeit.repeat(run, number=5, repeat=args.repeat)) / 5
+        baseline = baseline or best
+        per_coin_us = best / args.coins * 1e6
+        print(
+            f"  {label:<18} {best * 1000:8.2f} ms  {per_coin_us:6.2f} us/coin  "
+            f"{baseline / best:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+End-to-end refresh benchmark
+============================
+
+Drives the fetchers and `CryptoDataScheduler.refresh_now` against the local
+CoinGecko stand-in and reports refresh latency and throughput.
+
+Usage:
+    python benchmarks/bench_refresh.py [--coins 2000] [--latency 0.05]
+        [--rounds 5] [--error-rate 0.0] [--recording markets.json]
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.async_fetcher import AsyncCryptoDataFetcher
+from awesome_cli.core.crypto.fetcher import CryptoDataFetcher
+from awesome_cli.core.crypto.repository import CryptoAssetRepository
+from awesome_cli.core.crypto.scheduler import CryptoDataScheduler
+from awesome_cli.core.crypto.standin import CoinGeckoStandIn, synthetic_markets
+
+
+def measure(
+    label: str,
+    rounds: int,
+    coins: int,
+    func: Callable[[], object],
+    setup: Optional[Callable[[], object]] = None,
+) -> None:
+    """Time `func` over `rounds` calls; `setup` runs untimed before each."""
+    timings: List[float] = []
+    for _ in range(rounds):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    p50 = statistics.median(timings)
+    worst = max(timings)
+    print(
+        f"  {label:<28} p50 {p50 * 1000:8.1f} ms  max {worst * 1000:8.1f} ms  "
+        f"{coins / p50:10.0f} coins/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--coins", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--rate-limit", type=int, default=60_000, help="requests/minute"
+    )
+    parser.add_argument("--recording", help="serve a recorded coins/markets JSON list")
+    args = parser.parse_args()
+
+    standin_kwargs = dict(latency=args.latency, error_rate=args.error_rate, seed=1)
+    if args.recording:
+        standin = CoinGeckoStandIn.from_recording(args.recording, **standin_kwargs)
+    else:
+        standin = CoinGeckoStandIn(
+            coins=synthetic_markets(args.coins), **standin_kwargs
+        )
+
+    tmp_dir = tempfile.mkdtemp()
+    repository: Optional[CryptoAssetRepository] = None
+    try:
+        with standin:
+            settings = CryptoSettings(
+                coingecko_api_base_url=standin.base_url,
+                coingecko_rate_limit_requests=args.rate_limit,
+                coingecko_rate_limit_burst=args.concurrency,
+                coingecko_max_concurrency=args.concurrency,
+                scheduler_coin_limit=args.coins,
+                storage_path=str(Path(tmp_dir) / "assets.json"),
+            )
+            sync_fetcher = CryptoDataFetcher(settings)
+            async_fetcher = AsyncCryptoDataFetcher(settings)
+            repository = CryptoAssetRepository(settings)
+            scheduler = CryptoDataScheduler(settings, async_fetcher, repository)
+            base_coins = standin.coins
+            ticks = 0
+
+            print(
+                f"{args.coins} coins, {args.latency * 1000:.0f} ms latency, "
+                f"concurrency {args.concurrency}, {args.rounds} rounds"
+            )
+            measure(
+                "sequential streamed pages",
+                args.rounds,
+                args.coins,
+                lambda: sum(1 for _ in sync_fetcher.iter_top_coins(limit=args.coins)),
+            )
+            measure(
+                "async concurrent pages",
+                args.rounds,
+                args.coins,
+                lambda: async_fetcher.fetch_top_coins(limit=args.coins),
+            )
+
+            def price_tick() -> None:
+                # Every page changes, so each refresh fetches and applies data
+                nonlocal ticks
+                ticks += 1
+                factor = 1.0 + ticks / 1000.0
+                standin.set_coins([
+                    dict(coin, current_price=(coin.get("current_price") or 1) * factor)
+                    for coin in base_coins
+                ])
+
+            measure(
+                "refresh_now (changed)",
+                args.rounds,
+                args.coins,
+                scheduler.refresh_now,
+                setup=price_tick,
+            )
+            scheduler.refresh_now()
+            measure(
+                "refresh_now (unchanged)",
+                args.rounds,
+                args.coins,
+                scheduler.refresh_now,
+            )
+
+            print(
+                f"  stand-in served {standin.request_count} requests, "
+                f"{standin.error_count} injected 429s, "
+                f"{standin.not_modified_count} 304s"
+            )
+    finally:
+        # Stop the write-behind flusher before deleting its files
+        if repository is not None:
+            repository.close()
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
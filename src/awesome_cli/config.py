@@ -6,7 +6,7 @@ import logging
 import os
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional, Type, TypeVar
+from typing import Any, Dict, List, Optional, Type, TypeVar
 
 from awesome_cli.utils.paths import get_data_dir
 
@@ -44,11 +44,57 @@ class CryptoSettings:
     coingecko_api_base_url: str = "https://api.coingecko.com/api/v3"
     coingecko_request_timeout: int = 10
     coingecko_rate_limit_requests: int = 50
+    coingecko_rate_limit_burst: int = 5
+    coingecko_max_concurrency: int = 4
+    # Decode market responses incrementally instead of loading them whole
+    coingecko_stream_responses: bool = False
+    # When set, all processes using this file share one rate-limit budget
+    rate_limit_state_path: Optional[str] = None
     cache_ttl_minutes: int = 5
     cache_ttl_metadata_hours: int = 24
+    # Default minutes after the TTL during which values are served stale while
+    # refreshed (0 disables); callers can also opt in per entry
+    cache_stale_ttl_minutes: float = 0.0
+    # In-memory cache bounds (0 disables a bound) and eviction policy (lru/lfu)
+    cache_max_entries: int = 10_000
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_eviction_policy: str = "lru"
+    # Lock-striped segments of the in-process cache (1 disables sharding)
+    cache_shards: int = 16
+    # Seconds between background sweeps of expired entries (0 disables)
+    cache_sweep_interval_seconds: float = 30.0
+    # Max seconds a worker serves its local copy of a Redis-cached value
+    cache_l1_ttl_seconds: float = 30.0
+    # SQLite file for a cache tier that survives restarts (None disables)
+    cache_disk_path: Optional[str] = None
+    cache_disk_flush_seconds: float = 1.0
     scheduler_interval_minutes: int = 5
+    scheduler_coin_limit: int = 50
+    # Every Nth scheduled refresh fetches unconditionally and removes assets
+    # that left the top list (0 disables removals)
+    scheduler_full_refresh_every: int = 12
+    # Quote currencies fetched on each refresh; the first one is the base
+    quote_currencies: List[str] = field(default_factory=lambda: ["usd"])
+    # Days per historical backfill request (<= 90 keeps hourly granularity)
+    backfill_chunk_days: int = 90
+    # Relative difference below which a float field counts as unchanged
+    change_tolerance: float = 1e-9
     # Default to user data directory, avoid relative paths
     storage_path: str = str(get_data_dir("awesome_cli") / "crypto_assets.json")
+    # Window in which repository writes coalesce into one background save
+    # (0 saves synchronously on every write)
+    storage_write_behind_seconds: float = 1.0
+    # "json" rewrites one file per save; "journal" appends changed records
+    # and compacts into a snapshot past either journal threshold; "sqlite"
+    # keeps assets in an indexed database (storage_sqlite_path); "binary"
+    # memory-maps a compact snapshot (storage_binary_path) for fast startup
+    storage_mode: str = "json"
+    storage_journal_max_bytes: int = 8 * 1024 * 1024
+    storage_journal_max_records: int = 100_000
+    # Defaults to storage_path with a .db suffix
+    storage_sqlite_path: Optional[str] = None
+    # Defaults to storage_path with a .bin suffix
+    storage_binary_path: Optional[str] = None
     redis_url: Optional[str] = None
     use_redis: bool = False
 
@@ -108,18 +154,112 @@ def load_settings(config_path: Optional[str] = None) -> Settings:
     crypto_dict["coingecko_rate_limit_requests"] = get_env_safe(
         "AWESOME_CLI_COINGECKO_RATE_LIMIT_REQUESTS", crypto_dict["coingecko_rate_limit_requests"], int
     )
+    crypto_dict["coingecko_rate_limit_burst"] = get_env_safe(
+        "AWESOME_CLI_COINGECKO_RATE_LIMIT_BURST",
+        crypto_dict["coingecko_rate_limit_burst"],
+        int,
+    )
+    crypto_dict["rate_limit_state_path"] = os.getenv(
+        "AWESOME_CLI_RATE_LIMIT_STATE_PATH", crypto_dict["rate_limit_state_path"]
+    )
+    crypto_dict["coingecko_max_concurrency"] = get_env_safe(
+        "AWESOME_CLI_COINGECKO_MAX_CONCURRENCY",
+        crypto_dict["coingecko_max_concurrency"],
+        int,
+    )
+    crypto_dict["coingecko_stream_responses"] = get_env_safe(
+        "AWESOME_CLI_COINGECKO_STREAM_RESPONSES",
+        crypto_dict["coingecko_stream_responses"],
+        bool,
+    )
     crypto_dict["cache_ttl_minutes"] = get_env_safe(
         "AWESOME_CLI_CACHE_TTL_MINUTES", crypto_dict["cache_ttl_minutes"], int
     )
     crypto_dict["cache_ttl_metadata_hours"] = get_env_safe(
         "AWESOME_CLI_CACHE_TTL_METADATA_HOURS", crypto_dict["cache_ttl_metadata_hours"], int
     )
+    crypto_dict["cache_stale_ttl_minutes"] = get_env_safe(
+        "AWESOME_CLI_CACHE_STALE_TTL_MINUTES",
+        crypto_dict["cache_stale_ttl_minutes"],
+        float,
+    )
+    crypto_dict["cache_max_entries"] = get_env_safe(
+        "AWESOME_CLI_CACHE_MAX_ENTRIES", crypto_dict["cache_max_entries"], int
+    )
+    crypto_dict["cache_max_bytes"] = get_env_safe(
+        "AWESOME_CLI_CACHE_MAX_BYTES", crypto_dict["cache_max_bytes"], int
+    )
+    crypto_dict["cache_eviction_policy"] = os.getenv(
+        "AWESOME_CLI_CACHE_EVICTION_POLICY", crypto_dict["cache_eviction_policy"]
+    ).lower()
+    crypto_dict["cache_shards"] = get_env_safe(
+        "AWESOME_CLI_CACHE_SHARDS", crypto_dict["cache_shards"], int
+    )
+    crypto_dict["cache_sweep_interval_seconds"] = get_env_safe(
+        "AWESOME_CLI_CACHE_SWEEP_INTERVAL_SECONDS",
+        crypto_dict["cache_sweep_interval_seconds"],
+        float,
+    )
+    crypto_dict["cache_l1_ttl_seconds"] = get_env_safe(
+        "AWESOME_CLI_CACHE_L1_TTL_SECONDS", crypto_dict["cache_l1_ttl_seconds"], float
+    )
+    crypto_dict["cache_disk_path"] = os.getenv(
+        "AWESOME_CLI_CACHE_DISK_PATH", crypto_dict["cache_disk_path"]
+    )
+    crypto_dict["cache_disk_flush_seconds"] = get_env_safe(
+        "AWESOME_CLI_CACHE_DISK_FLUSH_SECONDS",
+        crypto_dict["cache_disk_flush_seconds"],
+        float,
+    )
     crypto_dict["scheduler_interval_minutes"] = get_env_safe(
         "AWESOME_CLI_SCHEDULER_INTERVAL_MINUTES", crypto_dict["scheduler_interval_minutes"], int
     )
+    crypto_dict["scheduler_coin_limit"] = get_env_safe(
+        "AWESOME_CLI_SCHEDULER_COIN_LIMIT", crypto_dict["scheduler_coin_limit"], int
+    )
+    crypto_dict["scheduler_full_refresh_every"] = get_env_safe(
+        "AWESOME_CLI_SCHEDULER_FULL_REFRESH_EVERY",
+        crypto_dict["scheduler_full_refresh_every"],
+        int,
+    )
+    quote_currencies = os.getenv("AWESOME_CLI_QUOTE_CURRENCIES")
+    if quote_currencies:
+        crypto_dict["quote_currencies"] = [
+            c.strip().lower() for c in quote_currencies.split(",") if c.strip()
+        ]
+    crypto_dict["backfill_chunk_days"] = get_env_safe(
+        "AWESOME_CLI_BACKFILL_CHUNK_DAYS", crypto_dict["backfill_chunk_days"], int
+    )
+    crypto_dict["change_tolerance"] = get_env_safe(
+        "AWESOME_CLI_CHANGE_TOLERANCE", crypto_dict["change_tolerance"], float
+    )
     crypto_dict["storage_path"] = os.getenv(
         "AWESOME_CLI_STORAGE_PATH", crypto_dict["storage_path"]
     )
+    crypto_dict["storage_write_behind_seconds"] = get_env_safe(
+        "AWESOME_CLI_STORAGE_WRITE_BEHIND_SECONDS",
+        crypto_dict["storage_write_behind_seconds"],
+        float,
+    )
+    crypto_dict["storage_mode"] = os.getenv(
+        "AWESOME_CLI_STORAGE_MODE", crypto_dict["storage_mode"]
+    ).lower()
+    crypto_dict["storage_journal_max_bytes"] = get_env_safe(
+        "AWESOME_CLI_STORAGE_JOURNAL_MAX_BYTES",
+        crypto_dict["storage_journal_max_bytes"],
+        int,
+    )
+    crypto_dict["storage_journal_max_records"] = get_env_safe(
+        "AWESOME_CLI_STORAGE_JOURNAL_MAX_RECORDS",
+        crypto_dict["storage_journal_max_records"],
+        int,
+    )
+    crypto_dict["storage_sqlite_path"] = os.getenv(
+        "AWESOME_CLI_STORAGE_SQLITE_PATH", crypto_dict["storage_sqlite_path"]
+    )
+    crypto_dict["storage_binary_path"] = os.getenv(
+        "AWESOME_CLI_STORAGE_BINARY_PATH", crypto_dict["storage_binary_path"]
+    )
     crypto_dict["redis_url"] = os.getenv(
         "AWESOME_CLI_REDIS_URL", crypto_dict["redis_url"]
     )
@@ -0,0 +1,204 @@
+"""
+Async Crypto Data Fetcher
+=========================
+
+Asyncio-based variant of `CryptoDataFetcher` that pulls many
+`coins/markets` pages concurrently.
+
+The HTTP calls still go through the shared `requests` session (and therefore
+its retry policy), but each page runs in a worker thread so a full-universe
+refresh takes roughly as long as the slowest page instead of the sum of all
+pages. Each page waits for a rate-limiter token on the event loop first.
+"""
+
+import asyncio
+import logging
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from awesome_cli.core.crypto.fetcher import MAX_PER_PAGE, CryptoDataFetcher
+from awesome_cli.core.crypto.quotes import merge_currency_quotes
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCryptoDataFetcher(CryptoDataFetcher):
+    """
+    Fetcher that splits large requests into concurrent page pulls.
+    Drop-in replacement for `CryptoDataFetcher`: `fetch_top_coins` keeps the
+    same signature and return shape, so the scheduler and repository can
+    consume it unchanged.
+    """
+
+    def fetch_top_coins(
+        self, limit: int = 50, currency: str = "usd", if_changed: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch top coins by trading volume, pulling pages concurrently.
+        Must not be called from a running event loop; use
+        `fetch_top_coins_async` there instead.
+        """
+        return asyncio.run(
+            self.fetch_top_coins_async(
+                limit=limit, currency=currency, if_changed=if_changed
+            )
+        )
+
+    async def fetch_top_coins_async(
+        self, limit: int = 50, currency: str = "usd", if_changed: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch top coins by trading volume.
+
+        Args:
+            limit: Number of coins to fetch (default 50). May exceed 250.
+            currency: Target currency (default 'usd').
+            if_changed: Make conditional page requests. Only coins from pages
+                that changed are returned; None if no page changed.
+
+        Returns:
+            List of normalized coin dictionaries, ordered by page.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        coins, _ = await self._fetch_pages(semaphore, limit, currency, if_changed)
+        return coins
+
+    def fetch_top_coins_multi(
+        self, currencies: Sequence[str], limit: int = 50, if_changed: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch several quote currencies concurrently and merge them.
+        Must not be called from a running event loop; use
+        `fetch_top_coins_multi_async` there instead.
+        """
+        return asyncio.run(
+            self.fetch_top_coins_multi_async(
+                currencies, limit=limit, if_changed=if_changed
+            )
+        )
+
+    async def fetch_top_coins_multi_async(
+        self, currencies: Sequence[str], limit: int = 50, if_changed: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch top coins in several currencies, sharing one concurrency budget.
+        See `CryptoDataFetcher.fetch_top_coins_multi` for the merged shape;
+        unchanged pages are merged from their last payload.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(
+            *(
+                self._fetch_merge_pages(semaphore, limit, currency, if_changed)
+                for currency in currencies
+            )
+        )
+        if if_changed and not any(changed for _, changed in results):
+            return None
+        return merge_currency_quotes(
+            {
+                currency: coins
+                for currency, (coins, _) in zip(currencies, results, strict=True)
+            },
+            currencies[0],
+        )
+
+    async def _fetch_pages(
+        self,
+        semaphore: asyncio.Semaphore,
+        limit: int,
+        currency: str,
+        if_changed: bool,
+    ) -> Tuple[Optional[List[Dict[str, Any]]], bool]:
+        """
+        Fetch all pages for one currency.
+        Returns the coins (None if no page changed) and whether every page
+        was returned in full.
+        """
+        if limit <= 0:
+            return [], True
+
+        per_page = min(limit, MAX_PER_PAGE)
+        pages = math.ceil(limit / per_page)
+
+        logger.info(
+            f"Fetching top {limit} {currency} coins in {pages} page(s) "
+            f"(concurrency {self.max_concurrency})"
+        )
+        results = await asyncio.gather(
+            *(
+                self._fetch_page_async(
+                    semaphore, currency, per_page, page, if_changed
+                )
+                for page in range(1, pages + 1)
+            )
+        )
+        complete = all(page_coins is not None for page_coins in results)
+        if all(page_coins is None for page_coins in results):
+            return None, False
+        return self._join_pages(results, limit), complete
+
+    async def _fetch_merge_pages(
+        self,
+        semaphore: asyncio.Semaphore,
+        limit: int,
+        currency: str,
+        if_changed: bool,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Fetch all pages for one currency of a merge.
+        Returns the coins, unchanged pages included, and whether any page
+        may have changed (see `CryptoDataFetcher._get_merge_page`).
+        """
+        if limit <= 0:
+            return [], False
+
+        per_page = min(limit, MAX_PER_PAGE)
+        pages = math.ceil(limit / per_page)
+
+        async def fetch_page(page: int) -> Tuple[List[Dict[str, Any]], bool]:
+            params = self._markets_params(currency, per_page=per_page, page=page)
+            async with semaphore:
+                await self.rate_limiter.acquire_async()
+                return await asyncio.to_thread(
+                    self._get_merge_page, params, if_changed
+                )
+
+        results = await asyncio.gather(
+            *(fetch_page(page) for page in range(1, pages + 1))
+        )
+        return (
+            self._join_pages([coins for coins, _ in results], limit),
+            any(changed for _, changed in results),
+        )
+
+    @staticmethod
+    def _join_pages(
+        results: Sequence[Optional[List[Dict[str, Any]]]], limit: int
+    ) -> List[Dict[str, Any]]:
+        # Rankings can shift between page requests, so a coin may show up on
+        # two adjacent pages. Keep the first occurrence.
+        coins: List[Dict[str, Any]] = []
+        seen = set()
+        for page_coins in results:
+            for coin in page_coins or ():
+                if coin["id"] in seen:
+                    continue
+                seen.add(coin["id"])
+                coins.append(coin)
+        return coins[:limit]
+
+    async def _fetch_page_async(
+        self,
+        semaphore: asyncio.Semaphore,
+        currency: str,
+        per_page: int,
+        page: int,
+        if_changed: bool,
+    ) -> Optional[List[Dict[str, Any]]]:
+        params = self._markets_params(currency, per_page=per_page, page=page)
+        async with semaphore:
+            # Wait for a token on the event loop rather than parking a thread
+            await self.rate_limiter.acquire_async()
+            return await asyncio.to_thread(
+                self._get_markets_page, params, if_changed
+            )
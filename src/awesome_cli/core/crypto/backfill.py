@@ -0,0 +1,276 @@
+"""
+Historical Backfill
+===================
+
+Resumable backfill of historical price/volume series on top of
+`CryptoDataFetcher.fetch_market_chart_range`.
+
+A requested date range is split into chunks aligned to multiples of the
+chunk size (so overlapping runs share chunks). Chunks are fetched
+concurrently on a bounded thread pool; the fetcher's rate limiter keeps the
+whole backfill within the request budget. Every completed chunk is written
+atomically to its own checkpoint file, so an interrupted backfill only
+re-fetches the chunks that were missing. Chunks are merged into a single
+sorted series with duplicate timestamps removed, and can be aggregated into
+OHLCV candles for the `/assets/{symbol}/price-series` resource.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.fetcher import CryptoDataFetcher
+
+logger = logging.getLogger(__name__)
+
+# (timestamp in seconds, price, volume)
+Point = Tuple[int, float, Optional[float]]
+
+INTERVALS: Dict[str, int] = {"1h": 3600, "4h": 4 * 3600, "1d": 86400}
+
+# Chunks ending less than this many seconds ago may still receive data
+_SETTLE_SECONDS = 3600
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class BackfillError(RuntimeError):
+    """Raised when some chunks could not be fetched. Completed chunks are kept."""
+
+    def __init__(self, failed: List[Tuple[int, int]], cause: BaseException):
+        super().__init__(f"{len(failed)} chunk(s) failed, first error: {cause}")
+        self.failed = failed
+
+
+def _to_timestamp(value: Any) -> int:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(value)
+
+
+def split_range(start: int, end: int, chunk_seconds: int) -> List[Tuple[int, int]]:
+    """
+    Split [start, end) into chunks aligned to multiples of `chunk_seconds`.
+    The first and last chunks are aligned too, so they may extend past the
+    requested range; callers trim the merged series.
+    """
+    if end <= start:
+        return []
+    first = start - start % chunk_seconds
+    return [
+        (chunk_start, chunk_start + chunk_seconds)
+        for chunk_start in range(first, end, chunk_seconds)
+    ]
+
+
+def merge_points(chunks: Iterable[Iterable[Sequence[Any]]]) -> List[Point]:
+    """
+    Merge chunks (in any order, possibly overlapping) into one series.
+    Later chunks win for duplicate timestamps. The result is sorted.
+    """
+    merged: Dict[int, Point] = {}
+    for chunk in chunks:
+        for ts, price, volume in chunk:
+            merged[int(ts)] = (int(ts), price, volume)
+    return [merged[ts] for ts in sorted(merged)]
+
+
+def to_ohlcv(points: Iterable[Point], interval_seconds: int) -> List[Dict[str, Any]]:
+    """
+    Aggregate a sorted point series into OHLCV candles.
+    Volume is CoinGecko's rolling 24h volume at the last point of the candle.
+    """
+    candles: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    for ts, price, volume in points:
+        if price is None:
+            continue
+        bucket = ts - ts % interval_seconds
+        if current is None or current["timestamp"] != bucket:
+            current = {
+                "timestamp": bucket,
+                "open": price,
+                "high": price,
+                "low": price,
+                "close": price,
+                "volume": volume,
+            }
+            candles.append(current)
+        else:
+            current["high"] = max(current["high"], price)
+            current["low"] = min(current["low"], price)
+            current["close"] = price
+            if volume is not None:
+                current["volume"] = volume
+    return candles
+
+
+class HistoricalBackfill:
+    """
+    Resumable, concurrent historical backfill engine.
+    """
+
+    def __init__(
+        self,
+        settings: CryptoSettings,
+        fetcher: CryptoDataFetcher,
+        checkpoint_dir: Optional[str] = None,
+        chunk_days: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.fetcher = fetcher
+        self.checkpoint_dir = Path(
+            checkpoint_dir or Path(settings.storage_path).parent / "backfill"
+        )
+        # CoinGecko returns hourly data for ranges up to 90 days
+        self.chunk_seconds = (chunk_days or settings.backfill_chunk_days) * 86400
+        self.max_concurrency = max(
+            1, max_concurrency or settings.coingecko_max_concurrency
+        )
+
+    def backfill(
+        self,
+        coin_id: str,
+        start: Any,
+        end: Any,
+        currency: str = "usd",
+    ) -> List[Point]:
+        """
+        Backfill one coin and return the merged series within [start, end).
+
+        Args:
+            coin_id: CoinGecko coin id.
+            start: Range start (datetime or UNIX seconds).
+            end: Range end (datetime or UNIX seconds).
+            currency: Quote currency.
+
+        Raises:
+            BackfillError: If any chunk failed. Re-running resumes from the
+                chunks that were checkpointed.
+        """
+        start_ts, end_ts = _to_timestamp(start), _to_timestamp(end)
+        chunks = split_range(start_ts, end_ts, self.chunk_seconds)
+        series_dir = self._series_dir(coin_id, currency)
+        done = self._load_checkpoints(series_dir)
+        missing = [chunk for chunk in chunks if chunk not in done]
+
+        logger.info(
+            f"Backfilling {coin_id}/{currency}: {len(chunks)} chunk(s), "
+            f"{len(chunks) - len(missing)} already checkpointed"
+        )
+
+        failed: List[Tuple[int, int]] = []
+        first_error: Optional[BaseException] = None
+        if missing:
+            with ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="backfill"
+            ) as executor:
+                futures = {
+                    executor.submit(self._fetch_chunk, coin_id, currency, chunk): chunk
+                    for chunk in missing
+                }
+                for future in as_completed(futures):
+                    chunk = futures[future]
+                    try:
+                        points = future.result()
+                    except Exception as e:
+                        logger.error(
+                            f"Backfill chunk {chunk} for {coin_id} failed: {e}"
+                        )
+                        failed.append(chunk)
+                        first_error = first_error or e
+                        continue
+                    done[chunk] = points
+                    self._write_checkpoint(series_dir, chunk, points)
+
+        if failed:
+            raise BackfillError(sorted(failed), first_error)  # type: ignore[arg-type]
+
+        merged = merge_points(done[chunk] for chunk in sorted(done))
+        return [point for point in merged if start_ts <= point[0] < end_ts]
+
+    def backfill_many(
+        self, coin_ids: Iterable[str], start: Any, end: Any, currency: str = "usd"
+    ) -> Dict[str, List[Point]]:
+        """
+        Backfill several coins one after another, each with concurrent chunks.
+        Coins that fail are logged and omitted; re-running resumes them.
+        """
+        results: Dict[str, List[Point]] = {}
+        for coin_id in coin_ids:
+            try:
+                results[coin_id] = self.backfill(coin_id, start, end, currency)
+            except BackfillError as e:
+                logger.error(f"Backfill for {coin_id} incomplete: {e}")
+        return results
+
+    def price_series(
+        self,
+        coin_id: str,
+        start: Any,
+        end: Any,
+        interval: str = "1d",
+        currency: str = "usd",
+    ) -> List[Dict[str, Any]]:
+        """Backfill a coin and aggregate it into OHLCV candles."""
+        if interval not in INTERVALS:
+            raise ValueError(f"Unsupported interval {interval!r}")
+        points = self.backfill(coin_id, start, end, currency)
+        return to_ohlcv(points, INTERVALS[interval])
+
+    def _fetch_chunk(
+        self, coin_id: str, currency: str, chunk: Tuple[int, int]
+    ) -> List[Point]:
+        data = self.fetcher.fetch_market_chart_range(
+            coin_id, chunk[0], chunk[1], currency=currency
+        )
+        volumes = {int(ms) // 1000: volume for ms, volume in data["total_volumes"]}
+        return [
+            (int(ms) // 1000, price, volumes.get(int(ms) // 1000))
+            for ms, price in data["prices"]
+            if chunk[0] <= int(ms) // 1000 < chunk[1]
+        ]
+
+    def _series_dir(self, coin_id: str, currency: str) -> Path:
+        name = _SAFE_NAME.sub("_", f"{coin_id}-{currency}")
+        return self.checkpoint_dir / name
+
+    def _load_checkpoints(self, series_dir: Path) -> Dict[Tuple[int, int], List[Point]]:
+        done: Dict[Tuple[int, int], List[Point]] = {}
+        if not series_dir.exists():
+            return done
+        for path in series_dir.glob("*.json"):
+            try:
+                chunk_start, chunk_end = (int(part) for part in path.stem.split("-"))
+                with path.open("r", encoding="utf-8") as f:
+                    done[(chunk_start, chunk_end)] = [tuple(p) for p in json.load(f)]
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable backfill checkpoint {path}: {e}")
+        return done
+
+    def _write_checkpoint(
+        self, series_dir: Path, chunk: Tuple[int, int], points: List[Point]
+    ) -> None:
+        # The most recent chunk may still grow; fetch it again next time
+        if chunk[1] > time.time() - _SETTLE_SECONDS:
+            return
+        try:
+            series_dir.mkdir(parents=True, exist_ok=True)
+            path = series_dir / f"{chunk[0]}-{chunk[1]}.json"
+            temp_path = path.with_suffix(".tmp")
+            with temp_path.open("w", encoding="utf-8") as f:
+                json.dump(points, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.error(f"Failed to checkpoint backfill chunk {chunk}: {e}")
@@ -0,0 +1,430 @@
+"""
+Binary Asset Snapshots
+======================
+
+Compact, memory-mapped snapshot format for `storage_mode = "binary"`.
+
+Loading a JSON snapshot parses every record on every process start, once
+per worker. A binary snapshot is instead mapped with `mmap` and decoded
+lazily: opening one reads a small header, and a record is only decoded
+(and then cached) when it is first requested, so startup cost does not
+grow with the size of the asset universe. The pages are shared by every
+process mapping the same file.
+
+Layout (little-endian; every section starts on an 8-byte boundary):
+
+*   header: magic, version and the length of a JSON metadata block that
+    names the columns and gives each section's offset;
+*   float columns: one `f64` per record for each numeric field in
+    `FLOAT_FIELDS`, plus a byte per record and field marking the value
+    as absent, a float or an int;
+*   string columns: one `u32` string-table reference per record for each
+    field in `STRING_FIELDS` (0 = absent);
+*   extras: a `u32` reference per record to a JSON object holding any
+    field that does not fit a column (nested quotes, metadata, nulls);
+*   orders: for each `SORT_FIELDS` name, all record numbers in that order,
+    so top-N queries need no sorting at startup;
+*   string table: `u32` end offsets followed by deduplicated UTF-8 data.
+
+Records are stored sorted by symbol, so a symbol is found by binary search.
+Snapshots are written to a temp file and moved into place; processes that
+already mapped the old file keep reading it until they reopen.
+"""
+
+import json
+import logging
+import mmap
+import os
+import shutil
+import struct
+from bisect import bisect_left
+from collections.abc import ValuesView
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+from awesome_cli.core.crypto.normalizer import FLOAT, MARKET_SCHEMA
+from awesome_cli.core.crypto.ranking import SORT_FIELDS, build_indexes
+from awesome_cli.core.crypto.storage import AssetStore, JSONFileStore, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+Asset = Dict[str, Any]
+
+MAGIC = b"AWCS"
+VERSION = 1
+
+# Columnar fields; anything else is kept in the record's JSON extras
+FLOAT_FIELDS = tuple(name for name, kind in MARKET_SCHEMA if kind == FLOAT) + (
+    "market_cap_rank",
+)
+STRING_FIELDS = tuple(
+    name for name, kind in MARKET_SCHEMA if kind != FLOAT and name not in FLOAT_FIELDS
+)
+
+# Float column cell kinds
+_ABSENT, _FLOAT, _INT = 0, 1, 2
+# Largest int a float column holds exactly
+_MAX_EXACT_INT = 2 ** 53
+
+_PREFIX = struct.Struct("<4sII")  # magic, version, metadata length
+_F64 = struct.Struct("<d")
+_U32 = struct.Struct("<I")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class _StringTable:
+    """Deduplicating string table; references are 1-based (0 = absent)."""
+
+    def __init__(self) -> None:
+        self.refs: Dict[str, int] = {}
+        self.chunks: List[bytes] = []
+
+    def ref(self, value: str) -> int:
+        ref = self.refs.get(value)
+        if ref is None:
+            self.chunks.append(value.encode("utf-8"))
+            ref = self.refs[value] = len(self.chunks)
+        return ref
+
+    def encode(self) -> bytes:
+        ends = bytearray()
+        end = 0
+        for chunk in self.chunks:
+            end += len(chunk)
+            ends += _U32.pack(end)
+        return bytes(ends) + b"".join(self.chunks)
+
+
+def encode_snapshot(assets: Iterable[Asset]) -> bytes:
+    """Encode asset records (skipping those without a string `symbol`)."""
+    by_symbol = {
+        asset["symbol"]: asset for asset in assets
+        if isinstance(asset, dict) and isinstance(asset.get("symbol"), str)
+    }
+    symbols = sorted(by_symbol)
+    records = [by_symbol[symbol] for symbol in symbols]
+    count = len(records)
+    strings = _StringTable()
+
+    floats = [bytearray(8 * count) for _ in FLOAT_FIELDS]
+    kinds = bytearray(count * len(FLOAT_FIELDS))
+    string_refs = [bytearray(4 * count) for _ in STRING_FIELDS]
+    extras = bytearray(4 * count)
+    for i, asset in enumerate(records):
+        rest = dict(asset)
+        for f, field in enumerate(FLOAT_FIELDS):
+            value = rest.get(field)
+            if isinstance(value, float):
+                kind = _FLOAT
+            elif (
+                isinstance(value, int) and not isinstance(value, bool)
+                and abs(value) <= _MAX_EXACT_INT
+            ):
+                kind = _INT
+            else:
+                continue  # absent, or kept in extras
+            _F64.pack_into(floats[f], 8 * i, value)
+            kinds[i * len(FLOAT_FIELDS) + f] = kind
+            del rest[field]
+        for s, field in enumerate(STRING_FIELDS):
+            value = rest.get(field)
+            if isinstance(value, str):
+                _U32.pack_into(string_refs[s], 4 * i, strings.ref(value))
+                del rest[field]
+        if rest:
+            extra = json.dumps(rest, separators=(",", ":"))
+            _U32.pack_into(extras, 4 * i, strings.ref(extra))
+
+    position = {symbol: i for i, symbol in enumerate(symbols)}
+    orders: List[Tuple[str, bytes]] = []
+    for name, index in build_indexes(by_symbol).items():
+        ranked = bytearray(4 * count)
+        for rank, symbol in enumerate(index.top()):
+            _U32.pack_into(ranked, 4 * rank, position[symbol])
+        orders.append((name, bytes(ranked)))
+
+    sections: List[bytes] = []
+    section_names: List[str] = []
+    for field, column in zip(FLOAT_FIELDS, floats, strict=True):
+        section_names.append(f"float:{field}")
+        sections.append(bytes(column))
+    section_names.append("kinds")
+    sections.append(bytes(kinds))
+    for field, column in zip(STRING_FIELDS, string_refs, strict=True):
+        section_names.append(f"string:{field}")
+        sections.append(bytes(column))
+    section_names.append("extras")
+    sections.append(bytes(extras))
+    for name, order in orders:
+        section_names.append(f"order:{name}")
+        sections.append(order)
+    section_names.append("strings")
+    sections.append(strings.encode())
+
+    # Offsets are relative to the end of the metadata block
+    offsets: Dict[str, int] = {}
+    body = bytearray()
+    for name, data in zip(section_names, sections, strict=True):
+        body += b"\0" * (_align(len(body)) - len(body))
+        offsets[name] = len(body)
+        body += data
+    meta = json.dumps({
+        "count": count,
+        "float_fields": FLOAT_FIELDS,
+        "string_fields": STRING_FIELDS,
+        "orders": [name for name, _ in orders],
+        "strings": len(strings.chunks),
+        "offsets": offsets,
+    }, separators=(",", ":")).encode("utf-8")
+    header = _PREFIX.pack(MAGIC, VERSION, len(meta)) + meta
+    return header + b"\0" * (_align(len(header)) - len(header)) + bytes(body)
+
+
+def write_binary_snapshot(path: Path, assets: Iterable[Asset]) -> None:
+    """Atomically replace `path` with a binary snapshot of `assets`."""
+    data = encode_snapshot(assets)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Not `.tmp`: that is the JSON store's temp file for the same stem
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    try:
+        with temp_path.open("wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.move(str(temp_path), str(path))
+    except BaseException:
+        if temp_path.exists():
+            try:
+                temp_path.unlink()
+            except Exception:
+                pass
+        raise
+
+
+class _Symbols:
+    """Record symbols in storage (sorted) order, for binary search."""
+
+    def __init__(self, snapshot: "BinarySnapshot"):
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    def __getitem__(self, i: int) -> str:
+        return self._snapshot.symbol(i)
+
+
+class SymbolOrder(Sequence[str]):
+    """A stored ranking: symbols in one `SORT_FIELDS` order, read lazily."""
+
+    def __init__(self, snapshot: "BinarySnapshot", data: mmap.mmap, offset: int):
+        self._snapshot = snapshot
+        self._data = data
+        self._offset = offset
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    @overload
+    def __getitem__(self, position: int) -> str: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> List[str]: ...
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(position, slice):
+            return [self[p] for p in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        record: int = _U32.unpack_from(self._data, self._offset + 4 * position)[0]
+        return self._snapshot.symbol(record)
+
+
+class _Values(ValuesView[Asset]):
+    """Records in storage order, decoded without a symbol lookup each."""
+
+    def __init__(self, snapshot: "BinarySnapshot"):
+        super().__init__(snapshot)
+        self._snapshot = snapshot
+
+    def __iter__(self) -> Iterator[Asset]:
+        for i in range(len(self._snapshot)):
+            yield self._snapshot.record(i)
+
+
+class BinarySnapshot(Mapping[str, Asset]):
+    """
+    Read-only symbol -> asset mapping over a memory-mapped binary snapshot.
+    Records are decoded on first access and cached; they are shared
+    between callers and must not be mutated.
+
+    Raises:
+        ValueError: If the file is not a binary snapshot this version reads.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _PREFIX.size:
+            raise ValueError(f"{self.path} is not a binary asset snapshot")
+        magic, version, meta_length = _PREFIX.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(
+                f"{self.path} is not a version {VERSION} binary asset snapshot"
+            )
+        meta = json.loads(self._map[_PREFIX.size:_PREFIX.size + meta_length])
+        base = _align(_PREFIX.size + meta_length)
+        offsets = {name: base + offset for name, offset in meta["offsets"].items()}
+
+        self._count: int = meta["count"]
+        self._float_fields: List[str] = meta["float_fields"]
+        self._float_offsets = [offsets[f"float:{f}"] for f in self._float_fields]
+        self._kinds = offsets["kinds"]
+        self._string_fields: List[str] = meta["string_fields"]
+        self._string_offsets = [offsets[f"string:{f}"] for f in self._string_fields]
+        self._extras = offsets["extras"]
+        self._string_ends = offsets["strings"]
+        self._string_data = self._string_ends + 4 * meta["strings"]
+        self._orders = {name: offsets[f"order:{name}"] for name in meta["orders"]}
+        self._symbol_column = self._string_fields.index("symbol")
+        self._symbols = _Symbols(self)
+        self._records: Dict[int, Asset] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            yield self.symbol(i)
+
+    def __getitem__(self, symbol: str) -> Asset:
+        i = self._find(symbol)
+        if i is None:
+            raise KeyError(symbol)
+        return self.record(i)
+
+    def __contains__(self, symbol: object) -> bool:
+        return isinstance(symbol, str) and self._find(symbol) is not None
+
+    def values(self) -> ValuesView[Asset]:
+        return _Values(self)
+
+    def _find(self, symbol: str) -> Optional[int]:
+        i = bisect_left(self._symbols, symbol)
+        if i < self._count and self.symbol(i) == symbol:
+            return i
+        return None
+
+    def _string(self, ref: int) -> str:
+        # Entry `ref` spans from the previous entry's end to its own
+        ends = self._string_ends
+        start: int = 0
+        if ref > 1:
+            start = _U32.unpack_from(self._map, ends + 4 * (ref - 2))[0]
+        end: int = _U32.unpack_from(self._map, ends + 4 * (ref - 1))[0]
+        data = self._string_data
+        return self._map[data + start:data + end].decode("utf-8")
+
+    def symbol(self, i: int) -> str:
+        """Symbol of record `i` (records are in symbol order)."""
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        column = self._string_offsets[self._symbol_column]
+        ref: int = _U32.unpack_from(self._map, column + 4 * i)[0]
+        return self._string(ref)
+
+    def record(self, i: int) -> Asset:
+        """Decoded record `i`."""
+        cached = self._records.get(i)
+        if cached is not None:
+            return cached
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        data = self._map
+        asset: Asset = {}
+        ref: int
+        for s, field in enumerate(self._string_fields):
+            ref = _U32.unpack_from(data, self._string_offsets[s] + 4 * i)[0]
+            if ref:
+                asset[field] = self._string(ref)
+        row = self._kinds + i * len(self._float_fields)
+        for f, field in enumerate(self._float_fields):
+            kind = data[row + f]
+            if kind:
+                value: float = _F64.unpack_from(data, self._float_offsets[f] + 8 * i)[0]
+                asset[field] = int(value) if kind == _INT else value
+        ref = _U32.unpack_from(data, self._extras + 4 * i)[0]
+        if ref:
+            asset.update(json.loads(self._string(ref)))
+        # Concurrent readers may both decode; either copy is fine to keep
+        return self._records.setdefault(i, asset)
+
+    def order(self, sort: str) -> SymbolOrder:
+        """All symbols in the stored `sort` order (a `SORT_FIELDS` name)."""
+        return SymbolOrder(self, self._map, self._orders[sort])
+
+    def orders(self) -> Dict[str, Sequence[str]]:
+        """Stored orders for every `SORT_FIELDS` name."""
+        return {name: self.order(name) for name in SORT_FIELDS}
+
+
+class BinaryFileStore(AssetStore):
+    """
+    Memory-mapped binary snapshot, rewritten on every save.
+    `load` returns a lazily decoded `BinarySnapshot`.
+
+    Args:
+        path: Binary snapshot file.
+        json_path: JSON store imported when `path` does not exist yet.
+    """
+
+    def __init__(self, path: str, json_path: Optional[str] = None):
+        self.path = Path(path)
+        self.json_path = Path(json_path) if json_path else None
+
+    def load(self) -> Mapping[str, Asset]:
+        if not self.path.exists():
+            if self.json_path is None or not self.json_path.exists():
+                return {}
+            count = json_to_binary(self.json_path, self.path)
+            logger.info(f"Migrated {count} assets from {self.json_path} to {self.path}")
+        return BinarySnapshot(self.path)
+
+    def save_all(self, assets: List[Asset]) -> None:
+        write_binary_snapshot(self.path, assets)
+        logger.info(f"Saved {len(assets)} assets to {self.path}")
+
+    def close(self) -> None:
+        """Nothing to release; every save is complete when it returns."""
+
+
+def json_to_binary(json_path: Path, binary_path: Path) -> int:
+    """Convert a JSON asset store to a binary snapshot; returns the asset count."""
+    assets = JSONFileStore(str(json_path)).load()
+    write_binary_snapshot(Path(binary_path), assets.values())
+    return len(assets)
+
+
+def binary_to_json(binary_path: Path, json_path: Path) -> int:
+    """Convert a binary snapshot to a JSON asset store; returns the asset count."""
+    assets = list(BinarySnapshot(Path(binary_path)).values())
+    write_snapshot(Path(json_path), assets)
+    return len(assets)
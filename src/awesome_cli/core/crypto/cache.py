@@ -4,69 +4,1034 @@ Cache Manager
 
 Handles caching of crypto data to minimize API calls and improve performance.
 Supports in-memory caching with TTL (Time-To-Live).
+
+The cache can be bounded by entry count and by approximate memory size.
+When either limit is exceeded, entries are evicted by the selected policy:
+
+*   `lru`: least recently used first.
+*   `lfu`: least frequently used first (ties broken by recency).
+
+Both policies keep their bookkeeping in O(1) per get/set.
+
+`ShardedCacheManager` splits keys across lock-striped segments and reads
+without taking a lock, for heavily threaded servers.
+
+`TieredCacheManager` puts this in-process cache (L1) in front of a shared
+`CacheBackend` (L2): Redis so that all workers share one warm cache, or a
+SQLite file so that restarted workers start warm. `create_cache` picks the
+right one from settings.
+
+`get_or_compute` / `aget_or_compute` prevent stampedes on a missing key:
+one caller (thread or coroutine) computes the value while concurrent
+callers for the same key wait for its result.
+
+Entries can also have a stale window after their TTL (`stale_ttl_minutes`).
+Within it, `get_or_compute` returns the stale value immediately and
+refreshes it once in the background, on a small executor owned by the
+cache (or as a task on the caller's loop for `aget_or_compute`); only
+after the window ends does a caller wait for a recompute. Plain `get`
+returns fresh values only unless `allow_stale=True`. Call `shutdown` to
+stop the background threads.
+
+Hits, misses and computes are counted, and compute latency (and a 1 in 16
+sample of get latency) recorded, in per-thread counters (see `stats.py`);
+`stats()` returns a merged snapshot.
+
+Expiry uses the monotonic clock, so wall-clock jumps neither expire nor
+resurrect entries. Expired entries are reclaimed proactively from an expiry
+heap: every `set` sweeps a few due entries, and `start_sweeper` runs a
+background thread that sweeps in short, bounded lock holds.
 """
 
+import asyncio
+import heapq
+import itertools
 import logging
+import sys
 import threading
-from datetime import datetime, timedelta
-from threading import Lock
-from typing import Any, Dict, Optional, Tuple
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.cache_backends import (
+    CacheBackend,
+    RedisBackend,
+    SQLiteBackend,
+    dumps,
+    loads,
+)
+from awesome_cli.core.crypto.stats import StatsRecorder
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+EVICTION_POLICIES = ("lru", "lfu")
+
+# One in (mask + 1) gets has its latency recorded
+_GET_SAMPLE_MASK = 15
+
+# Recent reads remembered per shard until the next write applies them
+READ_BUFFER_SIZE = 1024
+
+# Due entries reclaimed per lock hold by the sweeper, and per set()
+SWEEP_BATCH = 256
+_SET_SWEEP_BATCH = 4
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expiry: float  # time.monotonic() deadline; gone afterwards
+    size: int
+    stale_at: float  # time.monotonic() deadline; served stale afterwards
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Approximate the memory footprint of a value in bytes.
+    Walks containers (a few levels deep); shared objects are counted again.
+    """
+    size = sys.getsizeof(value)
+    if _depth >= 4:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    return size
+
+
+class _LRUPolicy:
+    """Recency order kept in an OrderedDict (oldest first)."""
+
+    def __init__(self) -> None:
+        self._order: "OrderedDict[str, None]" = OrderedDict()
+
+    def add(self, key: str) -> None:
+        self._order[key] = None
+
+    def touch(self, key: str) -> None:
+        self._order.move_to_end(key)
+
+    def remove(self, key: str) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> str:
+        return next(iter(self._order))
+
+    def clear(self) -> None:
+        self._order.clear()
+
+
+class _LFUPolicy:
+    """
+    Frequency buckets, each an OrderedDict in recency order, plus the
+    current minimum frequency.
+    """
+
+    def __init__(self) -> None:
+        self._freq: Dict[str, int] = {}
+        self._buckets: Dict[int, "OrderedDict[str, None]"] = {}
+        self._min_freq = 0
+
+    def add(self, key: str) -> None:
+        self._freq[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_freq = 1
+
+    def touch(self, key: str) -> None:
+        freq = self._freq[key]
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        self._freq[key] = freq + 1
+        self._buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def remove(self, key: str) -> None:
+        freq = self._freq.pop(key, None)
+        if freq is None:
+            return
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq and self._buckets:
+                # Only reached when the last key of the lowest bucket leaves
+                self._min_freq = min(self._buckets)
+
+    def victim(self) -> str:
+        return next(iter(self._buckets[self._min_freq]))
+
+    def clear(self) -> None:
+        self._freq.clear()
+        self._buckets.clear()
+        self._min_freq = 0
+
+
 class CacheManager:
     """
     Simple in-memory cache manager with TTL support.
     Can be extended to support Redis or other backends.
     Thread-safe.
+
+    Args:
+        ttl_minutes: Default time-to-live for entries.
+        max_entries: Maximum number of entries (None or 0 for unbounded).
+        max_bytes: Maximum approximate size of all values (None or 0 for
+            unbounded). Values larger than this are not cached.
+        eviction: Eviction policy, "lru" or "lfu".
+        stale_ttl_minutes: Default window after the TTL during which a value
+            is served stale while it is refreshed (0 disables).
+        refresh_workers: Threads refreshing stale values in the background.
     """
 
-    def __init__(self, ttl_minutes: int = 5):
-        self._cache: Dict[str, Tuple[Any, datetime]] = {}
-        self.default_ttl = timedelta(minutes=ttl_minutes)
+    def __init__(
+        self,
+        ttl_minutes: int = 5,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        eviction: str = "lru",
+        stale_ttl_minutes: float = 0,
+        refresh_workers: int = 2,
+    ):
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy {eviction!r}")
+        self._cache: Dict[str, _Entry] = {}
+        # (expiry, key); may hold stale pairs for overwritten or removed keys
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self.default_ttl = ttl_minutes * 60.0
+        self.default_stale_ttl = stale_ttl_minutes * 60.0
+        self.max_entries = max_entries or None
+        self.max_bytes = max_bytes or None
+        self.eviction = eviction
+        self._policy = _LFUPolicy() if eviction == "lfu" else _LRUPolicy()
+        self._bytes = 0
+        self._evictions = 0
+        self._expirations = 0
         self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._sweeper_stop = threading.Event()
+        # Key -> result of the computation in progress (single-flight)
+        self._inflight: Dict[str, "Future[Any]"] = {}
+        self._inflight_lock = threading.Lock()
+        self.refresh_workers = max(1, refresh_workers)
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
+        self._refresh_tasks: Set["asyncio.Task[Any]"] = set()
+        self._closed = False
+        self._stats = StatsRecorder()
+        self._get_sampler = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._cache)
 
-    def get(self, key: str) -> Optional[Any]:
+    @property
+    def total_bytes(self) -> int:
+        """Approximate size of cached values (tracked only with max_bytes)."""
+        return self._bytes
+
+    @property
+    def evictions(self) -> int:
+        """Entries removed to stay within the size limits."""
+        return self._evictions
+
+    @property
+    def expirations(self) -> int:
+        """Expired entries reclaimed by sweeping."""
+        return self._expirations
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
         """
         Retrieve a value from the cache.
-        Returns None if key doesn't exist or is expired.
+        Returns None if key doesn't exist or is expired (or only stale,
+        unless `allow_stale` is set).
         """
+        # Latency is sampled; counting every get is cheap, timing it is not
+        timed = not next(self._get_sampler) & _GET_SAMPLE_MASK
+        start = time.perf_counter() if timed else 0.0
+        value, fresh = self._lookup(key)
+        if not (fresh or allow_stale):
+            value = None
+        if timed:
+            self._stats.incr_and_observe(
+                "misses" if value is None else "hits",
+                "get",
+                time.perf_counter() - start,
+            )
+        else:
+            self._stats.incr("misses" if value is None else "hits")
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of cache statistics: hit/miss/compute counters, evictions,
+        expirations, current size and get/compute latency percentiles.
+        """
+        snapshot = self._stats.snapshot()
+        counters = snapshot["counters"]
+        hits = counters.get("hits", 0) + counters.get("stale_hits", 0)
+        lookups = hits + counters.get("misses", 0)
+        return {
+            "hits": counters.get("hits", 0),
+            "stale_hits": counters.get("stale_hits", 0),
+            "misses": counters.get("misses", 0),
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "computes": counters.get("computes", 0),
+            "compute_errors": counters.get("compute_errors", 0),
+            "refreshes": counters.get("refreshes", 0),
+            "refresh_errors": counters.get("refresh_errors", 0),
+            **{
+                name: value
+                for name, value in counters.items()
+                if name.startswith("l2_")
+            },
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self),
+            "bytes": self.total_bytes,
+            "latency": snapshot["latency"],
+        }
+
+    def reset_stats(self) -> None:
+        """Zero the hit/miss/compute counters and latency histograms."""
+        self._stats.reset()
+
+    def _lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+        """Return (value, fresh) for an unexpired entry, else (None, False)."""
         with self._lock:
-            if key not in self._cache:
-                logger.debug(f"Cache miss for key: {key}")
-                return None
+            entry = self._cache.get(key)
+            if entry is None:
+                return None, False
 
-            value, expiry = self._cache[key]
-            if datetime.now() > expiry:
-                logger.debug(f"Cache expired for key: {key}")
-                del self._cache[key]
-                return None
+            now = time.monotonic()
+            if now > entry.expiry:
+                self._remove(key)
+                return None, False
 
-            logger.debug(f"Cache hit for key: {key}")
-            return value
+            self._policy.touch(key)
+            return entry.value, now <= entry.stale_at
 
-    def set(self, key: str, value: Any, ttl_minutes: Optional[int] = None) -> None:
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_minutes: Optional[float] = None,
+        stale_ttl_minutes: Optional[float] = None,
+    ) -> None:
         """
-        Store a value in the cache with an optional TTL override.
+        Store a value in the cache with optional TTL and stale window overrides.
+        May evict other entries to stay within the configured limits.
         """
-        if ttl_minutes is not None:
-            ttl = timedelta(minutes=ttl_minutes)
-        else:
-            ttl = self.default_ttl
-        expiry = datetime.now() + ttl
+        ttl = ttl_minutes * 60.0 if ttl_minutes is not None else self.default_ttl
+        stale = (
+            stale_ttl_minutes * 60.0
+            if stale_ttl_minutes is not None
+            else self.default_stale_ttl
+        )
+        self._store(key, value, ttl, ttl + max(0.0, stale))
+
+    def _store(
+        self, key: str, value: Any, fresh_seconds: float, hard_seconds: float
+    ) -> None:
+        """Insert an entry fresh for `fresh_seconds` and kept for `hard_seconds`."""
+        now = time.monotonic()
+        expiry = now + hard_seconds
+        size = estimate_size(value) if self.max_bytes else 0
 
         with self._lock:
-            self._cache[key] = (value, expiry)
+            if key in self._cache:
+                self._remove(key)
+            if self.max_bytes and size > self.max_bytes:
+                logger.debug("Not caching key: %s (%s bytes exceeds limit)", key, size)
+                return
+            # Make room first so a new entry is never its own victim
+            self._evict(extra_entries=1, extra_bytes=size)
+            self._cache[key] = _Entry(value, expiry, size, now + fresh_seconds)
+            self._policy.add(key)
+            self._bytes += size
+            heapq.heappush(self._expiry_heap, (expiry, key))
+            # Amortized reclamation of a few due entries
+            self._sweep_locked(now, _SET_SWEEP_BATCH)
+            if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+                self._compact_heap()
+
+        logger.debug("Cached key: %s (fresh for %ss)", key, fresh_seconds)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Retrieve several values; missing or expired keys are omitted."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl_minutes: Optional[float] = None,
+        stale_ttl_minutes: Optional[float] = None,
+    ) -> None:
+        """Store several values with the same TTL."""
+        for key, value in items.items():
+            self.set(key, value, ttl_minutes, stale_ttl_minutes)
+
+    def get_or_compute(
+        self,
+        key: str,
+        fn: Callable[[], T],
+        ttl_minutes: Optional[float] = None,
+        stale_ttl_minutes: Optional[float] = None,
+    ) -> T:
+        """
+        Return the cached value for `key`, computing and caching it on a miss.
+
+        Only one caller computes a missing key at a time; concurrent callers
+        (threads or coroutines via `aget_or_compute`) wait for and share its
+        result. Exceptions raised by `fn` propagate to every waiter and are
+        not cached. A None result is returned but not cached.
+
+        A stale value is returned immediately while `fn` refreshes it once
+        on the cache's refresh executor. `ttl_minutes` and `stale_ttl_minutes`
+        apply to the computed value, with the cache's defaults if None.
+        """
+        start = time.perf_counter()
+        value, fresh = self._lookup(key)
+        if value is not None:
+            self._stats.incr_and_observe(
+                "hits" if fresh else "stale_hits", "get", time.perf_counter() - start
+            )
+            if not fresh:
+                self._refresh_in_background(key, fn, ttl_minutes, stale_ttl_minutes)
+            return cast(T, value)
+        self._stats.incr("misses")
+        flight, leader = self._join_flight(key)
+        if not leader:
+            return cast(T, flight.result())
+        try:
+            value, fresh = self._lookup(key)  # filled by a flight that just finished?
+            # A fresh entry is never None; otherwise `fn` decides the result
+            result = cast(T, value) if fresh else self._compute(fn)
+            if not fresh and result is not None:
+                self.set(key, result, ttl_minutes, stale_ttl_minutes)
+        except BaseException as e:
+            self._finish_flight(key, flight, error=e)
+            raise
+        self._finish_flight(key, flight, result)
+        return result
+
+    async def aget_or_compute(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        ttl_minutes: Optional[float] = None,
+        stale_ttl_minutes: Optional[float] = None,
+    ) -> T:
+        """
+        Asyncio variant of `get_or_compute`; `fn` is a coroutine function.
+        Shares in-flight computations with threaded callers and other
+        event loops. Stale values are refreshed by a task on the running loop.
+        """
+        start = time.perf_counter()
+        value, fresh = self._lookup(key)
+        if value is not None:
+            self._stats.incr_and_observe(
+                "hits" if fresh else "stale_hits", "get", time.perf_counter() - start
+            )
+            if not fresh:
+                self._arefresh_in_background(
+                    key, fn, ttl_minutes, stale_ttl_minutes
+                )
+            return cast(T, value)
+        self._stats.incr("misses")
+        flight, leader = self._join_flight(key)
+        if not leader:
+            # Shield so a cancelled waiter doesn't cancel the shared flight
+            return cast(T, await asyncio.shield(asyncio.wrap_future(flight)))
+        try:
+            value, fresh = self._lookup(key)
+            result = cast(T, value) if fresh else await self._acompute(fn)
+            if not fresh and result is not None:
+                self.set(key, result, ttl_minutes, stale_ttl_minutes)
+        except BaseException as e:
+            self._finish_flight(key, flight, error=e)
+            raise
+        self._finish_flight(key, flight, result)
+        return result
+
+    def _compute(self, fn: Callable[[], T]) -> T:
+        start = time.perf_counter()
+        try:
+            return fn()
+        except BaseException:
+            self._stats.incr("compute_errors")
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stats.incr_and_observe("computes", "compute", elapsed)
+
+    async def _acompute(self, fn: Callable[[], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        try:
+            return await fn()
+        except BaseException:
+            self._stats.incr("compute_errors")
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stats.incr_and_observe("computes", "compute", elapsed)
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        ttl_minutes: Optional[float],
+        stale_ttl_minutes: Optional[float],
+    ) -> None:
+        if self._closed:
+            return
+        flight, leader = self._join_flight(key)
+        if not leader:
+            return  # a refresh or recompute is already running
+        try:
+            self._executor().submit(
+                self._refresh, key, fn, ttl_minutes, stale_ttl_minutes, flight
+            )
+        except RuntimeError as e:  # executor shut down concurrently
+            self._finish_flight(key, flight, error=e)
 
-        logger.debug(f"Cached key: {key} (expires in {ttl})")
+    def _refresh(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        ttl_minutes: Optional[float],
+        stale_ttl_minutes: Optional[float],
+        flight: "Future[Any]",
+    ) -> None:
+        self._stats.incr("refreshes")
+        try:
+            value = self._compute(fn)
+            if value is not None:
+                self.set(key, value, ttl_minutes, stale_ttl_minutes)
+        except Exception as e:
+            self._stats.incr("refresh_errors")
+            logger.warning(f"Background refresh failed for key {key}: {e}")
+            self._finish_flight(key, flight, error=e)
+            return
+        self._finish_flight(key, flight, value)
+
+    def _arefresh_in_background(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        ttl_minutes: Optional[float],
+        stale_ttl_minutes: Optional[float],
+    ) -> None:
+        if self._closed:
+            return
+        flight, leader = self._join_flight(key)
+        if not leader:
+            return
+        task = asyncio.get_running_loop().create_task(
+            self._arefresh(key, fn, ttl_minutes, stale_ttl_minutes, flight)
+        )
+        # Keep a reference until done so the task isn't garbage collected
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _arefresh(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        ttl_minutes: Optional[float],
+        stale_ttl_minutes: Optional[float],
+        flight: "Future[Any]",
+    ) -> None:
+        self._stats.incr("refreshes")
+        try:
+            value = await self._acompute(fn)
+            if value is not None:
+                self.set(key, value, ttl_minutes, stale_ttl_minutes)
+        except BaseException as e:
+            self._stats.incr("refresh_errors")
+            logger.warning(f"Background refresh failed for key {key}: {e}")
+            self._finish_flight(key, flight, error=e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        self._finish_flight(key, flight, value)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._inflight_lock:
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=self.refresh_workers, thread_name_prefix="cache-refresh"
+                )
+            return self._refresh_executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the sweeper and the refresh executor. Stale values are no
+        longer refreshed in the background afterwards."""
+        self._closed = True
+        self.stop_sweeper()
+        with self._inflight_lock:
+            executor, self._refresh_executor = self._refresh_executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+    def _join_flight(self, key: str) -> Tuple["Future[Any]", bool]:
+        """Return the flight for `key` and whether the caller leads it."""
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._inflight[key] = Future()
+            return flight, True
+
+    def _finish_flight(
+        self,
+        key: str,
+        flight: "Future[Any]",
+        value: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            flight.set_exception(error)
+        else:
+            flight.set_result(value)
 
     def invalidate(self, key: str) -> None:
         """Remove a key from the cache."""
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
+                self._remove(key)
 
     def clear(self) -> None:
         """Clear all cached items."""
         with self._lock:
             self._cache.clear()
+            self._expiry_heap.clear()
+            self._policy.clear()
+            self._bytes = 0
+
+    def sweep(self, batch_size: int = SWEEP_BATCH) -> int:
+        """
+        Reclaim all expired entries, releasing the lock after every
+        `batch_size` entries so readers are never blocked for long.
+
+        Returns:
+            Number of entries removed.
+        """
+        removed = 0
+        while True:
+            with self._lock:
+                before = self._expirations
+                processed = self._sweep_locked(time.monotonic(), batch_size)
+                removed += self._expirations - before
+            if processed < batch_size:
+                return removed
+
+    def start_sweeper(self, interval_seconds: float = 30.0) -> None:
+        """Sweep expired entries every `interval_seconds` on a daemon thread."""
+        if self._sweeper and self._sweeper.is_alive():
+            return
+        self._sweeper_stop.clear()
+        self._sweeper = threading.Thread(
+            target=self._sweep_loop,
+            args=(interval_seconds,),
+            name="cache-sweeper",
+            daemon=True,
+        )
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        """Stop the background sweeper thread, if running."""
+        if self._sweeper:
+            self._sweeper_stop.set()
+            self._sweeper.join()
+            self._sweeper = None
+
+    def _sweep_loop(self, interval_seconds: float) -> None:
+        while not self._sweeper_stop.wait(interval_seconds):
+            try:
+                removed = self.sweep()
+                if removed:
+                    logger.debug(f"Swept {removed} expired cache entries")
+            except Exception as e:
+                logger.error(f"Cache sweep failed: {e}")
+
+    def _sweep_locked(self, now: float, limit: int) -> int:
+        """
+        Pop up to `limit` due heap items and return how many were popped.
+        Caller holds the lock.
+        """
+        heap = self._expiry_heap
+        removed = 0
+        while heap and removed < limit and heap[0][0] <= now:
+            expiry, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            # Skip stale heap items for keys re-set with a new expiry
+            if entry is not None and entry.expiry == expiry:
+                self._remove(key)
+                self._expirations += 1
+            removed += 1
+        return removed
+
+    def _compact_heap(self) -> None:
+        """Drop stale heap items. Caller holds the lock."""
+        self._expiry_heap = [(e.expiry, k) for k, e in self._cache.items()]
+        heapq.heapify(self._expiry_heap)
+
+    def _remove(self, key: str) -> None:
+        entry = self._cache.pop(key)
+        self._policy.remove(key)
+        self._bytes -= entry.size
+
+    def _evict(self, extra_entries: int = 0, extra_bytes: int = 0) -> None:
+        """
+        Evict entries until the limits hold with room for the given extra
+        entries and bytes. Caller holds the lock.
+        """
+        while self._cache and (
+            (self.max_entries and len(self._cache) + extra_entries > self.max_entries)
+            or (self.max_bytes and self._bytes + extra_bytes > self.max_bytes)
+        ):
+            victim = self._policy.victim()
+            self._remove(victim)
+            self._evictions += 1
+
+
+class _Shard(CacheManager):
+    """
+    One segment of a ShardedCacheManager.
+
+    Reads take no lock: entries are immutable tuples and a single dict
+    lookup is atomic, so a reader sees either the old or the new entry.
+    Instead of reordering the eviction policy (which needs the lock), a
+    read appends its key to a bounded deque; the next write replays the
+    buffered reads into the policy before evicting. When reads outpace
+    writes, the oldest buffered reads are dropped, so recency is
+    approximate under heavy read load.
+    """
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._reads: "deque[str]" = deque(maxlen=READ_BUFFER_SIZE)
+
+    def _lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None, False
+        now = time.monotonic()
+        if now > entry.expiry:
+            with self._lock:
+                # Only drop it if no writer replaced it meanwhile
+                if self._cache.get(key) is entry:
+                    self._remove(key)
+            return None, False
+        self._reads.append(key)
+        return entry.value, now <= entry.stale_at
+
+    def _evict(self, extra_entries: int = 0, extra_bytes: int = 0) -> None:
+        # Called with the lock held on every write
+        reads = self._reads
+        cache = self._cache
+        touch = self._policy.touch
+        while reads:
+            try:
+                key = reads.popleft()
+            except IndexError:
+                break
+            if key in cache:
+                touch(key)
+        super()._evict(extra_entries, extra_bytes)
+
+
+class ShardedCacheManager(CacheManager):
+    """
+    Cache split into `shards` independent, lock-striped segments.
+
+    Keys are assigned to a segment by hash; each segment has its own lock,
+    eviction policy, expiry heap and a 1/`shards` share of the size
+    limits. Reads of fresh entries take no lock at all (see `_Shard`), and
+    writes only contend with writes to the same segment. Single-flight
+    computation, stale-while-revalidate and the sweeper work as in
+    `CacheManager`.
+    """
+
+    def __init__(
+        self,
+        ttl_minutes: int = 5,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        eviction: str = "lru",
+        stale_ttl_minutes: float = 0,
+        refresh_workers: int = 2,
+        shards: int = 16,
+    ):
+        super().__init__(
+            ttl_minutes=ttl_minutes,
+            eviction=eviction,
+            stale_ttl_minutes=stale_ttl_minutes,
+            refresh_workers=refresh_workers,
+        )
+        # Round up to a power of two so a mask picks the shard
+        count = 1
+        while count < max(1, shards):
+            count *= 2
+        self._mask = count - 1
+        self.max_entries = max_entries or None
+        self.max_bytes = max_bytes or None
+        self._shards = [
+            _Shard(
+                ttl_minutes=ttl_minutes,
+                max_entries=-(-max_entries // count) if max_entries else None,
+                max_bytes=-(-max_bytes // count) if max_bytes else None,
+                eviction=eviction,
+                stale_ttl_minutes=stale_ttl_minutes,
+            )
+            for _ in range(count)
+        ]
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) & self._mask]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(shard.total_bytes for shard in self._shards)
+
+    @property
+    def evictions(self) -> int:
+        return sum(shard.evictions for shard in self._shards)
+
+    @property
+    def expirations(self) -> int:
+        return sum(shard.expirations for shard in self._shards)
+
+    def _lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+        return self._shards[hash(key) & self._mask]._lookup(key)
+
+    def _store(
+        self, key: str, value: Any, fresh_seconds: float, hard_seconds: float
+    ) -> None:
+        self._shard(key)._store(key, value, fresh_seconds, hard_seconds)
+
+    def invalidate(self, key: str) -> None:
+        self._shard(key).invalidate(key)
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            shard.clear()
+
+    def sweep(self, batch_size: int = SWEEP_BATCH) -> int:
+        return sum(shard.sweep(batch_size) for shard in self._shards)
+
+
+class TieredCacheManager(CacheManager):
+    """
+    In-process L1 cache in front of a shared L2 backend.
+
+    Reads try L1, then fetch every L1 miss (or stale L1 hit) from L2 in one
+    batch and keep the decoded values in L1. Writes go to both tiers; L2
+    entries carry their wall-clock freshness and expiry deadlines so every
+    worker (or a restarted one) agrees on when a value turns stale and when
+    it is gone. L1 entries live at most `l1_ttl_seconds` and never past the
+    L2 expiry, which bounds how long a worker can serve a value another
+    worker has replaced or invalidated. L2 errors are logged
+    and treated as misses, so an unavailable backend degrades to L1 only.
+    Values that are not plain data (see cache_backends.py) are kept in L1
+    only.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl_minutes: int = 5,
+        l1_ttl_seconds: float = 30.0,
+        **kwargs: Any,
+    ):
+        super().__init__(ttl_minutes=ttl_minutes, **kwargs)
+        self.backend = backend
+        self.l1_ttl_seconds = l1_ttl_seconds
+
+    def _lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+        value, fresh = super()._lookup(key)
+        if value is not None and fresh:
+            return value, True
+        # Another worker may have refreshed it
+        remote = self._get_remote([key]).get(key)
+        if remote is not None:
+            return remote
+        return value, False
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        found: Dict[str, Any] = {}
+        missing = []
+        for key in keys:
+            value, fresh = super()._lookup(key)
+            if fresh:
+                found[key] = value
+            else:
+                missing.append(key)
+        if missing:
+            for key, (value, fresh) in self._get_remote(missing).items():
+                if fresh:
+                    found[key] = value
+        return found
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_minutes: Optional[float] = None,
+        stale_ttl_minutes: Optional[float] = None,
+    ) -> None:
+        self.set_many({key: value}, ttl_minutes, stale_ttl_minutes)
+
+    def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl_minutes: Optional[float] = None,
+        stale_ttl_minutes: Optional[float] = None,
+    ) -> None:
+        ttl = ttl_minutes * 60.0 if ttl_minutes is not None else self.default_ttl
+        stale = (
+            stale_ttl_minutes * 60.0
+            if stale_ttl_minutes is not None
+            else self.default_stale_ttl
+        )
+        hard = ttl + max(0.0, stale)
+        # Workers don't share a monotonic clock; L2 carries a wall-clock deadline
+        now = time.time()
+        fresh_until, expires_at = now + ttl, now + hard
+        payloads = {}
+        for key, value in items.items():
+            self._store(
+                key,
+                value,
+                min(ttl, self.l1_ttl_seconds),
+                min(hard, self.l1_ttl_seconds),
+            )
+            try:
+                payloads[key] = dumps((fresh_until, expires_at, value))
+            except TypeError as e:
+                logger.debug(f"Keeping {key} in L1 only: {e}")
+        if not payloads:
+            return
+        try:
+            self.backend.set_many(payloads, hard)
+        except Exception as e:
+            logger.warning(f"L2 cache write failed for {len(payloads)} key(s): {e}")
+
+    def invalidate(self, key: str) -> None:
+        super().invalidate(key)
+        try:
+            self.backend.delete([key])
+        except Exception as e:
+            logger.warning(f"L2 cache delete failed for key {key}: {e}")
+
+    def clear(self) -> None:
+        super().clear()
+        try:
+            self.backend.clear()
+        except Exception as e:
+            logger.warning(f"L2 cache clear failed: {e}")
+
+    def shutdown(self, wait: bool = True) -> None:
+        super().shutdown(wait)
+        self.backend.close()
+
+    def _get_remote(self, keys: List[str]) -> Dict[str, Tuple[Any, bool]]:
+        """Fetch keys from L2 into L1; return key -> (value, fresh)."""
+        try:
+            payloads = self.backend.get_many(keys)
+        except Exception as e:
+            self._stats.incr("l2_errors")
+            logger.warning(f"L2 cache read failed for {len(keys)} key(s): {e}")
+            return {}
+        self._stats.incr("l2_hits", len(payloads))
+        self._stats.incr("l2_misses", len(keys) - len(payloads))
+        found = {}
+        now = time.time()
+        for key, payload in payloads.items():
+            try:
+                fresh_until, expires_at, value = loads(payload)
+            except Exception as e:
+                logger.warning(f"Discarding undecodable L2 entry {key}: {e}")
+                continue
+            # Never keep it in L1 past its L2 expiry (l1_ttl_seconds may be inf)
+            hard = min(expires_at - now, self.l1_ttl_seconds)
+            if hard <= 0:
+                continue
+            remaining = fresh_until - now
+            self._store(key, value, min(max(0.0, remaining), hard), hard)
+            found[key] = (value, remaining > 0)
+        return found
+
+
+def create_cache(settings: CryptoSettings) -> CacheManager:
+    """
+    Build the cache described by settings: a Redis-backed tiered cache when
+    `use_redis` is set (falling back to in-process if redis-py is missing),
+    a disk-backed tiered cache when `cache_disk_path` is set, otherwise an
+    in-process cache, sharded if `cache_shards` > 1.
+    """
+    options: Dict[str, Any] = {
+        "ttl_minutes": settings.cache_ttl_minutes,
+        "max_entries": settings.cache_max_entries,
+        "max_bytes": settings.cache_max_bytes,
+        "eviction": settings.cache_eviction_policy,
+        "stale_ttl_minutes": settings.cache_stale_ttl_minutes,
+    }
+    if settings.use_redis:
+        try:
+            backend = RedisBackend(url=settings.redis_url)
+        except ImportError as e:
+            logger.error(f"{e}; using the in-process cache only")
+        else:
+            logger.info("Using Redis-backed two-tier cache")
+            return TieredCacheManager(
+                backend, l1_ttl_seconds=settings.cache_l1_ttl_seconds, **options
+            )
+    elif settings.cache_disk_path:
+        logger.info(f"Using disk-backed two-tier cache at {settings.cache_disk_path}")
+        return TieredCacheManager(
+            SQLiteBackend(
+                settings.cache_disk_path,
+                flush_interval=settings.cache_disk_flush_seconds,
+            ),
+            # One process owns its L1, so it may live as long as the entry
+            l1_ttl_seconds=float("inf"),
+            **options,
+        )
+    if settings.cache_shards > 1:
+        return ShardedCacheManager(shards=settings.cache_shards, **options)
+    return CacheManager(**options)
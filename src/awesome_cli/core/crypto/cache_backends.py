@@ -0,0 +1,417 @@
+"""
+Cache Backends
+==============
+
+Shared (L2) storage for `TieredCacheManager`.
+
+Backends store opaque bytes with a TTL and work in batches (`get_many`,
+`set_many`) so a tier miss costs one round trip however many keys are
+involved. Values are encoded with `dumps`/`loads`: a short header
+followed by a `marshal` payload, zlib-compressed when large.
+
+*   `RedisBackend`: Redis via `redis-py` (optional dependency), using
+    MGET and pipelined SET ... PX.
+*   `SQLiteBackend`: persistent on-disk tier so restarted workers start
+    warm. Writes are buffered and committed in batches by a background
+    thread; reads are lazy (only the requested keys) and skip expired rows.
+*   `InMemoryBackend`: in-process stand-in with the same semantics, for
+    tests and single-process use.
+
+The shared tiers are read by every worker, so only plain data is stored
+there: None, bool, int, float, complex, str, bytes and lists, tuples,
+dicts, sets and frozensets of them. `loads` never builds anything else,
+so a tampered entry cannot construct arbitrary objects the way a pickle
+could. marshal's format may change between Python versions; the header
+records the version that wrote the entry and `loads` rejects entries from
+any other, so a persistent tier is never decoded by a different marshal.
+"""
+
+import atexit
+import logging
+import marshal
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Header: format marker, flags, then the major/minor Python version whose
+# marshal wrote the payload
+_FORMAT = 0xCA
+_VERSION_TAG = bytes(sys.version_info[:2])
+_HEADER_SIZE = 4
+
+# Header flags
+_ZLIB = 0x02
+
+# Payloads at least this large are compressed
+COMPRESS_THRESHOLD = 1024
+
+_SCALARS = frozenset((type(None), bool, int, float, complex, str, bytes))
+_CONTAINERS = frozenset((list, tuple, set, frozenset))
+
+
+def _check_data(value: Any) -> None:
+    """Raise TypeError unless value is made of plain data types only."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        kind = type(item)
+        if kind is dict:
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif kind in _CONTAINERS:
+            stack.extend(item)
+        elif kind not in _SCALARS:
+            raise TypeError(f"{kind.__name__} values cannot be cached in a shared tier")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value in the compact cache format.
+    Raises TypeError for values that are not plain data.
+    """
+    _check_data(value)
+    payload = marshal.dumps(value)
+    flags = 0
+    if len(payload) >= COMPRESS_THRESHOLD:
+        compressed = zlib.compress(payload, 1)
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= _ZLIB
+    return bytes((_FORMAT, flags)) + _VERSION_TAG + payload
+
+
+def loads(data: bytes) -> Any:
+    """
+    Decode a value produced by `dumps`.
+    Raises ValueError for entries written in another format or by another
+    Python version, and for entries that do not decode to plain data.
+    """
+    if len(data) < _HEADER_SIZE or data[0] != _FORMAT:
+        raise ValueError("not a cache entry")
+    if data[2:_HEADER_SIZE] != _VERSION_TAG:
+        raise ValueError(
+            f"entry written by Python {data[2]}.{data[3]}, "
+            f"this is {sys.version_info[0]}.{sys.version_info[1]}"
+        )
+    payload = data[_HEADER_SIZE:]
+    if data[1] & _ZLIB:
+        payload = zlib.decompress(payload)
+    value = marshal.loads(payload)
+    try:
+        _check_data(value)
+    except TypeError as e:
+        raise ValueError(str(e)) from None
+    return value
+
+
+class CacheBackend(ABC):
+    """Batched byte store with per-key TTLs."""
+
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """Return the stored payloads for the keys that exist."""
+
+    @abstractmethod
+    def set_many(self, items: Dict[str, bytes], ttl_seconds: float) -> None:
+        """Store payloads, all with the same TTL."""
+
+    @abstractmethod
+    def delete(self, keys: Iterable[str]) -> None:
+        """Remove keys."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every key owned by this backend."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release connections."""
+
+
+class InMemoryBackend(CacheBackend):
+    """
+    Thread-safe in-process backend.
+    Behaves like `RedisBackend`, so it doubles as its test stand-in.
+    """
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[bytes, float]] = {}
+        self._lock = threading.Lock()
+        self.round_trips = 0
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        now = time.monotonic()
+        found: Dict[str, bytes] = {}
+        with self._lock:
+            self.round_trips += 1
+            for key in keys:
+                item = self._data.get(key)
+                if item is None:
+                    continue
+                if item[1] <= now:
+                    del self._data[key]
+                    continue
+                found[key] = item[0]
+        return found
+
+    def set_many(self, items: Dict[str, bytes], ttl_seconds: float) -> None:
+        expiry = time.monotonic() + ttl_seconds
+        with self._lock:
+            self.round_trips += 1
+            for key, payload in items.items():
+                self._data[key] = (payload, expiry)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            self.round_trips += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class RedisBackend(CacheBackend):
+    """
+    Redis-backed store shared by every worker pointing at the same server.
+
+    Args:
+        url: Redis URL (e.g. redis://localhost:6379/0).
+        client: Pre-built `redis.Redis`-compatible client; overrides `url`.
+        prefix: Namespace prepended to every key.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        client: Any = None,
+        prefix: str = "awesome_cli:cache:",
+    ):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError(
+                    "RedisBackend requires the 'redis' package "
+                    "(pip install awesome_cli[redis])"
+                ) from e
+            client = redis.Redis.from_url(url or "redis://localhost:6379/0")
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        if not keys:
+            return {}
+        values = self.client.mget([self._key(k) for k in keys])
+        return {
+            key: value
+            for key, value in zip(keys, values, strict=True)
+            if value is not None
+        }
+
+    def set_many(self, items: Dict[str, bytes], ttl_seconds: float) -> None:
+        ttl_ms = int(ttl_seconds * 1000)
+        if not items or ttl_ms <= 0:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, payload in items.items():
+            pipe.set(self._key(key), payload, px=ttl_ms)
+        pipe.execute()
+
+    def delete(self, keys: Iterable[str]) -> None:
+        names = [self._key(k) for k in keys]
+        if names:
+            self.client.delete(*names)
+
+    def clear(self) -> None:
+        batch: List[Any] = []
+        for name in self.client.scan_iter(match=self.prefix + "*", count=500):
+            batch.append(name)
+            if len(batch) >= 500:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
+
+    def close(self) -> None:
+        close = getattr(self.client, "close", None)
+        if close:
+            close()
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    SQLite-file backend that survives restarts.
+
+    Writes are queued in memory and committed by a background thread every
+    `flush_interval` seconds (or as soon as `batch_size` writes are
+    pending) in a single transaction. Reads see queued writes immediately.
+    Expiry is stored as wall-clock time, so entries written before a
+    restart are honoured, or ignored once expired; expired rows are purged
+    by the writer.
+
+    Args:
+        path: Database file; created if missing.
+        flush_interval: Seconds between background commits.
+        batch_size: Pending writes that trigger an early commit.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0, batch_size: int = 500):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, payload BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_expiry ON cache (expires_at)"
+        )
+        self._conn.commit()
+        self._db_lock = threading.Lock()
+        # Key -> (payload, expires_at), or None for a pending delete
+        self._pending: Dict[str, Optional[Tuple[bytes, float]]] = {}
+        # Batch being committed; still visible to readers until it lands
+        self._flushing: Dict[str, Optional[Tuple[bytes, float]]] = {}
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="cache-disk-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        now = time.time()
+        found: Dict[str, bytes] = {}
+        remaining = []
+        with self._pending_lock:
+            for key in keys:
+                if key in self._pending:
+                    item = self._pending[key]
+                elif key in self._flushing:
+                    item = self._flushing[key]
+                else:
+                    remaining.append(key)
+                    continue
+                if item is not None and item[1] > now:
+                    found[key] = item[0]
+        # SQLite limits bound parameters per statement
+        for start in range(0, len(remaining), 500):
+            chunk = remaining[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._db_lock:
+                rows = self._conn.execute(
+                    f"SELECT key, payload FROM cache "
+                    f"WHERE key IN ({placeholders}) AND expires_at > ?",
+                    (*chunk, now),
+                ).fetchall()
+            found.update(rows)
+        return found
+
+    def set_many(self, items: Dict[str, bytes], ttl_seconds: float) -> None:
+        if not items or ttl_seconds <= 0:
+            return
+        expires_at = time.time() + ttl_seconds
+        with self._pending_lock:
+            for key, payload in items.items():
+                self._pending[key] = (payload, expires_at)
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._pending_lock:
+            for key in keys:
+                self._pending[key] = None
+
+    def clear(self) -> None:
+        with self._pending_lock:
+            self._pending.clear()
+            self._flushing = {}
+            with self._db_lock:
+                self._conn.execute("DELETE FROM cache")
+                self._conn.commit()
+
+    def flush(self) -> None:
+        """Commit all pending writes now."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            self._flushing = pending
+        if not pending:
+            return
+        upserts = [
+            (key, item[0], item[1]) for key, item in pending.items() if item is not None
+        ]
+        deletes = [(key,) for key, item in pending.items() if item is None]
+        try:
+            with self._db_lock:
+                with self._conn:
+                    if upserts:
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO cache (key, payload, expires_at) "
+                            "VALUES (?, ?, ?)",
+                            upserts,
+                        )
+                    if deletes:
+                        self._conn.executemany(
+                            "DELETE FROM cache WHERE key = ?", deletes
+                        )
+        except sqlite3.Error as e:
+            logger.error(f"Disk cache flush of {len(pending)} entries failed: {e}")
+        finally:
+            with self._pending_lock:
+                self._flushing = {}
+
+    def purge_expired(self) -> int:
+        """Delete expired rows; returns how many were removed."""
+        with self._db_lock:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "DELETE FROM cache WHERE expires_at <= ?", (time.time(),)
+                )
+        return cursor.rowcount
+
+    def _write_loop(self) -> None:
+        last_purge = time.monotonic()
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                if time.monotonic() - last_purge > 60:
+                    self.purge_expired()
+                    last_purge = time.monotonic()
+            except Exception as e:
+                logger.error(f"Disk cache writer failed: {e}")
+
+    def close(self) -> None:
+        """Flush pending writes and close the database. Idempotent."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._wake.set()
+        self._writer.join()
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+        atexit.unregister(self.close)
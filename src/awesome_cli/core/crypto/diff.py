@@ -0,0 +1,80 @@
+"""
+Change Detection
+================
+
+Field-by-field comparison of asset records, used by the repository to apply
+and persist only the assets that actually changed, and to tell downstream
+caches exactly which symbols to invalidate.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Collection, Dict, FrozenSet
+
+# Fields that change on every tick (or are derived locally) without the
+# asset itself changing
+DEFAULT_IGNORED_FIELDS: FrozenSet[str] = frozenset({"last_updated", "metadata"})
+
+
+@dataclass(frozen=True)
+class ChangeSet:
+    """Symbols added, updated and removed by one repository write."""
+    added: FrozenSet[str] = field(default_factory=frozenset)
+    updated: FrozenSet[str] = field(default_factory=frozenset)
+    removed: FrozenSet[str] = field(default_factory=frozenset)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+    @property
+    def changed(self) -> FrozenSet[str]:
+        """All symbols touched by this change."""
+        return self.added | self.updated | self.removed
+
+    def merge(self, other: "ChangeSet") -> "ChangeSet":
+        """Combine two consecutive changesets."""
+        added = (self.added | other.added) - other.removed
+        removed = (self.removed | other.removed) - other.added
+        updated = (self.updated | other.updated) - added - removed
+        # Re-added after removal within the window is an update
+        updated |= self.removed & other.added
+        added -= self.removed & other.added
+        return ChangeSet(frozenset(added), frozenset(updated), frozenset(removed))
+
+
+def values_equal(a: Any, b: Any, rel_tol: float = 0.0) -> bool:
+    """Compare two field values, allowing relative tolerance on floats."""
+    if a is b or a == b:
+        return True
+    if isinstance(a, float) or isinstance(b, float):
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+            if isinstance(a, bool) or isinstance(b, bool):
+                return False
+            if math.isnan(a) and math.isnan(b):
+                return True
+            return rel_tol > 0 and math.isclose(a, b, rel_tol=rel_tol)
+        return False
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(
+            values_equal(a[k], b[k], rel_tol) for k in a
+        )
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(
+            values_equal(x, y, rel_tol) for x, y in zip(a, b, strict=True)
+        )
+    return False
+
+
+def record_changed(
+    old: Dict[str, Any],
+    new: Dict[str, Any],
+    rel_tol: float = 0.0,
+    ignored: Collection[str] = DEFAULT_IGNORED_FIELDS,
+) -> bool:
+    """Return True if any non-ignored field differs between two records."""
+    for key in old.keys() | new.keys():
+        if key in ignored:
+            continue
+        if not values_equal(old.get(key), new.get(key), rel_tol):
+            return True
+    return False
@@ -15,11 +15,22 @@ Rationale for using CoinGecko:
 
 """
 
+import hashlib
 import logging
 import threading
-import time
-from threading import Lock
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from urllib.parse import urljoin
 
 import requests
@@ -27,28 +38,64 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.normalizer import (
+    normalize_market_item,
+    normalize_markets,
+    to_float,
+)
+from awesome_cli.core.crypto.quotes import merge_currency_quotes
+from awesome_cli.core.crypto.ratelimit import RateLimiter, create_rate_limiter
+from awesome_cli.core.crypto.streaming import iter_json_array
 
 logger = logging.getLogger(__name__)
 
+# CoinGecko caps `per_page` for `coins/markets` at 250.
+MAX_PER_PAGE = 250
+
+
+class _Validators(NamedTuple):
+    """Cache validators remembered for one URL + params combination."""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    digest: bytes
+
+
+class _PageStatus:
+    """Outcome of one streamed `coins/markets` page."""
+
+    def __init__(self) -> None:
+        self.not_modified = False
+        self.items = 0  # array items received, including invalid ones
+
 
 class CryptoDataFetcher:
     """
     Fetcher for cryptocurrency data using CoinGecko API.
     Handles rate limiting, retries, and response parsing.
-    Thread-safe rate limiting.
+    Thread-safe rate limiting via a pluggable `RateLimiter`.
     """
 
-    def __init__(self, settings: CryptoSettings):
+    def __init__(
+        self, settings: CryptoSettings, rate_limiter: Optional[RateLimiter] = None
+    ):
         self.base_url = settings.coingecko_api_base_url
         if not self.base_url.endswith("/"):
             self.base_url += "/"
 
         self.timeout = settings.coingecko_request_timeout
-        # Simple spacing between requests
-        self.rate_limit_delay = 60.0 / settings.coingecko_rate_limit_requests
+        # Token bucket; may be shared between processes (see ratelimit.py)
+        self.rate_limiter = rate_limiter or create_rate_limiter(settings)
+        self.max_concurrency = max(1, settings.coingecko_max_concurrency)
         self.session = self._create_session()
-        self._last_request_time = 0.0
-        self._lock = threading.Lock()
+        # (url, params) -> validators of the last payload returned
+        self._validators: Dict[
+            Tuple[str, Tuple[Tuple[str, Any], ...]], _Validators
+        ] = {}
+        # (url, params) -> last coins of pages fetched for a currency merge
+        self._merge_pages: Dict[
+            Tuple[str, Tuple[Tuple[str, Any], ...]], List[Dict[str, Any]]
+        ] = {}
+        self._validators_lock = threading.Lock()
 
     def _create_session(self) -> requests.Session:
         """Create a requests session with retry logic."""
@@ -64,48 +111,362 @@ class CryptoDataFetcher:
         session.mount("http://", adapter)
         return session
 
-    def _wait_for_rate_limit(self):
-        """Ensure we respect the rate limit by sleeping if necessary."""
-        with self._lock:
-            current_time = time.time()
-            elapsed = current_time - self._last_request_time
-            if elapsed < self.rate_limit_delay:
-                time.sleep(self.rate_limit_delay - elapsed)
-            self._last_request_time = time.time()
+    def _wait_for_rate_limit(self) -> None:
+        """Block until the rate limiter hands out a request token."""
+        self.rate_limiter.acquire()
+
+    def _markets_url(self) -> str:
+        return urljoin(self.base_url, "coins/markets")
+
+    @staticmethod
+    def _markets_params(
+        currency: str, per_page: int, page: int = 1
+    ) -> Dict[str, Any]:
+        # Note: CoinGecko API allows 'per_page' up to 250.
+        return {
+            "vs_currency": currency,
+            "order": "volume_desc",  # Sort by volume as per requirements
+            "per_page": per_page,
+            "page": page,
+            "sparkline": "false",
+            "price_change_percentage": "24h,7d"
+        }
 
-    def fetch_top_coins(self, limit: int = 50, currency: str = "usd") -> List[Dict[str, Any]]:
+    def fetch_top_coins(
+        self, limit: int = 50, currency: str = "usd", if_changed: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
         """
         Fetch top coins by trading volume.
 
         Args:
             limit: Number of coins to fetch (default 50).
             currency: Target currency (default 'usd').
+            if_changed: Send a conditional request and return None when the
+                payload is unchanged since the last conditional fetch.
 
         Returns:
-            List of dictionaries containing coin data.
+            List of dictionaries containing coin data, or None if `if_changed`
+            is set and nothing changed upstream.
         """
-        endpoint = "coins/markets"
-        url = urljoin(self.base_url, endpoint)
+        params = self._markets_params(currency, per_page=limit)
 
-        # Note: CoinGecko API allows 'per_page' up to 250.
+        self._wait_for_rate_limit()
+
+        logger.info(f"Fetching top {limit} coins from {self._markets_url()}")
+        return self._get_markets_page(params, if_changed=if_changed)
+
+    def fetch_top_coins_multi(
+        self, currencies: Sequence[str], limit: int = 50, if_changed: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch top coins quoted in several currencies and merge them.
+
+        The first currency is the base: it decides the asset universe and
+        fills the top-level price fields; the others go under `quotes`
+        (see quotes.py). Currencies are fetched concurrently, at most
+        `coingecko_max_concurrency` at a time, and a currency that did not
+        change is merged from its last payload instead of being refetched.
+
+        Args:
+            currencies: Quote currencies, base first.
+            limit: Number of coins to fetch (default 50).
+            if_changed: Return None if no currency changed upstream.
+
+        Returns:
+            One merged record per asset, or None if unchanged.
+        """
+        def fetch(currency: str) -> Tuple[List[Dict[str, Any]], bool]:
+            params = self._markets_params(currency, per_page=limit)
+            self._wait_for_rate_limit()
+            logger.info(f"Fetching top {limit} {currency} coins for merging")
+            return self._get_merge_page(params, if_changed)
+
+        if len(currencies) <= 1:
+            results = list(map(fetch, currencies))
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_concurrency, len(currencies)),
+                thread_name_prefix="quotes",
+            ) as pool:
+                results = list(pool.map(fetch, currencies))
+        if if_changed and not any(changed for _, changed in results):
+            return None
+        return merge_currency_quotes(
+            {
+                currency: coins
+                for currency, (coins, _) in zip(currencies, results, strict=True)
+            },
+            currencies[0],
+        )
+
+    def iter_top_coins(
+        self,
+        limit: int = 50,
+        currency: str = "usd",
+        if_changed: bool = False,
+        chunk_size: int = 64 * 1024,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream top coins by trading volume, one normalized coin at a time.
+
+        The response body is read in `chunk_size` pieces and decoded
+        incrementally, so peak memory is bounded by the chunk size rather than
+        by the payload size. Limits above 250 are fetched page by page.
+
+        Args:
+            limit: Number of coins to fetch (default 50).
+            currency: Target currency (default 'usd').
+            if_changed: Send conditional requests; pages answered with 304
+                yield nothing, and later pages are still requested.
+            chunk_size: Bytes read from the socket per step.
+
+        Yields:
+            Normalized coin dictionaries.
+        """
+        per_page = min(limit, MAX_PER_PAGE)
+        pages = -(-limit // per_page) if per_page > 0 else 0
+        seen = set()
+        for page in range(1, pages + 1):
+            # Positions of this page that fall within `limit`
+            wanted = min(per_page, limit - (page - 1) * per_page)
+            params = self._markets_params(currency, per_page=per_page, page=page)
+            self._wait_for_rate_limit()
+            logger.info(f"Streaming coins page {page} from {self._markets_url()}")
+            status = _PageStatus()
+            stream = self._stream_markets_page(
+                params, if_changed, chunk_size, wanted, status
+            )
+            with closing(stream) as coins:
+                for coin in coins:
+                    # Rankings can shift between pages; skip repeated coins
+                    if coin["id"] in seen:
+                        continue
+                    seen.add(coin["id"])
+                    yield coin
+            if not status.not_modified and status.items < wanted:
+                # Short page: the universe ends here
+                break
+
+    def _stream_markets_page(
+        self,
+        params: Dict[str, Any],
+        if_changed: bool,
+        chunk_size: int,
+        wanted: int,
+        status: _PageStatus,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Request one page with a streamed body and yield normalized coins
+        from its first `wanted` items. Records the outcome in `status`.
+        """
+        url = self._markets_url()
+        key = (url, tuple(sorted(params.items())))
+        headers = self._conditional_headers(key) if if_changed else {}
+        try:
+            response = self.session.get(
+                url, params=params, timeout=self.timeout, headers=headers, stream=True
+            )
+            try:
+                if if_changed and response.status_code == 304:
+                    logger.info("Market data not modified (304).")
+                    status.not_modified = True
+                    return
+                response.raise_for_status()
+                for item in iter_json_array(response.iter_content(chunk_size)):
+                    status.items += 1
+                    coin = self._normalize_item(item)
+                    if coin is not None:
+                        yield coin
+                    if status.items >= wanted:
+                        # Rest of the page is beyond `limit`
+                        break
+                if if_changed:
+                    # Streamed bodies are not hashed; rely on HTTP validators
+                    self._store_validators(key, response, digest=b"")
+            finally:
+                response.close()
+
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 429:
+                logger.warning("Rate limit exceeded (429).")
+            logger.error(f"HTTP error occurred: {e}")
+            raise
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request failed: {e}")
+            raise
+        except ValueError as e:
+            logger.error(f"Failed to parse JSON response: {e}")
+            raise
+
+    def _conditional_headers(self, key: Tuple[Any, ...]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        with self._validators_lock:
+            previous = self._validators.get(key)
+        if previous is not None:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+        return headers
+
+    def _store_validators(
+        self, key: Tuple[Any, ...], response: requests.Response, digest: bytes
+    ) -> None:
+        with self._validators_lock:
+            self._validators[key] = _Validators(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                digest=digest,
+            )
+
+    def reset_validators(self) -> None:
+        """Forget stored ETag/Last-Modified validators, forcing full fetches."""
+        with self._validators_lock:
+            self._validators.clear()
+            self._merge_pages.clear()
+
+    def _get_merge_page(
+        self, params: Dict[str, Any], if_changed: bool
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Request a `coins/markets` page whose coins are merged across
+        currencies, which needs full data even when nothing changed.
+        Callers are responsible for rate limiting.
+
+        Returns the coins and whether they may have changed. With
+        `if_changed`, an unchanged page is served from the last payload kept
+        for it; if none was kept (its validators came from another caller),
+        the page is fetched again unconditionally and counts as changed.
+        """
+        key = (self._markets_url(), tuple(sorted(params.items())))
+        coins = self._get_markets_page(params, if_changed=if_changed)
+        if coins is None:
+            with self._validators_lock:
+                cached = self._merge_pages.get(key)
+            if cached is not None:
+                return cached, False
+            self._wait_for_rate_limit()
+            coins = self._get_markets_page(params) or []
+        with self._validators_lock:
+            self._merge_pages[key] = coins
+        return coins, True
+
+    def _get_markets_page(
+        self, params: Dict[str, Any], if_changed: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Request a single `coins/markets` page and normalize it.
+        Callers are responsible for rate limiting.
+
+        With `if_changed`, the request carries the stored validators and
+        None is returned on a 304 or when the raw payload hash matches the
+        previous one, skipping JSON parsing and normalization entirely.
+        """
+        url = self._markets_url()
+        key = (url, tuple(sorted(params.items())))
+        headers: Dict[str, str] = {}
+        previous: Optional[_Validators] = None
+        if if_changed:
+            with self._validators_lock:
+                previous = self._validators.get(key)
+            headers = self._conditional_headers(key)
+
+        try:
+            response = self.session.get(
+                url, params=params, timeout=self.timeout, headers=headers
+            )
+            if if_changed and response.status_code == 304:
+                logger.info("Market data not modified (304).")
+                return None
+            response.raise_for_status()
+
+            digest = b""
+            if if_changed:
+                digest = hashlib.blake2b(response.content, digest_size=16).digest()
+                if previous is not None and previous.digest == digest:
+                    logger.info("Market data unchanged (payload hash match).")
+                    return None
+
+            data = response.json()
+            normalized = self._normalize_response(data)
+
+            if if_changed:
+                # Only remember validators once the payload was fully processed
+                self._store_validators(key, response, digest)
+            return normalized
+
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 429:
+                logger.warning("Rate limit exceeded (429).")
+            logger.error(f"HTTP error occurred: {e}")
+            raise
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request failed: {e}")
+            raise
+        except ValueError as e:
+            logger.error(f"Failed to parse JSON response: {e}")
+            raise
+
+    def fetch_coin_metadata(self, coin_id: str) -> Dict[str, Any]:
+        """
+        Fetch descriptive metadata (description, categories, links) for a coin.
+
+        Args:
+            coin_id: CoinGecko coin id (e.g. 'bitcoin').
+
+        Returns:
+            Normalized metadata dictionary.
+        """
         params = {
-            "vs_currency": currency,
-            "order": "volume_desc",  # Sort by volume as per requirements
-            "per_page": limit,
-            "page": 1,
+            "localization": "false",
+            "tickers": "false",
+            "market_data": "false",
+            "community_data": "false",
+            "developer_data": "false",
             "sparkline": "false",
-            "price_change_percentage": "24h,7d"
         }
+        logger.info(f"Fetching metadata for {coin_id}")
+        data = self._get_json(f"coins/{coin_id}", params)
+        return self._normalize_metadata(data)
+
+    def fetch_market_chart_range(
+        self, coin_id: str, start: int, end: int, currency: str = "usd"
+    ) -> Dict[str, List[List[float]]]:
+        """
+        Fetch historical prices and volumes for a coin between two timestamps.
+
+        CoinGecko picks the granularity from the span: 5-minutely up to 1 day,
+        hourly up to 90 days, daily beyond that.
+
+        Args:
+            coin_id: CoinGecko coin id (e.g. 'bitcoin').
+            start: Range start as a UNIX timestamp (seconds).
+            end: Range end as a UNIX timestamp (seconds).
+            currency: Target currency (default 'usd').
+
+        Returns:
+            Dict with 'prices' and 'total_volumes' lists of [ms, value] pairs.
+        """
+        params = {"vs_currency": currency, "from": int(start), "to": int(end)}
+        logger.info(f"Fetching {coin_id} history {start}-{end} ({currency})")
+        data = self._get_json(f"coins/{coin_id}/market_chart/range", params)
+        if not isinstance(data, dict):
+            raise ValueError("Unexpected market chart response")
+        return {
+            "prices": data.get("prices") or [],
+            "total_volumes": data.get("total_volumes") or [],
+        }
+
+    def _get_json(self, endpoint: str, params: Dict[str, Any]) -> Any:
+        """Rate-limited GET of an API endpoint, returning the decoded JSON."""
+        url = urljoin(self.base_url, endpoint)
 
         self._wait_for_rate_limit()
 
         try:
-            logger.info(f"Fetching top {limit} coins from {url}")
             response = self.session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
-            data = response.json()
-
-            return self._normalize_response(data)
+            return response.json()
 
         except requests.exceptions.HTTPError as e:
             if e.response is not None and e.response.status_code == 429:
@@ -119,55 +480,46 @@ class CryptoDataFetcher:
             logger.error(f"Failed to parse JSON response: {e}")
             raise
 
+    @staticmethod
+    def _normalize_metadata(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the metadata fields we expose from a `coins/{id}` response."""
+        if not isinstance(data, dict):
+            raise ValueError("Unexpected coin detail response")
+        description = data.get("description") or {}
+        links = data.get("links") or {}
+        repos = links.get("repos_url") or {}
+
+        def non_empty(values: Any) -> List[str]:
+            return [v for v in values or [] if v]
+
+        return {
+            "description": description.get("en") or None,
+            "categories": non_empty(data.get("categories")),
+            "genesis_date": data.get("genesis_date"),
+            "hashing_algorithm": data.get("hashing_algorithm"),
+            "links": {
+                "homepage": non_empty(links.get("homepage")),
+                "whitepaper": links.get("whitepaper") or None,
+                "blockchain_site": non_empty(links.get("blockchain_site")),
+                "subreddit_url": links.get("subreddit_url") or None,
+                "twitter_screen_name": links.get("twitter_screen_name") or None,
+                "repos_github": non_empty(repos.get("github")),
+            },
+        }
+
     def _normalize_response(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Validate and normalize the API response.
-        Ensures required fields are present and types are correct.
+        Ensures required fields are present and types are correct, following
+        `MARKET_SCHEMA` in `normalizer.py`.
         """
-        normalized_data = []
-        for item in data:
-            try:
-                # Basic validation
-                if not item.get("id") or not item.get("symbol"):
-                    continue
-
-                # Extract and normalize fields
-                coin = {
-                    "id": item.get("id"),
-                    "symbol": item.get("symbol", "").upper(),
-                    "name": item.get("name"),
-                    "image": item.get("image"),
-                    "current_price": self._to_float(item.get("current_price")),
-                    "market_cap": self._to_float(item.get("market_cap")),
-                    "market_cap_rank": item.get("market_cap_rank"),
-                    "total_volume": self._to_float(item.get("total_volume")),
-                    "high_24h": self._to_float(item.get("high_24h")),
-                    "low_24h": self._to_float(item.get("low_24h")),
-                    "price_change_percentage_24h": self._to_float(
-                        item.get("price_change_percentage_24h")
-                    ),
-                    "price_change_percentage_7d_in_currency": self._to_float(
-                        item.get("price_change_percentage_7d_in_currency")
-                    ),
-                    "ath": self._to_float(item.get("ath")),
-                    "atl": self._to_float(item.get("atl")),
-                    "last_updated": item.get("last_updated"),
-                }
-                normalized_data.append(coin)
-            except Exception as e:
-                logger.warning(
-                    f"Skipping malformed item {item.get('id', 'unknown')}: {e}"
-                )
-                continue
-
-        return normalized_data
+        return normalize_markets(data)
 
-    @staticmethod
-    def _to_float(value: Any) -> Optional[float]:
-        """Safely convert value to float."""
-        if value is None:
-            return None
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return None
+    def _normalize_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Normalize a single coin entry.
+        Returns None for entries that are invalid or malformed.
+        """
+        return normalize_market_item(item)
+
+    _to_float = staticmethod(to_float)
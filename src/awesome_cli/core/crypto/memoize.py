@@ -0,0 +1,233 @@
+"""
+Memoization
+===========
+
+`memoize` caches the results of a function in a `CacheManager`, so
+expensive, pure-ish calls (fetcher requests, analytics) can be wrapped
+without hand-writing key strings:
+
+    @memoize(get_cache, ttl_minutes=2)
+    def fetch_top_coins(self, limit: int = 50, currency: str = "usd"): ...
+
+Keys are built from the call's bound arguments: defaults are applied, so
+`f(50)`, `f(limit=50)` and `f()` share one entry, and `self` / `cls` are
+left out, so every instance shares the cache. Argument values are encoded
+by `canonical` (containers recursively, dicts and sets in sorted order);
+other objects by `repr`, which must therefore be stable.
+
+With `single_flight` (the default) concurrent callers of the same
+arguments share one computation through `get_or_compute` /
+`aget_or_compute`, and a result past its TTL is served stale while it is
+refreshed if `stale_ttl_minutes` (or the cache's default) allows. None
+results are not cached.
+
+`fn.invalidate(**pattern)` drops cached results whose arguments match the
+pattern (e.g. `fetch_top_coins.invalidate(currency="eur")`); with no
+arguments it drops all of them. Pattern invalidation only knows the keys
+computed by this process.
+"""
+
+import functools
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+from awesome_cli.core.crypto.cache import CacheManager
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+CacheSource = Union[CacheManager, Callable[[], Optional[CacheManager]]]
+
+# Keys remembered per function for pattern invalidation
+MAX_TRACKED_KEYS = 10_000
+
+_SKIPPED_PARAMS = ("self", "cls")
+
+
+def canonical(value: Any) -> str:
+    """Deterministic string form of an argument value."""
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(canonical(v) for v in value) + "]"
+    if isinstance(value, dict):
+        items = sorted((canonical(k), canonical(v)) for k, v in value.items())
+        return "{" + ",".join(f"{k}:{v}" for k, v in items) + "}"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ",".join(sorted(canonical(v) for v in value)) + "}"
+    return repr(value)
+
+
+class _KeyBuilder:
+    """Builds cache keys for one function and remembers the ones it computed."""
+
+    def __init__(self, fn: Callable[..., Any], namespace: str):
+        self.signature = inspect.signature(fn)
+        params = list(self.signature.parameters)
+        self.skip = params[0] if params and params[0] in _SKIPPED_PARAMS else None
+        self.prefix = f"memo:{namespace}:"
+        # Key -> canonical arguments, oldest first
+        self._tracked: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build(
+        self, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Tuple[str, Dict[str, str]]:
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = {
+            name: canonical(value)
+            for name, value in bound.arguments.items()
+            if name != self.skip
+        }
+        key = self.prefix + ",".join(
+            f"{name}={value}" for name, value in arguments.items()
+        )
+        return key, arguments
+
+    def track(self, key: str, arguments: Dict[str, str]) -> Optional[str]:
+        """Remember a computed key; returns a key dropped to stay bounded."""
+        with self._lock:
+            self._tracked[key] = arguments
+            self._tracked.move_to_end(key)
+            if len(self._tracked) > MAX_TRACKED_KEYS:
+                return self._tracked.popitem(last=False)[0]
+        return None
+
+    def matching(self, pattern: Dict[str, Any]) -> List[str]:
+        unknown = set(pattern) - set(self.signature.parameters)
+        if unknown:
+            raise TypeError(f"Unknown argument(s) for invalidation: {sorted(unknown)}")
+        wanted = {name: canonical(value) for name, value in pattern.items()}
+        with self._lock:
+            keys = [
+                key for key, arguments in self._tracked.items()
+                if all(arguments.get(name) == value for name, value in wanted.items())
+            ]
+            for key in keys:
+                del self._tracked[key]
+        return keys
+
+
+def memoize(
+    cache: CacheSource,
+    ttl_minutes: Optional[float] = None,
+    single_flight: bool = True,
+    namespace: Optional[str] = None,
+    stale_ttl_minutes: Optional[float] = None,
+) -> Callable[[F], F]:
+    """
+    Cache a sync or async function's results in `cache`.
+
+    Args:
+        cache: The cache, or a callable returning it (resolved on every
+            call; when it returns None the function is called uncached).
+        ttl_minutes: TTL of cached results; the cache's default if None.
+        single_flight: Share one computation between concurrent callers.
+        namespace: Key prefix; defaults to the function's qualified name.
+        stale_ttl_minutes: Window after the TTL during which a result is
+            served stale while it is refreshed; the cache's default if None.
+
+    The wrapper gains `invalidate(**pattern) -> int` and
+    `cache_key(*args, **kwargs) -> str`.
+    """
+
+    def resolve() -> Optional[CacheManager]:
+        if isinstance(cache, CacheManager):
+            return cache
+        return cache()
+
+    def decorator(fn: F) -> F:
+        keys = _KeyBuilder(fn, namespace or f"{fn.__module__}.{fn.__qualname__}")
+
+        def remember(target: CacheManager, key: str, arguments: Dict[str, str]) -> None:
+            dropped = keys.track(key, arguments)
+            if dropped is not None:
+                # Never leave a result cached that invalidate can't find
+                target.invalidate(dropped)
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                target = resolve()
+                if target is None:
+                    return await fn(*args, **kwargs)
+                key, arguments = keys.build(args, kwargs)
+
+                async def compute() -> Any:
+                    value = await fn(*args, **kwargs)
+                    remember(target, key, arguments)
+                    return value
+
+                if single_flight:
+                    return await target.aget_or_compute(
+                        key,
+                        compute,
+                        ttl_minutes=ttl_minutes,
+                        stale_ttl_minutes=stale_ttl_minutes,
+                    )
+                value = target.get(key)
+                if value is None:
+                    value = await compute()
+                    if value is not None:
+                        target.set(key, value, ttl_minutes, stale_ttl_minutes)
+                return value
+
+            wrapper: Any = async_wrapper
+        else:
+
+            @functools.wraps(fn)
+            def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+                target = resolve()
+                if target is None:
+                    return fn(*args, **kwargs)
+                key, arguments = keys.build(args, kwargs)
+
+                def compute() -> Any:
+                    value = fn(*args, **kwargs)
+                    remember(target, key, arguments)
+                    return value
+
+                if single_flight:
+                    return target.get_or_compute(
+                        key,
+                        compute,
+                        ttl_minutes=ttl_minutes,
+                        stale_ttl_minutes=stale_ttl_minutes,
+                    )
+                value = target.get(key)
+                if value is None:
+                    value = compute()
+                    if value is not None:
+                        target.set(key, value, ttl_minutes, stale_ttl_minutes)
+                return value
+
+            wrapper = sync_wrapper
+
+        def invalidate(**pattern: Any) -> int:
+            """Drop cached results whose arguments match `pattern`; returns
+            how many keys were dropped."""
+            matched = keys.matching(pattern)
+            target = resolve()
+            if target is not None:
+                for key in matched:
+                    target.invalidate(key)
+            logger.debug(
+                f"Invalidated {len(matched)} memoized results of {fn.__qualname__}"
+            )
+            return len(matched)
+
+        def cache_key(*args: Any, **kwargs: Any) -> str:
+            """The cache key a call with these arguments uses."""
+            return keys.build(args, kwargs)[0]
+
+        wrapper.invalidate = invalidate
+        wrapper.cache_key = cache_key
+        return wrapper  # type: ignore[no-any-return]
+
+    return decorator
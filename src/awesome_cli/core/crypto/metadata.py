@@ -0,0 +1,142 @@
+"""
+Coin Metadata Enrichment
+========================
+
+Fetches per-coin metadata (descriptions, categories, links) and caches it in
+`CacheManager` for `cache_ttl_metadata_hours`.
+
+Each coin costs at most one upstream call per TTL window: concurrent callers
+asking for the same coin share a single `CacheManager.get_or_compute`
+computation, and failed lookups are remembered briefly so a flapping
+upstream is not hammered by every incoming request. Metadata past its TTL
+is served stale for up to `stale_ttl_minutes` (one more TTL by default)
+while a single background refresh runs; a failed refresh keeps the stale
+metadata.
+
+`enrich_many` merges metadata into a page of records (e.g. a listing),
+loading what the cache lacks through `prefetch` with at most
+`coingecko_max_concurrency` lookups in flight.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.cache import CacheManager
+from awesome_cli.core.crypto.fetcher import CryptoDataFetcher
+
+logger = logging.getLogger(__name__)
+
+# Cached in place of metadata when the upstream lookup fails; a dict like
+# real metadata, so it has the cache's value type and survives the L2 tier
+_UNAVAILABLE = "_unavailable"
+_UNAVAILABLE_MARKER: Dict[str, Any] = {_UNAVAILABLE: True}
+
+
+class CoinMetadataEnricher:
+    """
+    Bounded-concurrency metadata loader backed by the cache.
+    Thread-safe.
+    """
+
+    def __init__(
+        self,
+        settings: CryptoSettings,
+        fetcher: CryptoDataFetcher,
+        cache: CacheManager,
+        failure_ttl_minutes: int = 1,
+        stale_ttl_minutes: Optional[float] = None,
+    ):
+        self.fetcher = fetcher
+        self.cache = cache
+        self.ttl_minutes = settings.cache_ttl_metadata_hours * 60
+        self.failure_ttl_minutes = failure_ttl_minutes
+        self.stale_ttl_minutes = (
+            self.ttl_minutes if stale_ttl_minutes is None else stale_ttl_minutes
+        )
+        self.max_concurrency = max(1, settings.coingecko_max_concurrency)
+
+    @staticmethod
+    def cache_key(coin_id: str) -> str:
+        return f"metadata:{coin_id}"
+
+    def get_metadata(self, coin_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return metadata for a coin, fetching it upstream on a cache miss.
+        Returns None if the coin's metadata is currently unavailable.
+        """
+        key = self.cache_key(coin_id)
+        try:
+            # Raises only on a miss; a stale hit is served while the cache
+            # refreshes it, and a failed refresh leaves the stale value
+            cached = self.cache.get_or_compute(
+                key,
+                lambda: self.fetcher.fetch_coin_metadata(coin_id),
+                ttl_minutes=self.ttl_minutes,
+                stale_ttl_minutes=self.stale_ttl_minutes,
+            )
+        except Exception as e:
+            logger.warning(f"Metadata lookup failed for {coin_id}: {e}")
+            # Remembered for the short failure TTL
+            self.cache.set(
+                key,
+                _UNAVAILABLE_MARKER,
+                ttl_minutes=self.failure_ttl_minutes,
+                stale_ttl_minutes=0,
+            )
+            return None
+        if cached is None or cached.get(_UNAVAILABLE):
+            return None
+        return cached
+
+    def prefetch(self, coin_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Warm the cache for many coins with bounded concurrency.
+        The fetcher's rate limiter still applies to every upstream call.
+
+        Returns:
+            Mapping of coin id to metadata for the coins that resolved.
+        """
+        ids = list(dict.fromkeys(coin_ids))
+        if len(ids) <= 1:
+            results = [self.get_metadata(coin_id) for coin_id in ids]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_concurrency, len(ids)),
+                thread_name_prefix="metadata",
+            ) as executor:
+                results = list(executor.map(self.get_metadata, ids))
+        return {
+            coin_id: metadata
+            for coin_id, metadata in zip(ids, results, strict=True)
+            if metadata is not None
+        }
+
+    def enrich(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return a copy of an asset record with a `metadata` field merged in.
+        The record is returned unchanged if metadata is unavailable.
+        """
+        return self.enrich_many([record])[0]
+
+    def enrich_many(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        `enrich` for several records, loading the metadata they lack through
+        `prefetch`. Records that already have metadata, or whose metadata is
+        unavailable, are returned unchanged (the same objects).
+        """
+        wanted = [
+            record["id"]
+            for record in records
+            if record.get("id") and "metadata" not in record
+        ]
+        if not wanted:
+            return list(records)
+        found = self.prefetch(wanted)
+        return [
+            {**record, "metadata": found[record["id"]]}
+            if "metadata" not in record and record.get("id") in found
+            else record
+            for record in records
+        ]
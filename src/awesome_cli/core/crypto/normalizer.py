@@ -0,0 +1,156 @@
+"""
+Market Payload Normalizer
+=========================
+
+Normalization of CoinGecko `coins/markets` entries.
+
+`MARKET_SCHEMA` lists the fields kept from each entry and how they are
+converted. It is turned into a tuple of (field, converter) pairs once at
+import, which `normalize_market_item` runs over each entry, so the schema
+is the single definition of the output. A columnar variant produces one
+`array('d')` per float field plus a symbol index for analytics that work
+on whole columns.
+"""
+
+import math
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Field kinds
+RAW = "raw"  # copied as-is
+UPPER = "upper"  # required string, upper-cased
+FLOAT = "float"  # converted to float, None when missing or invalid
+
+FieldSpec = Tuple[str, str]  # (field name, kind)
+
+MARKET_SCHEMA: Tuple[FieldSpec, ...] = (
+    ("id", RAW),
+    ("symbol", UPPER),
+    ("name", RAW),
+    ("image", RAW),
+    ("current_price", FLOAT),
+    ("market_cap", FLOAT),
+    ("market_cap_rank", RAW),
+    ("total_volume", FLOAT),
+    ("high_24h", FLOAT),
+    ("low_24h", FLOAT),
+    ("price_change_percentage_24h", FLOAT),
+    ("price_change_percentage_7d_in_currency", FLOAT),
+    ("ath", FLOAT),
+    ("atl", FLOAT),
+    ("last_updated", RAW),
+)
+
+FLOAT_FIELDS: Tuple[str, ...] = tuple(
+    name for name, kind in MARKET_SCHEMA if kind == FLOAT
+)
+
+
+def to_float(value: Any) -> Optional[float]:
+    """Safely convert value to float."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+# Kind -> converter; None copies the value as-is. UPPER values are
+# validated as strings before conversion.
+_KIND_CONVERTERS: Dict[str, Optional[Callable[[Any], Any]]] = {
+    RAW: None,
+    UPPER: str.upper,
+    FLOAT: to_float,
+}
+
+_CONVERTERS: Tuple[Tuple[str, Optional[Callable[[Any], Any]]], ...] = tuple(
+    (name, _KIND_CONVERTERS[kind]) for name, kind in MARKET_SCHEMA
+)
+
+
+def normalize_market_item(item: Any) -> Optional[Dict[str, Any]]:
+    """
+    Normalize one raw entry following `MARKET_SCHEMA`.
+
+    Returns None for non-dict entries, entries without an id or symbol,
+    and entries whose symbol is not a string.
+    """
+    if not isinstance(item, dict):
+        return None
+    get = item.get
+    coin_id = get("id")
+    symbol = get("symbol")
+    if not coin_id or not symbol or not isinstance(symbol, str):
+        return None
+    return {
+        name: get(name) if convert is None else convert(get(name))
+        for name, convert in _CONVERTERS
+    }
+
+
+def normalize_markets(data: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Normalize a `coins/markets` payload, dropping invalid entries."""
+    return [coin for coin in map(normalize_market_item, data) if coin is not None]
+
+
+@dataclass
+class MarketColumns:
+    """
+    Column-oriented view of normalized market data.
+    Missing float values are stored as NaN.
+    """
+    ids: List[str] = field(default_factory=list)
+    symbols: List[str] = field(default_factory=list)
+    index: Dict[str, int] = field(default_factory=dict)  # symbol -> row
+    columns: Dict[str, "array[float]"] = field(default_factory=dict)  # field -> floats
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def column(self, name: str) -> "array[float]":
+        """Return the float column for a field."""
+        return self.columns[name]
+
+    def row(self, symbol: str) -> Optional[Dict[str, Optional[float]]]:
+        """Return the float fields of one symbol, with NaN mapped to None."""
+        position = self.index.get(symbol.upper())
+        if position is None:
+            return None
+        row: Dict[str, Optional[float]] = {}
+        for name, values in self.columns.items():
+            value = values[position]
+            row[name] = None if math.isnan(value) else value
+        return row
+
+
+def normalize_markets_columnar(data: Iterable[Any]) -> MarketColumns:
+    """
+    Normalize a `coins/markets` payload into `MarketColumns`.
+
+    Entries are validated like `normalize_markets`; later duplicates of a
+    symbol are ignored.
+    """
+    result = MarketColumns(columns={name: array("d") for name in FLOAT_FIELDS})
+    index, symbols, ids = result.index, result.symbols, result.ids
+    columns = [(name, result.columns[name].append) for name in FLOAT_FIELDS]
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        get = item.get
+        coin_id = get("id")
+        symbol = get("symbol")
+        if not coin_id or not symbol or not isinstance(symbol, str):
+            continue
+        symbol = symbol.upper()
+        if symbol in index:
+            continue
+        index[symbol] = len(symbols)
+        symbols.append(symbol)
+        ids.append(coin_id)
+        # Only the float fields are read; no per-coin dict is built
+        for name, append in columns:
+            value = to_float(get(name))
+            append(math.nan if value is None else value)
+    return result
@@ -0,0 +1,80 @@
+"""
+Multi-Currency Quotes
+=====================
+
+Helpers for storing one asset record with prices in several quote
+currencies.
+
+A record keeps its currency-independent fields (id, symbol, name, rank,
+...) and the base currency's price fields at the top level, exactly like a
+single-currency record. Every other currency is stored once under
+`quotes` as a compact list of values ordered like `QUOTE_FIELDS`:
+
+    {"symbol": "BTC", "current_price": 50000.0, ...,
+     "quotes": {"eur": [46000.0, 9.1e11, ...], "btc": [1.0, ...]}}
+
+`project_currency` turns such a record into a flat view in any of its
+currencies, so the API never keeps a duplicate record per currency.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+# Per-currency fields, in storage order
+QUOTE_FIELDS = (
+    "current_price",
+    "market_cap",
+    "total_volume",
+    "high_24h",
+    "low_24h",
+    "price_change_percentage_24h",
+    "price_change_percentage_7d_in_currency",
+    "ath",
+    "atl",
+)
+
+
+def merge_currency_quotes(
+    per_currency: Dict[str, List[Dict[str, Any]]], base_currency: str
+) -> List[Dict[str, Any]]:
+    """
+    Combine per-currency fetch results into one record per asset.
+
+    The asset universe and order come from the base currency. Coins missing
+    from another currency's result simply lack that quote.
+    """
+    other = {
+        currency: {coin["id"]: coin for coin in coins}
+        for currency, coins in per_currency.items()
+        if currency != base_currency
+    }
+    merged = []
+    for coin in per_currency.get(base_currency, []):
+        record = dict(coin)
+        quotes = {}
+        for currency, by_id in other.items():
+            quoted = by_id.get(coin["id"])
+            if quoted is not None:
+                quotes[currency] = [quoted.get(field) for field in QUOTE_FIELDS]
+        if quotes:
+            record["quotes"] = quotes
+        merged.append(record)
+    return merged
+
+
+def project_currency(
+    record: Dict[str, Any], currency: str, base_currency: str
+) -> Dict[str, Any]:
+    """
+    Return a flat view of a record priced in `currency`.
+    Price fields are None if the record has no quote in that currency.
+    """
+    currency = currency.lower()
+    projected = {k: v for k, v in record.items() if k != "quotes"}
+    if currency != base_currency:
+        values: Optional[Sequence[Any]] = (record.get("quotes") or {}).get(currency)
+        if values is None:
+            values = [None] * len(QUOTE_FIELDS)
+        # Lists stored under an older QUOTE_FIELDS may differ in length
+        projected.update(zip(QUOTE_FIELDS, values, strict=False))
+    projected["currency"] = currency
+    return projected
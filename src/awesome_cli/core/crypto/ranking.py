@@ -0,0 +1,99 @@
+"""
+Rank Indexes
+============
+
+Sorted symbol indexes that the repository keeps up to date on every write,
+so top-N queries read the first N entries instead of sorting every asset.
+
+Each `RankIndex` holds `(missing, key, symbol)` tuples in a list kept
+sorted with `bisect`: updating one asset costs a binary search plus a list
+shift, and reading the top N is a slice. Assets without a value sort last;
+ties are broken by symbol so the order is deterministic. `changed` tells
+the owner whether the order moved since it last cleared the flag.
+"""
+
+import bisect
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from awesome_cli.core.crypto.normalizer import to_float
+
+
+class SortField(NamedTuple):
+    """A sortable asset field."""
+    field: str
+    descending: bool
+
+
+# API sort name -> field
+SORT_FIELDS: Dict[str, SortField] = {
+    "volume": SortField("total_volume", descending=True),
+    "market_cap": SortField("market_cap", descending=True),
+    "change_24h": SortField("price_change_percentage_24h", descending=True),
+    "change_7d": SortField("price_change_percentage_7d_in_currency", descending=True),
+    "rank": SortField("market_cap_rank", descending=False),
+}
+
+_Entry = Tuple[int, float, str]
+
+
+class RankIndex:
+    """Symbols ordered by one field of their asset record. Not thread-safe."""
+
+    def __init__(self, sort: SortField):
+        self.sort = sort
+        self._entries: List[_Entry] = []
+        self._keys: Dict[str, _Entry] = {}
+        # Set whenever the order changes; cleared by the owner
+        self.changed = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _entry(self, symbol: str, asset: Dict[str, Any]) -> _Entry:
+        value = to_float(asset.get(self.sort.field))
+        if value is None or value != value:  # missing or NaN
+            return (1, 0.0, symbol)
+        return (0, -value if self.sort.descending else value, symbol)
+
+    def update(self, symbol: str, asset: Dict[str, Any]) -> None:
+        """Insert or reposition `symbol`."""
+        entry = self._entry(symbol, asset)
+        old = self._keys.get(symbol)
+        if old == entry:
+            return
+        if old is not None:
+            del self._entries[bisect.bisect_left(self._entries, old)]
+        bisect.insort(self._entries, entry)
+        self._keys[symbol] = entry
+        self.changed = True
+
+    def remove(self, symbol: str) -> None:
+        old = self._keys.pop(symbol, None)
+        if old is not None:
+            del self._entries[bisect.bisect_left(self._entries, old)]
+            self.changed = True
+
+    def rebuild(self, assets: Dict[str, Dict[str, Any]]) -> None:
+        """Replace the index contents with `assets` (symbol -> record)."""
+        self._keys = {
+            symbol: self._entry(symbol, asset) for symbol, asset in assets.items()
+        }
+        self._entries = sorted(self._keys.values())
+        self.changed = True
+
+    def top(self, limit: Optional[int] = None) -> List[str]:
+        """The first `limit` symbols (all if None)."""
+        entries = self._entries if limit is None else self._entries[:max(limit, 0)]
+        return [entry[2] for entry in entries]
+
+
+def build_indexes(
+    assets: Dict[str, Dict[str, Any]], names: Iterable[str] = SORT_FIELDS
+) -> Dict[str, RankIndex]:
+    """A populated index per sort name."""
+    indexes = {}
+    for name in names:
+        index = RankIndex(SORT_FIELDS[name])
+        index.rebuild(assets)
+        indexes[name] = index
+    return indexes
@@ -0,0 +1,211 @@
+"""
+Rate Limiting
+=============
+
+Pluggable token-bucket rate limiters for upstream API calls.
+
+Two implementations are provided:
+
+*   `TokenBucket`: in-process bucket. The "no token yet" check reads an
+    immutable state tuple without taking the lock, and the lock is only held
+    for the few arithmetic operations needed to consume a token.
+*   `FileTokenBucket`: bucket state lives in a small file guarded by POSIX
+    record locks, so every process pointing at the same file (e.g. each
+    gunicorn worker) shares one request budget.
+
+Neither implementation ever sleeps while holding a lock. Callers can poll
+(`try_acquire`), block (`acquire`) or await (`acquire_async`).
+"""
+
+import asyncio
+import logging
+import os
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional, Tuple
+
+from awesome_cli.config import CryptoSettings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter(ABC):
+    """Base class for token-bucket rate limiters."""
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.rate = float(rate_per_second)
+        self.capacity = float(capacity)
+
+    @abstractmethod
+    def _try_consume(self, tokens: float) -> float:
+        """
+        Consume `tokens` if available.
+        Returns 0.0 on success, otherwise the seconds until they will be.
+        """
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens without blocking. Returns False if none are available."""
+        return self._try_consume(tokens) == 0.0
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Block until tokens are available.
+        Returns False if `timeout` seconds elapse first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._try_consume(tokens)
+            if wait == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    async def acquire_async(
+        self, tokens: float = 1.0, timeout: Optional[float] = None
+    ) -> bool:
+        """Asynchronous version of `acquire` that yields to the event loop."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            wait = self._try_consume(tokens)
+            if wait == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            await asyncio.sleep(wait)
+
+    def _refill(
+        self, tokens: float, updated: float, now: float
+    ) -> float:
+        return min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+
+    def _wait_time(self, available: float, tokens: float) -> float:
+        # Never report 0.0 for a failed attempt, otherwise callers would spin
+        return max((tokens - available) / self.rate, 1e-6)
+
+
+class TokenBucket(RateLimiter):
+    """
+    In-process token bucket.
+    Thread-safe; the empty-bucket path does not take the lock.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float = 1.0):
+        super().__init__(rate_per_second, capacity)
+        # (tokens, monotonic timestamp) swapped as a single reference so the
+        # lock-free fast path always sees a consistent pair.
+        self._state: Tuple[float, float] = (self.capacity, time.monotonic())
+        self._lock = threading.Lock()
+
+    def _try_consume(self, tokens: float) -> float:
+        now = time.monotonic()
+        available = self._refill(*self._state, now)
+        if available < tokens:
+            return self._wait_time(available, tokens)
+
+        with self._lock:
+            now = time.monotonic()
+            available = self._refill(*self._state, now)
+            if available < tokens:
+                return self._wait_time(available, tokens)
+            self._state = (available - tokens, now)
+            return 0.0
+
+
+class FileTokenBucket(RateLimiter):
+    """
+    Token bucket whose state is shared between processes through a file.
+    Uses `fcntl.lockf` record locks, which are held per process and therefore
+    remain exclusive across `fork()`; a thread lock serializes threads within
+    the process. Timestamps are wall-clock because monotonic clocks are not
+    comparable between processes on every platform.
+    """
+
+    _STATE = struct.Struct("<dd")
+
+    def __init__(self, path: str, rate_per_second: float, capacity: float = 1.0):
+        if fcntl is None:
+            raise RuntimeError("FileTokenBucket requires a POSIX platform (fcntl)")
+        super().__init__(rate_per_second, capacity)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._lock = threading.Lock()
+
+    def _read_state(self, now: float) -> Tuple[float, float]:
+        raw = os.pread(self._fd, self._STATE.size, 0)
+        if len(raw) != self._STATE.size:
+            return self.capacity, now
+        tokens, updated = self._STATE.unpack(raw)
+        # Guard against the wall clock moving backwards
+        return tokens, min(updated, now)
+
+    def _try_consume(self, tokens: float) -> float:
+        now = time.time()
+        # Lock-free peek; a single small pread is not torn in practice and a
+        # stale value only ever delays the locked re-check below.
+        available = self._refill(*self._read_state(now), now)
+        if available < tokens:
+            return self._wait_time(available, tokens)
+
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                available = self._refill(*self._read_state(now), now)
+                if available < tokens:
+                    return self._wait_time(available, tokens)
+                os.pwrite(self._fd, self._STATE.pack(available - tokens, now), 0)
+                return 0.0
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Close the underlying state file."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def create_rate_limiter(settings: CryptoSettings) -> RateLimiter:
+    """
+    Build the rate limiter described by the settings.
+    Uses a shared file bucket when `rate_limit_state_path` is set.
+    """
+    rate = settings.coingecko_rate_limit_requests / 60.0
+    capacity = max(1, settings.coingecko_rate_limit_burst)
+
+    if settings.rate_limit_state_path:
+        try:
+            return FileTokenBucket(settings.rate_limit_state_path, rate, capacity)
+        except (RuntimeError, OSError) as e:
+            logger.warning(
+                "Falling back to in-process rate limiting; "
+                f"shared bucket unavailable: {e}"
+            )
+    return TokenBucket(rate, capacity)
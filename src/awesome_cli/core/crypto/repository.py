@@ -3,135 +3,516 @@ Crypto Asset Repository
 =======================
 
 Abstracts data storage and retrieval for crypto assets.
-Currently supports in-memory storage backed by a JSON file for persistence.
+Assets are held in memory and persisted through an `AssetStore` (see
+`storage.py`): a JSON file, a JSON snapshot plus an append-only journal,
+or a memory-mapped binary snapshot. A binary snapshot is served as loaded,
+decoding records on demand, until the first write copies it into memory.
+
+Reads are lock-free: writers apply changes to a private working copy
+under the lock, then publish an immutable `AssetSnapshot` (the mapping plus
+the ranked symbol orders) with a single reference assignment. A reader
+grabs the current snapshot once and sees one consistent generation, never
+waiting on a writer; `generation` increases with every published change
+and can be used as a cache key.
+
+Writes are persisted write-behind: an upsert only records which symbols
+changed, and a background thread persists them once per
+`storage_write_behind_seconds` window, so bursts of upserts coalesce into
+one write and callers never wait on disk. `flush()` (and `close()`, also
+run at interpreter exit) writes pending changes synchronously. With a
+window of 0 every write is saved before `upsert` returns.
 """
 
-import json
+import atexit
 import logging
 import threading
-import os
-import shutil
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.binary_store import BinarySnapshot
+from awesome_cli.core.crypto.diff import ChangeSet, record_changed
+from awesome_cli.core.crypto.normalizer import to_float
+from awesome_cli.core.crypto.ranking import SORT_FIELDS, RankIndex, build_indexes
+from awesome_cli.core.crypto.storage import create_store
+
+if TYPE_CHECKING:
+    from awesome_cli.core.crypto.metadata import CoinMetadataEnricher
 
 logger = logging.getLogger(__name__)
 
+
+class AssetSnapshot:
+    """
+    Immutable view of the repository at one generation.
+    Records are shared with later snapshots and must not be mutated.
+    """
+
+    __slots__ = ("generation", "assets", "_orders")
+
+    def __init__(
+        self,
+        generation: int,
+        assets: Mapping[str, Dict[str, Any]],
+        orders: Mapping[str, Sequence[str]],
+    ):
+        self.generation = generation
+        self.assets: Mapping[str, Dict[str, Any]] = MappingProxyType(assets)
+        # Sort name -> all symbols in that order
+        self._orders = orders
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def top(self, sort: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The first `limit` assets in `sort` order (all if None)."""
+        order = self._orders[sort]
+        if limit is not None:
+            order = order[:max(limit, 0)]
+        assets = self.assets
+        return [assets[symbol] for symbol in order]
+
+    def orders(self) -> Dict[str, Sequence[str]]:
+        """Sort name -> all symbols in that order."""
+        return dict(self._orders)
+
+
 class CryptoAssetRepository:
     """
     Repository for managing crypto asset data.
     """
 
-    def __init__(self, settings: CryptoSettings):
+    def __init__(
+        self,
+        settings: CryptoSettings,
+        metadata_enricher: Optional["CoinMetadataEnricher"] = None,
+    ):
         self.storage_path = Path(settings.storage_path)
-        self.assets: Dict[str, Dict] = {}  # Map symbol -> asset data
+        # Top-level price fields are in the base currency; others in `quotes`
+        self.quote_currencies = [
+            c.lower() for c in settings.quote_currencies
+        ] or ["usd"]
+        self.base_currency = self.quote_currencies[0]
+        # Writers' working copy (symbol -> asset data), guarded by _lock;
+        # readers use the published snapshot instead
+        self.assets: Dict[str, Dict[str, Any]] = {}
+        # Sort name -> symbols in order, maintained on every write
+        self._rankings: Dict[str, RankIndex] = build_indexes({})
+        # Loaded binary snapshot not yet copied into the working copy
+        self._base: Optional[BinarySnapshot] = None
         self._lock = threading.RLock()  # Use RLock to allow reentrant acquisition
+        self._snapshot = AssetSnapshot(0, {}, {name: () for name in SORT_FIELDS})
+        self.change_tolerance = settings.change_tolerance
+        self._listeners: List[Callable[[ChangeSet], None]] = []
+        # Optional; merges coin metadata into records on first request
+        self.metadata_enricher = metadata_enricher
+        # Write-behind state; the flusher thread starts on the first write
+        self.write_behind_seconds = settings.storage_write_behind_seconds
+        self._pending = ChangeSet()  # changes not yet persisted
+        self._save_lock = threading.Lock()  # serializes file writes
+        self._wake = threading.Event()
+        self._closing = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._open_storage(settings)
+
+    def _open_storage(self, settings: CryptoSettings) -> None:
+        """Set up persistence and load the stored assets."""
+        self.store = create_store(settings)
         self._load_from_storage()
 
     def _load_from_storage(self) -> None:
-        """Load assets from JSON file if it exists."""
-        if not self.storage_path.exists():
-            return
-
+        """Load assets from storage if it exists."""
         try:
+            assets = self.store.load()
             with self._lock:
-                with self.storage_path.open("r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    # Convert list to dict keyed by symbol for fast lookup
-                    if isinstance(data, list):
-                        assets: Dict[str, Dict] = {}
-                        for index, item in enumerate(data):
-                            if not isinstance(item, dict):
-                                logger.warning(
-                                    "Skipping non-dict asset at index %s in %s",
-                                    index,
-                                    self.storage_path,
-                                )
-                                continue
-                            symbol = item.get("symbol")
-                            if not symbol:
-                                logger.warning(
-                                    'Skipping asset without "symbol" at index %s in %s',
-                                    index,
-                                    self.storage_path,
-                                )
-                                continue
-                            assets[symbol] = item
-                        self.assets = assets
-                    elif isinstance(data, dict):
-                        self.assets = data
-                    else:
-                        logger.warning(
-                            "Unexpected data format in %s: %s",
-                            self.storage_path,
-                            type(data).__name__,
-                        )
-            logger.info(f"Loaded {len(self.assets)} assets from {self.storage_path}")
+                if isinstance(assets, BinarySnapshot):
+                    # Publish the mapped file with its stored orders as-is;
+                    # nothing is decoded until it is read or written
+                    self._base = assets
+                    self._snapshot = AssetSnapshot(
+                        self._snapshot.generation + 1, assets, assets.orders()
+                    )
+                else:
+                    self.assets = dict(assets)
+                    self._rankings = build_indexes(self.assets)
+                    self._publish()
+            logger.info(f"Loaded {len(self._snapshot)} assets from {self.storage_path}")
         except Exception as e:
             logger.error(f"Failed to load assets from storage: {e}")
 
     def save(self) -> None:
         """
-        Persist assets to JSON file using atomic write.
+        Persist all assets, replacing the stored contents.
         """
-        try:
-            # Ensure directory exists
-            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._save_lock:
+            with self._lock:
+                assets_list = list(self._snapshot.assets.values())
+                pending, self._pending = self._pending, ChangeSet()
+            try:
+                self.store.save_all(assets_list)
+            except Exception as e:
+                logger.error(f"Failed to save assets to storage: {e}")
+                self._restore_pending(pending)
 
+    def flush(self) -> None:
+        """Write pending changes to storage now, if there are any."""
+        with self._save_lock:
             with self._lock:
-                assets_list = list(self.assets.values())
+                pending, self._pending = self._pending, ChangeSet()
+                if not pending:
+                    return
+                assets = self._snapshot.assets
+            changed = {symbol: assets.get(symbol) for symbol in pending.changed}
+            try:
+                self.store.save_changes(changed, self.get_all)
+            except Exception as e:
+                logger.error(f"Failed to save assets to storage: {e}")
+                self._restore_pending(pending)
+
+    def _restore_pending(self, pending: ChangeSet) -> None:
+        # Keep the changes pending so the next flush retries
+        with self._lock:
+            self._pending = pending.merge(self._pending)
 
-            # Atomic write: write to temp file then move
-            temp_path = self.storage_path.with_suffix(".tmp")
-            with temp_path.open("w", encoding="utf-8") as f:
-                json.dump(assets_list, f, indent=2)
-                f.flush()
-                os.fsync(f.fileno())
+    def close(self) -> None:
+        """Stop the background flusher and write pending changes."""
+        self._closing.set()
+        self._wake.set()
+        flusher = self._flusher
+        if flusher is not None:
+            flusher.join()
+            atexit.unregister(self.close)
+        self.flush()
+        self._close_storage()
 
-            shutil.move(str(temp_path), str(self.storage_path))
+    def _close_storage(self) -> None:
+        """Release the storage opened by `_open_storage`."""
+        self.store.close()
 
-            logger.info(f"Saved {len(assets_list)} assets to {self.storage_path}")
-        except Exception as e:
-            logger.error(f"Failed to save assets to storage: {e}")
-            if 'temp_path' in locals() and temp_path.exists():
-                try:
-                    temp_path.unlink()
-                except Exception:
-                    pass
-
-    def upsert(self, assets: List[Dict]) -> None:
-        """Update or insert a list of assets."""
+    def _mark_dirty(self, changes: ChangeSet) -> None:
+        """Schedule persisting `changes`."""
+        with self._lock:
+            self._pending = self._pending.merge(changes)
+        if self.write_behind_seconds <= 0 or self._closing.is_set():
+            self.flush()
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop,
+                    name="asset-repository-flusher",
+                    daemon=True,
+                )
+                self._flusher.start()
+                atexit.register(self.close)
+        self._wake.set()
+
+    def _flush_loop(self) -> None:
+        while not self._closing.is_set():
+            self._wake.wait()
+            # Let upserts arriving within the window coalesce into this write
+            self._closing.wait(self.write_behind_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def subscribe(self, callback: Callable[[ChangeSet], None]) -> None:
+        """
+        Register a callback invoked with the ChangeSet of every write that
+        changed something (e.g. to invalidate downstream caches).
+        """
+        with self._lock:
+            self._listeners.append(callback)
+
+    def _notify(self, changes: ChangeSet) -> None:
+        if not changes:
+            return
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(changes)
+            except Exception as e:
+                logger.error(f"Asset change listener failed: {e}")
+
+    def upsert(self, assets: List[Dict[str, Any]], prune: bool = False) -> ChangeSet:
+        """
+        Update or insert a list of assets.
+
+        Incoming records are compared with the stored ones field by field;
+        only records that changed are replaced, and a save is only
+        scheduled if something changed.
+
+        Args:
+            assets: Asset records, keyed by their `symbol` field.
+            prune: Also remove stored assets missing from `assets`.
+
+        Returns:
+            The symbols added, updated and removed.
+        """
         with self._lock:
+            added, updated = self._apply(assets)
+            removed: Set[str] = set()
+            if prune:
+                removed = self._prune({a["symbol"] for a in assets if a.get("symbol")})
+            changes = ChangeSet(
+                frozenset(added), frozenset(updated), frozenset(removed)
+            )
+            if changes:
+                self._publish()
+        if changes:
+            self._mark_dirty(changes)
+        self._notify(changes)
+        return changes
+
+    def upsert_iter(
+        self,
+        assets: Iterable[Dict[str, Any]],
+        batch_size: int = 500,
+        prune: bool = False,
+    ) -> ChangeSet:
+        """
+        Update or insert assets from an iterator (e.g. a streaming fetch).
+
+        Records are applied in batches so the lock is not held while the
+        producer is decoding, and one save is scheduled at the end if
+        anything changed. If `assets` raises, the batches already applied
+        are still published and persisted (without pruning) before the
+        error propagates.
+
+        Returns:
+            The symbols added, updated and removed.
+        """
+        added: Set[str] = set()
+        updated: Set[str] = set()
+        seen: Set[str] = set()
+        removed: Set[str] = set()
+        batch: List[Dict[str, Any]] = []
+        try:
+            for asset in assets:
+                batch.append(asset)
+                if len(batch) >= batch_size:
+                    self._apply_batch(batch, added, updated, seen)
+                    batch = []
+            if batch:
+                self._apply_batch(batch, added, updated, seen)
+            if prune:
+                removed = self._prune(seen)
+        finally:
+            # Applied batches are already in the working copy; publish them
+            # even on failure so readers and storage don't fall behind it
+            changes = ChangeSet(
+                frozenset(added), frozenset(updated), frozenset(removed)
+            )
+            if changes:
+                with self._lock:
+                    self._publish()
+                self._mark_dirty(changes)
+            self._notify(changes)
+        return changes
+
+    def _apply_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        added: Set[str],
+        updated: Set[str],
+        seen: Set[str],
+    ) -> None:
+        batch_added, batch_updated = self._apply(batch)
+        added |= batch_added
+        updated |= batch_updated - added
+        seen.update(a["symbol"] for a in batch if a.get("symbol"))
+
+    def _materialize(self) -> None:
+        """Copy a loaded binary snapshot into the working copy. Caller holds _lock."""
+        if self._base is not None:
+            self.assets = dict(zip(self._base, self._base.values(), strict=True))
+            self._rankings = build_indexes(self.assets)
+            self._base = None
+
+    def _apply(self, assets: Iterable[Dict[str, Any]]) -> Tuple[Set[str], Set[str]]:
+        """Store records that differ from the stored ones; return (added, updated)."""
+        added: Set[str] = set()
+        updated: Set[str] = set()
+        with self._lock:
+            self._materialize()
             for asset in assets:
                 symbol = asset.get("symbol")
-                if symbol:
-                    self.assets[symbol] = asset
-            # Auto-save after updates. RLock allows save() to re-acquire the lock if needed,
-            # but we changed save() to acquire lock internally for just the read.
-            self.save()
+                if not symbol:
+                    continue
+                current = self.assets.get(symbol)
+                if current is None:
+                    added.add(symbol)
+                elif record_changed(current, asset, self.change_tolerance):
+                    if symbol not in added:
+                        updated.add(symbol)
+                else:
+                    continue
+                self.assets[symbol] = asset
+                for index in self._rankings.values():
+                    index.update(symbol, asset)
+        return added, updated
+
+    def _prune(self, keep: Set[str]) -> Set[str]:
+        # An empty result (e.g. unchanged upstream) must not wipe the store
+        if not keep:
+            return set()
+        with self._lock:
+            self._materialize()
+            removed = {symbol for symbol in self.assets if symbol not in keep}
+            for symbol in removed:
+                del self.assets[symbol]
+                for index in self._rankings.values():
+                    index.remove(symbol)
+        return removed
+
+    def _publish(self) -> None:
+        """Publish the working copy as the next snapshot. Caller holds _lock."""
+        # Orders whose index did not move (e.g. a metadata-only write, or a
+        # price change under a volume sort) are shared with the last snapshot
+        orders = self._snapshot.orders()
+        for name, index in self._rankings.items():
+            if index.changed:
+                orders[name] = tuple(index.top())
+                index.changed = False
+        self._snapshot = AssetSnapshot(
+            self._snapshot.generation + 1, dict(self.assets), orders
+        )
+
+    def snapshot(self) -> AssetSnapshot:
+        """The current snapshot; read several views from it for a consistent result."""
+        return self._snapshot
+
+    @property
+    def generation(self) -> int:
+        """Number of the current snapshot; increases with every change."""
+        return self._snapshot.generation
 
     def get_all(self) -> List[Dict]:
         """Get all assets."""
-        with self._lock:
-            return list(self.assets.values())
+        return list(self._snapshot.assets.values())
 
     def get_by_symbol(self, symbol: str) -> Optional[Dict]:
-        """Get a specific asset by symbol."""
+        """
+        Get a specific asset by symbol.
+        With a metadata enricher configured, metadata is merged into the
+        stored record the first time it is requested.
+        """
+        asset = self._snapshot.assets.get(symbol.upper())
+        if asset is None:
+            return None
+        return self.with_metadata([asset])[0]
+
+    def with_metadata(self, assets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Return `assets` (e.g. a page from `get_top_by`) with metadata merged
+        into the records that lack it, and store the enriched records.
+        Missing metadata is loaded with bounded concurrency. Without a
+        metadata enricher `assets` is returned as is.
+        """
+        enricher = self.metadata_enricher
+        if enricher is None or all("metadata" in asset for asset in assets):
+            return assets
+        # Enrich outside the lock; the enricher may call upstream
+        enriched = enricher.enrich_many(assets)
+        replaced = [
+            (old, new)
+            for old, new in zip(assets, enriched, strict=True)
+            if new is not old
+        ]
+        if replaced:
+            self._store_enriched(replaced)
+        return enriched
+
+    def _store_enriched(
+        self, replaced: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> None:
+        """Replace (old, enriched) records, unless an upsert replaced them first."""
         with self._lock:
-            return self.assets.get(symbol.upper())
+            self._materialize()
+            stored = False
+            for old, new in replaced:
+                symbol = old["symbol"]
+                if self.assets.get(symbol) is old:
+                    self.assets[symbol] = new
+                    stored = True
+            if stored:
+                self._publish()
 
-    def get_top_by_volume(self, limit: int = 50) -> List[Dict]:
+    def get_top_by(self, sort: str = "volume", limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get the first `limit` assets in `sort` order (a `SORT_FIELDS` name):
+        highest first, except `rank` which is lowest first. Assets missing
+        the field come last.
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(
+                f"Unknown sort {sort!r}; expected one of {list(SORT_FIELDS)}"
+            )
+        return self._snapshot.top(sort, limit)
+
+    def get_top_by_volume(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Get top assets sorted by total volume.
         """
-        with self._lock:
-            all_assets = list(self.assets.values())
+        return self.get_top_by("volume", limit)
 
-        # Sort by volume descending. Handle None values safely.
-        sorted_assets = sorted(
-            all_assets,
-            key=lambda x: x.get("total_volume") or 0.0,
-            reverse=True
-        )
-        return sorted_assets[:limit]
+    def filter_assets(
+        self,
+        min_volume: Optional[float] = None,
+        min_market_cap: Optional[float] = None,
+        max_rank: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get assets within every given bound, sorted by total volume.
+        Assets missing a bounded field are excluded.
+        """
+        bounds = [
+            ("total_volume", min_volume, False),
+            ("market_cap", min_market_cap, False),
+            ("market_cap_rank", max_rank, True),
+        ]
+        by_volume = self._snapshot.top("volume")
+
+        matches: List[Dict[str, Any]] = []
+        for asset in by_volume:
+            if limit is not None and len(matches) >= limit:
+                break
+            for field, bound, upper in bounds:
+                if bound is None:
+                    continue
+                value = to_float(asset.get(field))
+                if value is None or (value > bound if upper else value < bound):
+                    break
+            else:
+                matches.append(asset)
+        return matches
+
+
+def create_repository(
+    settings: CryptoSettings,
+    metadata_enricher: Optional["CoinMetadataEnricher"] = None,
+) -> CryptoAssetRepository:
+    """
+    Build the repository for `storage_mode` ("json", "journal", "binary"
+    or "sqlite").
+    """
+    if settings.storage_mode == "sqlite":
+        # Imported here; the SQLite repository subclasses this module's class
+        from awesome_cli.core.crypto.sqlite_repository import SQLiteAssetRepository
+
+        return SQLiteAssetRepository(settings, metadata_enricher=metadata_enricher)
+    return CryptoAssetRepository(settings, metadata_enricher=metadata_enricher)
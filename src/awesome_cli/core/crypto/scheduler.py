@@ -26,10 +26,15 @@ class CryptoDataScheduler:
         repository: CryptoAssetRepository
     ):
         self.interval = settings.scheduler_interval_minutes * 60
+        self.coin_limit = settings.scheduler_coin_limit
+        self.full_refresh_every = settings.scheduler_full_refresh_every
+        self.stream = settings.coingecko_stream_responses
+        self.currencies = [c.lower() for c in settings.quote_currencies] or ["usd"]
         self.fetcher = fetcher
         self.repository = repository
         self._stop_event = threading.Event()
         self._thread: threading.Thread | None = None
+        self._cycles = 0
 
     def start(self) -> None:
         """Start the background scheduler thread."""
@@ -52,8 +57,14 @@ class CryptoDataScheduler:
     def _run_loop(self) -> None:
         """Main loop for the scheduler thread."""
         while not self._stop_event.is_set():
+            # The first refresh after start is a full one, then every Nth
+            full = (
+                self.full_refresh_every > 0
+                and self._cycles % self.full_refresh_every == 0
+            )
+            self._cycles += 1
             try:
-                self.refresh_now()
+                self.refresh_now(full=full)
             except Exception as e:
                 logger.error(f"Error in scheduler loop: {e}")
 
@@ -61,18 +72,79 @@ class CryptoDataScheduler:
             if self._stop_event.wait(self.interval):
                 break
 
-    def refresh_now(self) -> None:
+    def refresh_now(self, full: bool = False) -> bool:
         """
         Trigger an immediate refresh of data.
         Fetches from API and updates repository.
+
+        Uses conditional requests, so an unchanged upstream payload skips
+        normalization and the repository write. Conditional multi-page
+        fetches only return the pages that changed, so they never remove
+        assets; a full refresh does.
+
+        Args:
+            full: Fetch unconditionally and remove stored assets that are no
+                longer in the top list.
+
+        Returns:
+            True if any asset changed, False otherwise.
         """
-        logger.info("Starting scheduled data refresh...")
+        logger.info(f"Starting scheduled {'full ' if full else ''}data refresh...")
+        if_changed = not full
         try:
-            data = self.fetcher.fetch_top_coins(limit=50)
-            if data:
-                self.repository.upsert(data)
-                logger.info(f"Successfully refreshed {len(data)} assets.")
+            if len(self.currencies) > 1:
+                data = self.fetcher.fetch_top_coins_multi(
+                    self.currencies, limit=self.coin_limit, if_changed=if_changed
+                )
+            elif self.stream:
+                return self._refresh_streaming(full)
             else:
-                logger.warning("No data fetched.")
+                data = self.fetcher.fetch_top_coins(
+                    limit=self.coin_limit,
+                    currency=self.currencies[0],
+                    if_changed=if_changed,
+                )
+            if data is None:
+                logger.info("Upstream data unchanged; skipping update.")
+                return False
+            if data:
+                changes = self.repository.upsert(data, prune=full)
+                if not changes:
+                    logger.info(f"Fetched {len(data)} assets; none changed.")
+                    return False
+                logger.info(
+                    f"Successfully refreshed {len(data)} assets "
+                    f"({len(changes.added)} added, {len(changes.updated)} updated, "
+                    f"{len(changes.removed)} removed)."
+                )
+                return True
+            logger.warning("No data fetched.")
         except Exception as e:
             logger.error(f"Failed to refresh data: {e}")
+        return False
+
+    def _refresh_streaming(self, full: bool) -> bool:
+        """Refresh by piping streamed coins straight into the repository."""
+        generation = self.repository.generation
+        try:
+            changes = self.repository.upsert_iter(
+                self.fetcher.iter_top_coins(
+                    limit=self.coin_limit,
+                    currency=self.currencies[0],
+                    if_changed=not full,
+                ),
+                prune=full,
+            )
+        except Exception as e:
+            # Coins applied before the failure are kept
+            logger.error(f"Failed to refresh data (streamed): {e}")
+            return self.repository.generation != generation
+        if changes:
+            logger.info(
+                f"Successfully refreshed assets (streamed): "
+                f"{len(changes.added)} added, {len(changes.updated)} updated, "
+                f"{len(changes.removed)} removed."
+            )
+            return True
+        logger.info("Upstream data unchanged or empty; no assets changed.")
+        return False
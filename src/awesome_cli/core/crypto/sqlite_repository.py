@@ -0,0 +1,383 @@
+"""
+SQLite Asset Repository
+=======================
+
+`CryptoAssetRepository` drop-in that keeps assets in a SQLite database
+(`storage_mode = "sqlite"`) instead of an in-memory dict.
+
+Each record is stored as compact JSON next to indexed `total_volume`,
+`market_cap` and `market_cap_rank` columns (the 24h/7d price changes are
+indexed as JSON expressions), so top-N and filtered queries are answered
+by the database from an index rather than by sorting every asset.
+
+Writes go through one connection under the repository lock and are
+committed synchronously, one transaction per batch. The database runs in
+WAL mode, so reads use a read-only connection per thread and take no lock:
+they see the last committed state and never wait on a writer. WAL commits
+are made durable by checkpoints, which run write-behind like the other
+stores' saves (`storage_write_behind_seconds`, `flush()`, `close()`).
+
+There is no in-memory copy, so `snapshot()` is not supported; use the
+query methods, each of which reads one consistent state.
+
+On first open an existing JSON (or journal) store at `storage_path` is
+migrated into the database; the JSON files are left untouched.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.diff import ChangeSet, record_changed
+from awesome_cli.core.crypto.normalizer import to_float
+from awesome_cli.core.crypto.ranking import SORT_FIELDS
+from awesome_cli.core.crypto.repository import AssetSnapshot, CryptoAssetRepository
+from awesome_cli.core.crypto.storage import JournalStore
+
+if TYPE_CHECKING:
+    from awesome_cli.core.crypto.metadata import CoinMetadataEnricher
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits bound parameters per statement
+_CHUNK = 500
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS assets ("
+    "symbol TEXT PRIMARY KEY, data TEXT NOT NULL, "
+    "total_volume REAL, market_cap REAL, market_cap_rank INTEGER)",
+    "CREATE INDEX IF NOT EXISTS assets_total_volume ON assets (total_volume)",
+    "CREATE INDEX IF NOT EXISTS assets_market_cap ON assets (market_cap)",
+    "CREATE INDEX IF NOT EXISTS assets_market_cap_rank ON assets (market_cap_rank)",
+    "CREATE INDEX IF NOT EXISTS assets_change_24h "
+    "ON assets (json_extract(data, '$.price_change_percentage_24h'))",
+    "CREATE INDEX IF NOT EXISTS assets_change_7d "
+    "ON assets (json_extract(data, '$.price_change_percentage_7d_in_currency'))",
+)
+
+# Sort name -> indexed SQL expression
+_SORT_EXPRESSIONS = {
+    "volume": "total_volume",
+    "market_cap": "market_cap",
+    "change_24h": "json_extract(data, '$.price_change_percentage_24h')",
+    "change_7d": "json_extract(data, '$.price_change_percentage_7d_in_currency')",
+    "rank": "market_cap_rank",
+}
+
+
+_Row = Tuple[str, str, Optional[float], Optional[float], Optional[float]]
+
+
+class _ReaderConnection(sqlite3.Connection):
+    """Per-thread read connection; a subclass so it can be weakly referenced."""
+
+
+def _encode(asset: Dict[str, Any]) -> str:
+    return json.dumps(asset, separators=(",", ":"))
+
+
+def _row(asset: Dict[str, Any]) -> _Row:
+    return (
+        asset["symbol"],
+        _encode(asset),
+        to_float(asset.get("total_volume")),
+        to_float(asset.get("market_cap")),
+        to_float(asset.get("market_cap_rank")),
+    )
+
+
+class SQLiteAssetRepository(CryptoAssetRepository):
+    """
+    Repository backed by a SQLite database.
+    Thread-safe; writes run under the repository lock, reads on a
+    per-thread connection without it.
+    """
+
+    def __init__(
+        self,
+        settings: CryptoSettings,
+        metadata_enricher: Optional["CoinMetadataEnricher"] = None,
+    ):
+        self.db_path = Path(
+            settings.storage_sqlite_path
+            or Path(settings.storage_path).with_suffix(".db")
+        )
+        # Increased by `_publish` on every committed change
+        self._generation = 0
+        super().__init__(settings, metadata_enricher=metadata_enricher)
+
+    def _open_storage(self, settings: CryptoSettings) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Reader connections, one per thread; the set lets close() reach
+        # those whose thread is still alive
+        self._local = threading.local()
+        self._readers: "weakref.WeakSet[_ReaderConnection]" = weakref.WeakSet()
+        self._readers_lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+        if self.count() == 0 and self.storage_path.exists():
+            self.import_json(self.storage_path)
+
+    def import_json(self, path: Path) -> int:
+        """
+        Load assets from a JSON (or journal) store into the database.
+
+        Returns:
+            The number of assets imported.
+        """
+        try:
+            assets = JournalStore(str(path)).read()
+        except Exception as e:
+            logger.error(f"Failed to read assets from {path}: {e}")
+            return 0
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?)",
+                    [_row(asset) for asset in assets.values() if asset.get("symbol")],
+                )
+            self._publish()
+        logger.info(f"Migrated {len(assets)} assets from {path} to {self.db_path}")
+        return len(assets)
+
+    def _reader(self) -> sqlite3.Connection:
+        """This thread's read-only connection, opened on first use."""
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                check_same_thread=False,  # close() runs on another thread
+                factory=_ReaderConnection,
+            )
+            conn.execute("PRAGMA query_only=ON")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.add(conn)
+        return conn
+
+    def count(self) -> int:
+        """Number of stored assets."""
+        count: int = self._reader().execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+        return count
+
+    def _apply(self, assets: Iterable[Dict[str, Any]]) -> Tuple[Set[str], Set[str]]:
+        incoming: Dict[str, Dict[str, Any]] = {}
+        for asset in assets:
+            if asset.get("symbol"):
+                incoming[asset["symbol"]] = asset
+        added: Set[str] = set()
+        updated: Set[str] = set()
+        with self._lock:
+            current = self._fetch(list(incoming))
+            rows = []
+            for symbol, asset in incoming.items():
+                stored = current.get(symbol)
+                if stored is None:
+                    added.add(symbol)
+                elif record_changed(stored, asset, self.change_tolerance):
+                    updated.add(symbol)
+                else:
+                    continue
+                rows.append(_row(asset))
+            if rows:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?)", rows
+                    )
+        return added, updated
+
+    def _prune(self, keep: Set[str]) -> Set[str]:
+        # An empty result (e.g. unchanged upstream) must not wipe the store
+        if not keep:
+            return set()
+        with self._lock:
+            stored = {row[0] for row in self._conn.execute("SELECT symbol FROM assets")}
+            removed = stored - keep
+            if removed:
+                with self._conn:
+                    self._conn.executemany(
+                        "DELETE FROM assets WHERE symbol = ?", [(s,) for s in removed]
+                    )
+        return removed
+
+    def _fetch(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        found: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(symbols), _CHUNK):
+            chunk = symbols[start:start + _CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            for symbol, data in self._conn.execute(
+                f"SELECT symbol, data FROM assets WHERE symbol IN ({placeholders})",
+                chunk,
+            ):
+                found[symbol] = json.loads(data)
+        return found
+
+    def _query(
+        self,
+        sql: str,
+        params: Iterable[Any] = (),
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> List[Dict[str, Any]]:
+        rows = (conn or self._reader()).execute(sql, tuple(params)).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def _publish(self) -> None:
+        """Count a committed change. Caller holds _lock."""
+        self._generation += 1
+
+    @property
+    def generation(self) -> int:
+        """Number of committed changes; increases with every change."""
+        return self._generation
+
+    def snapshot(self) -> AssetSnapshot:
+        """Not supported: there is no in-memory copy to take a snapshot of."""
+        raise NotImplementedError(
+            "SQLiteAssetRepository keeps no in-memory snapshot; "
+            "use get_top_by, filter_assets or get_by_symbol instead"
+        )
+
+    def save(self) -> None:
+        """Checkpoint the write-ahead log into the database file."""
+        with self._save_lock:
+            with self._lock:
+                pending, self._pending = self._pending, ChangeSet()
+            self._checkpoint(pending)
+
+    def flush(self) -> None:
+        """Checkpoint the write-ahead log if changes were committed since."""
+        with self._save_lock:
+            with self._lock:
+                pending, self._pending = self._pending, ChangeSet()
+            if pending:
+                self._checkpoint(pending)
+
+    def _checkpoint(self, pending: ChangeSet) -> None:
+        try:
+            with self._lock:
+                self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to checkpoint {self.db_path}: {e}")
+            self._restore_pending(pending)
+
+    def _close_storage(self) -> None:
+        """Close the writer and every open reader connection."""
+        with self._readers_lock:
+            readers = list(self._readers)
+        for conn in readers:
+            conn.close()
+        with self._lock:
+            self._conn.close()
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """Get all assets."""
+        return self._query("SELECT data FROM assets")
+
+    def get_by_symbol(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a specific asset by symbol.
+        With a metadata enricher configured, metadata is merged into the
+        stored record the first time it is requested.
+        """
+        key = symbol.upper()
+        row = self._reader().execute(
+            "SELECT data FROM assets WHERE symbol = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        asset: Dict[str, Any] = json.loads(row[0])
+        return self.with_metadata([asset])[0]
+
+    def _store_enriched(
+        self, replaced: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> None:
+        with self._lock:
+            with self._conn:
+                # Records are stored as `_encode` output, so comparing the
+                # encoded old record skips rows replaced by a concurrent upsert
+                cursor = self._conn.executemany(
+                    "UPDATE assets SET data = ? WHERE symbol = ? AND data = ?",
+                    [
+                        (_encode(new), old["symbol"], _encode(old))
+                        for old, new in replaced
+                    ],
+                )
+            if cursor.rowcount > 0:
+                self._publish()
+
+    def get_top_by(self, sort: str = "volume", limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get the first `limit` assets in `sort` order (a `SORT_FIELDS` name):
+        highest first, except `rank` which is lowest first. Assets missing
+        the field come last.
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(
+                f"Unknown sort {sort!r}; expected one of {list(SORT_FIELDS)}"
+            )
+        expression = _SORT_EXPRESSIONS[sort]
+        direction = "DESC" if SORT_FIELDS[sort].descending else "ASC"
+        # Two index-ordered scans keep missing values last in either direction
+        # SQLite reads a negative LIMIT as "no limit"
+        limit = max(limit, 0)
+        conn = self._reader()
+        # One read transaction, so both scans see the same commit
+        conn.execute("BEGIN")
+        try:
+            found = self._query(
+                f"SELECT data FROM assets WHERE {expression} IS NOT NULL "
+                f"ORDER BY {expression} {direction}, symbol LIMIT ?",
+                (limit,),
+                conn,
+            )
+            if len(found) < limit:
+                found += self._query(
+                    f"SELECT data FROM assets WHERE {expression} IS NULL "
+                    f"ORDER BY symbol LIMIT ?",
+                    (limit - len(found),),
+                    conn,
+                )
+        finally:
+            conn.commit()
+        return found
+
+    def filter_assets(
+        self,
+        min_volume: Optional[float] = None,
+        min_market_cap: Optional[float] = None,
+        max_rank: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get assets within every given bound, sorted by total volume.
+        Assets missing a bounded field are excluded.
+        """
+        clauses = []
+        params: List[Any] = []
+        for column, bound, op in (
+            ("total_volume", min_volume, ">="),
+            ("market_cap", min_market_cap, ">="),
+            ("market_cap_rank", max_rank, "<="),
+        ):
+            if bound is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(bound)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        # -1 means no limit to SQLite; a negative `limit` means no rows
+        params.append(-1 if limit is None else max(limit, 0))
+        return self._query(
+            f"SELECT data FROM assets{where} "
+            "ORDER BY total_volume DESC, symbol LIMIT ?",
+            params,
+        )
@@ -0,0 +1,256 @@
+"""
+CoinGecko Stand-in Server
+=========================
+
+A local HTTP server that imitates the CoinGecko endpoints used by
+`CryptoDataFetcher`, for offline integration tests and load benchmarks.
+
+Point `coingecko_api_base_url` at `CoinGeckoStandIn.base_url` to use it.
+It serves:
+
+*   `GET /coins/markets`: recorded or synthetic payloads, paginated with
+    `per_page`/`page` and sorted by volume, with ETag/304 support.
+*   `GET /coins/{id}`: synthetic coin metadata.
+*   `GET /coins/{id}/market_chart/range`: synthetic hourly history.
+
+Latency, payload size (number of coins) and 429 injection are configurable,
+and request counts are recorded for assertions.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+
+def synthetic_markets(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate `count` market entries shaped like CoinGecko's response."""
+    rng = random.Random(seed)
+    coins = []
+    for i in range(count):
+        price = rng.uniform(0.001, 50000)
+        coins.append({
+            "id": f"coin-{i}",
+            "symbol": f"c{i}",
+            "name": f"Coin {i}",
+            "image": f"https://example.invalid/coins/{i}.png",
+            "current_price": price,
+            "market_cap": price * rng.randint(10_000, 50_000_000),
+            "market_cap_rank": i + 1,
+            "total_volume": rng.uniform(1_000, 5e10),
+            "high_24h": price * 1.04,
+            "low_24h": price * 0.96,
+            "price_change_percentage_24h": rng.uniform(-15, 15),
+            "price_change_percentage_7d_in_currency": rng.uniform(-30, 30),
+            "ath": price * 2.5,
+            "atl": price / 3,
+            "last_updated": "2024-01-01T00:00:00.000Z",
+        })
+    return coins
+
+
+class CoinGeckoStandIn:
+    """
+    Threaded local stand-in for the CoinGecko API.
+
+    Args:
+        coins: Market entries to serve; defaults to synthetic data.
+        coin_count: Number of synthetic coins when `coins` is not given.
+        latency: Seconds added to every response.
+        error_rate: Probability of answering with 429 instead of data.
+        error_every: Answer every Nth request with 429 (0 disables).
+        retry_after: Value of the Retry-After header on injected 429s.
+        seed: Seed for synthetic data and error injection.
+    """
+
+    def __init__(
+        self,
+        coins: Optional[List[Dict[str, Any]]] = None,
+        coin_count: int = 250,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_every: int = 0,
+        retry_after: int = 0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_every = error_every
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+        self.not_modified_count = 0
+        if coins is None:
+            coins = synthetic_markets(coin_count, seed)
+        self.set_coins(coins)
+
+        handler = self._make_handler()
+        self._host = host
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_recording(cls, path: str, **kwargs: Any) -> "CoinGeckoStandIn":
+        """Serve a recorded `coins/markets` payload (a JSON list) from disk."""
+        with Path(path).open("r", encoding="utf-8") as f:
+            coins = json.load(f)
+        if not isinstance(coins, list):
+            raise ValueError(f"Recording {path} is not a JSON list")
+        return cls(coins=coins, **kwargs)
+
+    @property
+    def base_url(self) -> str:
+        # server_port is the bound port, also when `port` was 0
+        return f"http://{self._host}:{self._server.server_port}/api/v3"
+
+    @property
+    def coins(self) -> List[Dict[str, Any]]:
+        """The served market data, ordered by volume."""
+        with self._lock:
+            return list(self._coins)
+
+    def set_coins(self, coins: List[Dict[str, Any]]) -> None:
+        """Replace the served market data (e.g. to simulate a price tick)."""
+        ordered = sorted(
+            coins, key=lambda c: c.get("total_volume") or 0.0, reverse=True
+        )
+        with self._lock:
+            self._coins = ordered
+
+    def start(self) -> "CoinGeckoStandIn":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"CoinGecko stand-in listening on {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "CoinGeckoStandIn":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.request_count += 1
+            fail = bool(self.error_every) and self.request_count % self.error_every == 0
+            if not fail and self.error_rate:
+                fail = self._rng.random() < self.error_rate
+            if fail:
+                self.error_count += 1
+            return fail
+
+    def _markets(self, query: Dict[str, List[str]]) -> bytes:
+        per_page = min(int(query.get("per_page", ["100"])[0]), 250)
+        page = max(int(query.get("page", ["1"])[0]), 1)
+        with self._lock:
+            selected = self._coins[(page - 1) * per_page:page * per_page]
+        return json.dumps(selected).encode("utf-8")
+
+    @staticmethod
+    def _coin_detail(coin_id: str) -> bytes:
+        return json.dumps({
+            "id": coin_id,
+            "description": {"en": f"{coin_id} is a synthetic coin."},
+            "categories": ["Synthetic"],
+            "links": {"homepage": [f"https://example.invalid/{coin_id}"]},
+        }).encode("utf-8")
+
+    @staticmethod
+    def _market_chart(query: Dict[str, List[str]]) -> bytes:
+        start = int(query["from"][0])
+        end = int(query["to"][0])
+        hours = range(start - start % 3600 + 3600, end, 3600)
+        return json.dumps({
+            "prices": [[ts * 1000, 100.0 + (ts // 3600) % 50] for ts in hours],
+            "market_caps": [],
+            "total_volumes": [[ts * 1000, 1e6] for ts in hours],
+        }).encode("utf-8")
+
+    def _make_handler(self) -> type:
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(format, *args)
+
+            def do_GET(self) -> None:
+                if standin.latency:
+                    time.sleep(standin.latency)
+                if standin._should_fail():
+                    self._send(
+                        429,
+                        b'{"error": "rate limited"}',
+                        {"Retry-After": str(standin.retry_after)},
+                    )
+                    return
+
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                parts = [p for p in parsed.path.split("/") if p]
+                if parts[:2] == ["api", "v3"]:
+                    parts = parts[2:]
+
+                try:
+                    if parts == ["coins", "markets"]:
+                        body = standin._markets(query)
+                    elif len(parts) == 2 and parts[0] == "coins":
+                        body = standin._coin_detail(parts[1])
+                    elif (
+                        len(parts) == 4
+                        and parts[0] == "coins"
+                        and parts[2:] == ["market_chart", "range"]
+                    ):
+                        body = standin._market_chart(query)
+                    else:
+                        self._send(404, b'{"error": "not found"}')
+                        return
+                except (KeyError, ValueError):
+                    self._send(400, b'{"error": "bad request"}')
+                    return
+
+                etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    with standin._lock:
+                        standin.not_modified_count += 1
+                    self._send(304, b"", {"ETag": etag})
+                    return
+                self._send(200, body, {"ETag": etag})
+
+            def _send(
+                self,
+                status: int,
+                body: bytes,
+                headers: Optional[Dict[str, str]] = None,
+            ) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if status != 304:
+                    self.wfile.write(body)
+
+        return Handler
@@ -0,0 +1,160 @@
+"""
+Hot-Path Statistics
+===================
+
+Low-overhead counters and latency histograms for `CacheManager`.
+
+Every thread records into its own counter dict and histogram lists, so
+recording takes no lock and never contends. `StatsRecorder.snapshot` merges
+all threads' values on demand; counters of threads that have exited are
+folded into a retired total so nothing is lost.
+
+Latencies go into logarithmic buckets (bucket `i` holds durations below
+2**i microseconds), which keeps recording O(1) and allocation-free and is
+precise enough for percentile estimates used to size TTLs and capacity.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Bucket i covers [2**(i-1), 2**i) microseconds; the last is unbounded
+HISTOGRAM_BUCKETS = 32
+
+_PERCENTILES = (0.5, 0.9, 0.99)
+
+
+class _ThreadStats:
+    __slots__ = ("thread", "counters", "histograms")
+
+    def __init__(self, thread: threading.Thread):
+        self.thread = thread
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, List[int]] = {}
+
+
+class StatsRecorder:
+    """
+    Per-thread counters and latency histograms merged on snapshot.
+    Thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._threads: List[_ThreadStats] = []
+        self._retired = _ThreadStats(threading.main_thread())
+        self._registry_lock = threading.Lock()
+
+    def _mine(self) -> _ThreadStats:
+        try:
+            return self._local.stats  # type: ignore[no-any-return]
+        except AttributeError:
+            stats = self._local.stats = _ThreadStats(threading.current_thread())
+            with self._registry_lock:
+                self._threads.append(stats)
+            return stats
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        """Add `amount` to a counter."""
+        try:
+            counters = self._local.stats.counters
+        except AttributeError:
+            counters = self._mine().counters
+        counters[name] = counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record one duration in a histogram."""
+        self._observe(self._mine(), name, seconds)
+
+    def incr_and_observe(self, counter: str, histogram: str, seconds: float) -> None:
+        """`incr(counter)` and `observe(histogram, seconds)` in one call."""
+        stats = self._mine()
+        counters = stats.counters
+        counters[counter] = counters.get(counter, 0) + 1
+        self._observe(stats, histogram, seconds)
+
+    @staticmethod
+    def _observe(stats: _ThreadStats, name: str, seconds: float) -> None:
+        histograms = stats.histograms
+        buckets = histograms.get(name)
+        if buckets is None:
+            buckets = histograms[name] = [0] * HISTOGRAM_BUCKETS
+        index = int(seconds * 1e6).bit_length()
+        buckets[index if index < HISTOGRAM_BUCKETS else HISTOGRAM_BUCKETS - 1] += 1
+
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        with self._registry_lock:
+            for stats in self._threads:
+                stats.counters.clear()
+                stats.histograms.clear()
+            self._retired.counters.clear()
+            self._retired.histograms.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Merge every thread's values.
+
+        Returns:
+            {"counters": {name: total},
+             "latency": {name: {"count", "p50_ms", "p90_ms", "p99_ms", "max_ms"}}}
+        """
+        with self._registry_lock:
+            alive = []
+            for stats in self._threads:
+                if not stats.thread.is_alive():
+                    _merge_into(self._retired, stats)
+                else:
+                    alive.append(stats)
+            self._threads = alive
+            counters = dict(self._retired.counters)
+            histograms = {k: list(v) for k, v in self._retired.histograms.items()}
+            # Reads of another thread's dicts may race with its writes; a
+            # snapshot is allowed to be off by the in-flight increments
+            for stats in alive:
+                for name, value in list(stats.counters.items()):
+                    counters[name] = counters.get(name, 0) + value
+                for name, buckets in list(stats.histograms.items()):
+                    merged = histograms.setdefault(name, [0] * HISTOGRAM_BUCKETS)
+                    for i, count in enumerate(buckets):
+                        merged[i] += count
+        return {
+            "counters": counters,
+            "latency": {
+                name: summarize(buckets) for name, buckets in histograms.items()
+            },
+        }
+
+
+def _merge_into(target: _ThreadStats, source: _ThreadStats) -> None:
+    for name, value in source.counters.items():
+        target.counters[name] = target.counters.get(name, 0) + value
+    for name, buckets in source.histograms.items():
+        merged = target.histograms.setdefault(name, [0] * HISTOGRAM_BUCKETS)
+        for i, count in enumerate(buckets):
+            merged[i] += count
+
+
+def _bucket_upper_ms(index: int) -> float:
+    return 2.0 ** index / 1000.0
+
+
+def summarize(buckets: List[int]) -> Dict[str, Optional[float]]:
+    """Count and percentile upper bounds (in ms) of a latency histogram."""
+    total = sum(buckets)
+    summary: Dict[str, Optional[float]] = {"count": total}
+    bounds: List[Tuple[float, str]] = [(p, f"p{int(p * 100)}_ms") for p in _PERCENTILES]
+    if not total:
+        for _, label in bounds:
+            summary[label] = None
+        summary["max_ms"] = None
+        return summary
+    cumulative = 0
+    pending = list(bounds)
+    for index, count in enumerate(buckets):
+        cumulative += count
+        while pending and cumulative >= pending[0][0] * total:
+            summary[pending.pop(0)[1]] = _bucket_upper_ms(index)
+        if count:
+            summary["max_ms"] = _bucket_upper_ms(index)
+    return summary
+
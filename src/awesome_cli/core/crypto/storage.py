@@ -0,0 +1,351 @@
+"""
+Asset Storage
+=============
+
+Persistence backends for `CryptoAssetRepository`, selected by
+`storage_mode`:
+
+*   `json`: the whole store is rewritten as one JSON array on every save.
+*   `journal`: changed records are appended to a line-delimited journal
+    next to the snapshot file, so write cost scales with the number of
+    changed records. Once the journal passes `storage_journal_max_bytes`
+    or `storage_journal_max_records` it is rotated and a background thread
+    folds it into a fresh snapshot.
+*   `binary`: a compact memory-mapped snapshot decoded lazily on read
+    (see `binary_store.py`), for near-instant startup on large universes.
+
+Crash safety: snapshots are written to a temp file, fsynced and moved into
+place; journal appends are fsynced, and a torn final line is dropped on
+load. Replaying a journal entry is idempotent, so a crash anywhere during
+compaction (old snapshot + rotated journal, or new snapshot + rotated
+journal not yet deleted) still loads a consistent store.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from awesome_cli.config import CryptoSettings
+
+logger = logging.getLogger(__name__)
+
+STORAGE_MODES = ("json", "journal", "binary")
+
+
+def parse_snapshot(data: Any, path: Path) -> Dict[str, Dict[str, Any]]:
+    """Index a decoded snapshot by symbol, skipping malformed records."""
+    # Convert list to dict keyed by symbol for fast lookup
+    if isinstance(data, list):
+        assets: Dict[str, Dict[str, Any]] = {}
+        for index, item in enumerate(data):
+            if not isinstance(item, dict):
+                logger.warning(
+                    "Skipping non-dict asset at index %s in %s",
+                    index,
+                    path,
+                )
+                continue
+            symbol = item.get("symbol")
+            if not symbol:
+                logger.warning(
+                    'Skipping asset without "symbol" at index %s in %s',
+                    index,
+                    path,
+                )
+                continue
+            assets[symbol] = item
+        return assets
+    if isinstance(data, dict):
+        return data
+    logger.warning(
+        "Unexpected data format in %s: %s",
+        path,
+        type(data).__name__,
+    )
+    return {}
+
+
+def write_snapshot(path: Path, assets: List[Dict[str, Any]]) -> None:
+    """Atomically replace `path` with a compact JSON array of `assets`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    try:
+        with temp_path.open("w", encoding="utf-8") as f:
+            json.dump(assets, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.move(str(temp_path), str(path))
+    except BaseException:
+        if temp_path.exists():
+            try:
+                temp_path.unlink()
+            except Exception:
+                pass
+        raise
+
+
+class AssetStore(ABC):
+    """Durable storage for the repository's symbol -> asset map."""
+
+    @abstractmethod
+    def load(self) -> Mapping[str, Dict[str, Any]]:
+        """Return the stored assets keyed by symbol."""
+
+    @abstractmethod
+    def save_all(self, assets: List[Dict[str, Any]]) -> None:
+        """Replace the stored contents with `assets`. Raises on failure."""
+
+    def save_changes(
+        self,
+        changed: Dict[str, Optional[Dict[str, Any]]],
+        snapshot: Callable[[], List[Dict[str, Any]]],
+    ) -> None:
+        """
+        Persist changed records (None marks a removal). `snapshot` returns
+        the repository's current full contents. Raises on failure.
+        """
+        self.save_all(snapshot())
+
+    @abstractmethod
+    def close(self) -> None:
+        """Finish background work and release files."""
+
+
+class JSONFileStore(AssetStore):
+    """Whole-file JSON snapshot, rewritten on every save."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        with self.path.open("r", encoding="utf-8") as f:
+            return parse_snapshot(json.load(f), self.path)
+
+    def save_all(self, assets: List[Dict[str, Any]]) -> None:
+        write_snapshot(self.path, assets)
+        logger.info(f"Saved {len(assets)} assets to {self.path}")
+
+    def close(self) -> None:
+        """Nothing to release; every save is complete when it returns."""
+
+
+class JournalStore(AssetStore):
+    """
+    Snapshot plus append-only journal of changed records.
+
+    Args:
+        path: Snapshot file; the journal lives beside it (`.journal`).
+        max_bytes: Journal size that triggers compaction.
+        max_records: Journal entries that trigger compaction.
+    """
+
+    def __init__(
+        self, path: str, max_bytes: int = 8 * 1024 * 1024, max_records: int = 100_000
+    ):
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal")
+        # Journal being folded into a snapshot by a compaction
+        self.rotated_path = self.path.with_suffix(".journal.old")
+        self.max_bytes = max_bytes
+        self.max_records = max_records
+        self._lock = threading.Lock()  # guards the journal file
+        self._snapshot_lock = threading.Lock()  # serializes snapshot writes
+        self._journal: Optional[Any] = None
+        self._journal_bytes = 0
+        self._journal_records = 0
+        self._compactor: Optional[threading.Thread] = None
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        return self._load(repair=True)
+
+    def read(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the stored assets without modifying any file: a torn final
+        journal entry is skipped rather than truncated. For reading a store
+        this instance does not write to (e.g. to migrate it).
+        """
+        return self._load(repair=False)
+
+    def _load(self, repair: bool) -> Dict[str, Dict[str, Any]]:
+        assets: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with self.path.open("r", encoding="utf-8") as f:
+                assets = parse_snapshot(json.load(f), self.path)
+        replayed = self._replay(self.rotated_path, assets, repair)
+        records = self._replay(self.journal_path, assets, repair)
+        if repair:
+            self._journal_records = records
+        if replayed or records:
+            logger.info(f"Replayed {replayed + records} journal entries")
+        return assets
+
+    def _replay(
+        self, path: Path, assets: Dict[str, Dict[str, Any]], repair: bool
+    ) -> int:
+        """
+        Apply a journal's entries to `assets`; returns how many were applied.
+        With `repair`, a torn final entry is truncated away.
+        """
+        if not path.exists():
+            return 0
+        with path.open("rb") as f:
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data) and repair:
+            # Torn final append from a crash; drop it so appends stay line-aligned
+            logger.warning(f"Dropping incomplete journal entry in {path}")
+            with path.open("r+b") as f:
+                f.truncate(end)
+        if repair and path == self.journal_path:
+            self._journal_bytes = end
+        applied = 0
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+                if entry["op"] == "put":
+                    assets[entry["asset"]["symbol"]] = entry["asset"]
+                else:
+                    assets.pop(entry["symbol"], None)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Skipping malformed journal entry in {path}: {e}")
+                continue
+            applied += 1
+        return applied
+
+    def save_all(self, assets: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            with self._snapshot_lock:
+                write_snapshot(self.path, assets)
+            # Everything journaled so far is in the snapshot
+            self._close_journal()
+            self.journal_path.unlink(missing_ok=True)
+            self.rotated_path.unlink(missing_ok=True)
+            self._journal_bytes = self._journal_records = 0
+        logger.info(f"Saved {len(assets)} assets to {self.path}")
+
+    def save_changes(
+        self,
+        changed: Dict[str, Optional[Dict[str, Any]]],
+        snapshot: Callable[[], List[Dict[str, Any]]],
+    ) -> None:
+        if not changed:
+            return
+        data = "".join(
+            json.dumps(
+                {"op": "put", "asset": asset} if asset is not None
+                else {"op": "delete", "symbol": symbol},
+                separators=(",", ":"),
+            ) + "\n"
+            for symbol, asset in changed.items()
+        ).encode("utf-8")
+        with self._lock:
+            journal = self._open_journal()
+            try:
+                journal.write(data)
+                journal.flush()
+                os.fsync(journal.fileno())
+            except BaseException:
+                # Don't leave a partial entry for later appends to extend
+                self._close_journal()
+                with self.journal_path.open("r+b") as f:
+                    f.truncate(self._journal_bytes)
+                raise
+            self._journal_bytes += len(data)
+            self._journal_records += len(changed)
+            logger.debug(
+                f"Journaled {len(changed)} asset changes to {self.journal_path}"
+            )
+            if (
+                self._journal_bytes >= self.max_bytes
+                or self._journal_records >= self.max_records
+            ) and not self._compacting():
+                # Taken now, under the lock: it holds everything in the
+                # rotated journal, and every later append is newer than it
+                self._start_compaction(snapshot())
+
+    def _open_journal(self) -> Any:
+        if self._journal is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = self.journal_path.open("ab")
+        return self._journal
+
+    def _close_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _compacting(self) -> bool:
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def _start_compaction(self, assets: List[Dict[str, Any]]) -> None:
+        """
+        Rotate the journal and fold it into a snapshot of `assets` in the
+        background. Caller holds _lock.
+        """
+        self._close_journal()
+        if self.rotated_path.exists():
+            # Left by a failed compaction: fold the current journal into it
+            # so the retried snapshot supersedes every journaled entry
+            with self.rotated_path.open("ab") as rotated:
+                rotated.write(self.journal_path.read_bytes())
+                rotated.flush()
+                os.fsync(rotated.fileno())
+            self.journal_path.unlink()
+        else:
+            os.replace(self.journal_path, self.rotated_path)
+        self._journal_bytes = self._journal_records = 0
+        self._compactor = threading.Thread(
+            target=self._compact,
+            args=(assets,),
+            name="asset-journal-compactor",
+            daemon=True,
+        )
+        self._compactor.start()
+
+    def _compact(self, assets: List[Dict[str, Any]]) -> None:
+        try:
+            with self._snapshot_lock:
+                write_snapshot(self.path, assets)
+            self.rotated_path.unlink(missing_ok=True)
+            logger.info(f"Compacted asset journal into {len(assets)}-asset snapshot")
+        except Exception as e:
+            logger.error(f"Asset journal compaction failed: {e}")
+
+    def close(self) -> None:
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            self._close_journal()
+
+
+def create_store(settings: CryptoSettings) -> AssetStore:
+    """Build the asset store selected by `storage_mode`."""
+    mode = settings.storage_mode
+    if mode == "journal":
+        return JournalStore(
+            settings.storage_path,
+            max_bytes=settings.storage_journal_max_bytes,
+            max_records=settings.storage_journal_max_records,
+        )
+    if mode == "binary":
+        # Imported here; the binary format builds on this module
+        from awesome_cli.core.crypto.binary_store import BinaryFileStore
+
+        return BinaryFileStore(
+            settings.storage_binary_path
+            or str(Path(settings.storage_path).with_suffix(".bin")),
+            json_path=settings.storage_path,
+        )
+    if mode != "json":
+        raise ValueError(
+            f"Unknown storage mode {mode!r}; expected one of {STORAGE_MODES}"
+        )
+    return JSONFileStore(settings.storage_path)
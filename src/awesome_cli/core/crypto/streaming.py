@@ -0,0 +1,105 @@
+"""
+Streaming JSON Decoding
+=======================
+
+Incremental decoding of large top-level JSON arrays.
+
+`iter_json_array` consumes a response body chunk by chunk and yields each
+array element as soon as it is complete, so the decoded payload never has
+to exist as one big list. Only the undecoded tail of the current chunk (plus
+at most one partially received element) is buffered.
+"""
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+_decoder = json.JSONDecoder()
+
+
+def iter_json_array(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array delivered as a stream of byte chunks.
+
+    Args:
+        chunks: Iterable of raw byte chunks (e.g. `response.iter_content()`).
+        encoding: Text encoding of the body.
+
+    Raises:
+        ValueError: If the body is not a well-formed JSON array.
+    """
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    chunk_iter = iter(chunks)
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+    after_value = False
+    after_comma = False
+
+    def read_more() -> bool:
+        nonlocal buffer, pos, eof
+        for chunk in chunk_iter:
+            if not chunk:
+                continue
+            # Drop already-consumed text before appending
+            buffer = buffer[pos:] + text_decoder.decode(chunk)
+            pos = 0
+            return True
+        buffer = buffer[pos:] + text_decoder.decode(b"", final=True)
+        pos = 0
+        eof = True
+        return False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of JSON stream")
+            read_more()
+            continue
+
+        char = buffer[pos]
+        if not started:
+            if char != "[":
+                raise ValueError(f"Expected JSON array, found {char!r}")
+            started = True
+            pos += 1
+            continue
+        if char == "]":
+            if after_comma:
+                raise ValueError("Trailing comma in JSON array")
+            return
+        if char == ",":
+            if not after_value:
+                raise ValueError("Unexpected ',' in JSON array")
+            after_value, after_comma = False, True
+            pos += 1
+            continue
+        if after_value:
+            raise ValueError(f"Expected ',' or ']' in JSON array, found {char!r}")
+
+        try:
+            value, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            read_more()
+            continue
+
+        # A bare number may continue in the next chunk (e.g. "12" followed by
+        # ".5"); only accept it once a delimiter has been received.
+        if (
+            not eof
+            and not isinstance(value, (dict, list, str))
+            and (end >= len(buffer) or buffer[end] not in _DELIMITERS)
+        ):
+            read_more()
+            continue
+
+        pos = end
+        after_value, after_comma = True, False
+        yield value
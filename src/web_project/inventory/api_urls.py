@@ -2,13 +2,15 @@ from django.urls import path
 from rest_framework.routers import DefaultRouter
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 from .api_views import ItemViewSet
-from .api_views_crypto import AssetViewSet  # Import the new viewset
+from .api_views_crypto import AssetViewSet, CacheStatsView  # Import the new viewset
 
 router = DefaultRouter()
 router.register(r'items', ItemViewSet)
 router.register(r'assets', AssetViewSet, basename='asset')
 
 urlpatterns = router.urls + [
+    # Admin-only cache statistics
+    path('admin/cache-stats/', CacheStatsView.as_view(), name='cache-stats'),
     # OpenAPI Schema
     path('schema/', SpectacularAPIView.as_view(), name='schema'),
     # Optional UI:
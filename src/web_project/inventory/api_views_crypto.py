@@ -1,10 +1,13 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.views import APIView
 
 from awesome_cli.config import load_settings
-from awesome_cli.core.crypto.repository import CryptoAssetRepository
+from awesome_cli.core.crypto.quotes import project_currency
+from awesome_cli.core.crypto.ranking import SORT_FIELDS
+from awesome_cli.core.crypto.repository import create_repository
 
 # We should avoid module level instantiation here if possible,
 # but for ViewSet it's tricky without a DI framework.
@@ -29,7 +32,32 @@ def get_repository():
 
     # Fallback for tests or if not initialized (though it should be)
     settings = load_settings()
-    return CryptoAssetRepository(settings.crypto)
+    return create_repository(settings.crypto)
+
+
+def get_cache():
+    """Return the app-wide crypto cache, or None if the app didn't create one."""
+    try:
+        return getattr(apps.get_app_config('inventory'), 'crypto_cache', None)
+    except Exception:
+        return None
+
+
+def _resolve_currency(request, repository):
+    """
+    Read the `currency` query param.
+    Returns (currency, None) or (None, error Response) if unsupported.
+    """
+    currency = request.query_params.get("currency", repository.base_currency).lower()
+    if currency not in repository.quote_currencies:
+        return None, Response(
+            {"errors": [{
+                "detail": f"Unsupported currency '{currency}'. "
+                          f"Available: {', '.join(repository.quote_currencies)}"
+            }]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return currency, None
 
 
 class AssetViewSet(viewsets.ViewSet):
@@ -43,31 +71,83 @@ class AssetViewSet(viewsets.ViewSet):
         List top assets.
         Supports query params:
         - limit: number of assets to return (default 50)
-        - sort: sort field (default 'volume') - currently only supports volume desc
+        - sort: sort field (default 'volume'): volume, market_cap, change_24h
+          and change_7d sort highest first, rank lowest first
+        - currency: quote currency for price fields (default: base currency)
+        Listed assets include coin metadata when an enricher is configured.
         """
         try:
             limit = int(request.query_params.get("limit", 50))
         except ValueError:
             limit = 50
 
+        sort = request.query_params.get("sort", "volume").lower()
+        if sort not in SORT_FIELDS:
+            return Response(
+                {"errors": [{
+                    "detail": f"Unsupported sort '{sort}'. "
+                              f"Available: {', '.join(SORT_FIELDS)}"
+                }]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         repository = get_repository()
-        assets = repository.get_top_by_volume(limit=limit)
+        currency, error = _resolve_currency(request, repository)
+        if error:
+            return error
+
+        # Read before the data, so the data is never older than the generation
+        generation = repository.generation
+        # Metadata the page lacks is loaded with bounded concurrency
+        top = repository.with_metadata(repository.get_top_by(sort, limit=limit))
+        assets = [
+            project_currency(asset, currency, repository.base_currency)
+            for asset in top
+        ]
 
         return Response({
             "data": assets,
             "meta": {
                 "count": len(assets),
-                "limit": limit
+                "limit": limit,
+                "sort": sort,
+                "currency": currency,
+                "generation": generation
             }
         })
 
     def retrieve(self, request, pk=None):
         """Retrieve a specific asset by symbol."""
         repository = get_repository()
+        currency, error = _resolve_currency(request, repository)
+        if error:
+            return error
+
+        generation = repository.generation
         asset = repository.get_by_symbol(pk)
         if asset:
-            return Response({"data": asset})
+            return Response({
+                "data": project_currency(asset, currency, repository.base_currency),
+                "meta": {"generation": generation}
+            })
         return Response(
             {"errors": [{"detail": "Asset not found"}]},
             status=status.HTTP_404_NOT_FOUND
         )
+
+
+class CacheStatsView(APIView):
+    """
+    Admin-only snapshot of the crypto cache statistics
+    (hits, misses, evictions, size, latency percentiles).
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        cache = get_cache()
+        if cache is None:
+            return Response(
+                {"errors": [{"detail": "Crypto cache is not initialized"}]},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        return Response({"data": cache.stats()})
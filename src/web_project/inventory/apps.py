@@ -22,16 +22,29 @@ class InventoryConfig(AppConfig):
              pass
 
         from awesome_cli.config import load_settings
-        from awesome_cli.core.crypto.repository import CryptoAssetRepository
-        from awesome_cli.core.crypto.fetcher import CryptoDataFetcher
+        from awesome_cli.core.crypto.async_fetcher import AsyncCryptoDataFetcher
+        from awesome_cli.core.crypto.cache import create_cache
+        from awesome_cli.core.crypto.metadata import CoinMetadataEnricher
+        from awesome_cli.core.crypto.repository import create_repository
         from awesome_cli.core.crypto.scheduler import CryptoDataScheduler
 
         try:
             settings = load_settings()
 
             # Initialize components
-            self.crypto_repository = CryptoAssetRepository(settings.crypto)
-            self.crypto_fetcher = CryptoDataFetcher(settings.crypto)
+            # Shared through Redis across workers when use_redis is set
+            self.crypto_cache = create_cache(settings.crypto)
+            if settings.crypto.cache_sweep_interval_seconds > 0:
+                self.crypto_cache.start_sweeper(settings.crypto.cache_sweep_interval_seconds)
+            # The async fetcher pulls multi-page universes concurrently
+            self.crypto_fetcher = AsyncCryptoDataFetcher(settings.crypto)
+            self.crypto_metadata = CoinMetadataEnricher(
+                settings.crypto, self.crypto_fetcher, self.crypto_cache
+            )
+            # JSON, journal or SQLite storage per settings.crypto.storage_mode
+            self.crypto_repository = create_repository(
+                settings.crypto, metadata_enricher=self.crypto_metadata
+            )
             self.crypto_scheduler = CryptoDataScheduler(
                 settings.crypto,
                 self.crypto_fetcher,
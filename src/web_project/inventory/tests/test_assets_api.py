@@ -0,0 +1,106 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.quotes import QUOTE_FIELDS
+from awesome_cli.core.crypto.repository import CryptoAssetRepository
+
+
+def _quote(price, volume):
+    values = dict.fromkeys(QUOTE_FIELDS)
+    values.update(current_price=price, total_volume=volume)
+    return [values[field] for field in QUOTE_FIELDS]
+
+
+class AssetApiTests(TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        settings = CryptoSettings(
+            storage_path=str(Path(self.test_dir) / "assets.json"),
+            quote_currencies=["usd", "eur"],
+        )
+        self.repository = CryptoAssetRepository(settings)
+        self.repository.upsert([
+            {
+                "id": "bitcoin", "symbol": "BTC", "current_price": 50000.0,
+                "total_volume": 200.0, "quotes": {"eur": _quote(46000.0, 184.0)},
+            },
+            {
+                "id": "ethereum", "symbol": "ETH", "current_price": 4000.0,
+                "total_volume": 100.0,
+            },
+        ])
+        patcher = patch(
+            "inventory.api_views_crypto.get_repository", return_value=self.repository
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = APIClient()
+        User = get_user_model()
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        self.repository.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_list_defaults_to_base_currency(self):
+        response = self.client.get('/api/v1/assets/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = json.loads(response.content)['data']
+
+        self.assertEqual(content['meta']['currency'], 'usd')
+        self.assertEqual(content['data'][0]['current_price'], 50000.0)
+        self.assertNotIn('quotes', content['data'][0])
+
+    def test_list_in_other_currency(self):
+        response = self.client.get('/api/v1/assets/?currency=EUR')
+        content = json.loads(response.content)['data']
+
+        btc, eth = content['data']
+        self.assertEqual(btc['current_price'], 46000.0)
+        self.assertEqual(btc['currency'], 'eur')
+        self.assertIsNone(eth['current_price'])
+
+    def test_retrieve_in_other_currency(self):
+        response = self.client.get('/api/v1/assets/btc/?currency=eur')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = json.loads(response.content)['data']
+        self.assertEqual(content['data']['total_volume'], 184.0)
+
+    def test_list_sorted_by_index(self):
+        self.repository.upsert([
+            {"id": "bitcoin", "symbol": "BTC", "current_price": 50000.0,
+             "total_volume": 200.0, "market_cap_rank": 1,
+             "price_change_percentage_24h": -1.0},
+            {"id": "ethereum", "symbol": "ETH", "current_price": 4000.0,
+             "total_volume": 100.0, "market_cap_rank": 2,
+             "price_change_percentage_24h": 5.0},
+        ])
+
+        response = self.client.get('/api/v1/assets/?sort=change_24h')
+        content = json.loads(response.content)['data']
+        self.assertEqual([a['symbol'] for a in content['data']], ['ETH', 'BTC'])
+        self.assertEqual(content['meta']['sort'], 'change_24h')
+        self.assertEqual(content['meta']['generation'], self.repository.generation)
+
+        response = self.client.get('/api/v1/assets/?sort=rank&limit=1')
+        content = json.loads(response.content)['data']
+        self.assertEqual([a['symbol'] for a in content['data']], ['BTC'])
+
+    def test_unsupported_sort(self):
+        response = self.client.get('/api/v1/assets/?sort=name')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unsupported_currency(self):
+        response = self.client.get('/api/v1/assets/?currency=jpy')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
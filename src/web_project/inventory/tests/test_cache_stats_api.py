@@ -0,0 +1,46 @@
+import json
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from awesome_cli.core.crypto.cache import CacheManager
+
+
+class CacheStatsApiTests(TestCase):
+    url = '/api/v1/admin/cache-stats/'
+
+    def setUp(self):
+        self.cache = CacheManager(max_entries=10)
+        self.cache.set("metadata:bitcoin", {"categories": ["Layer 1"]})
+        self.cache.get("metadata:bitcoin")
+        self.cache.get("metadata:ethereum")
+        patcher = patch("inventory.api_views_crypto.get_cache", return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        User = get_user_model()
+        self.admin = User.objects.create_user(
+            username='admin', password='password', is_staff=True
+        )
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.client = APIClient()
+
+    def test_admin_gets_snapshot(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        stats = json.loads(response.content)['data']['data']
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_ratio'], 0.5)
+        self.assertEqual(stats['entries'], 1)
+        self.assertIn('get', stats['latency'])
+
+    def test_non_admin_forbidden(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -22,3 +22,10 @@ def test_load_settings_valid_config_file(tmp_path):
     settings = load_settings(str(config_path))
     assert settings.log_level == "DEBUG"
     assert settings.crypto.cache_ttl_minutes == 99
+
+def test_load_settings_quote_currencies_from_env(monkeypatch):
+    """Verify that quote currencies are parsed from a comma-separated env var."""
+    monkeypatch.setenv("AWESOME_CLI_QUOTE_CURRENCIES", "USD, eur,btc")
+
+    settings = load_settings()
+    assert settings.crypto.quote_currencies == ["usd", "eur", "btc"]
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.async_fetcher import AsyncCryptoDataFetcher
+
+
+def _page_response(page, per_page):
+    response = MagicMock()
+    response.status_code = 200
+    start = (page - 1) * per_page
+    response.json.return_value = [
+        {"id": f"coin-{i}", "symbol": f"c{i}", "total_volume": float(i)}
+        for i in range(start, start + per_page)
+    ]
+    return response
+
+
+class TestAsyncCryptoDataFetcher(unittest.TestCase):
+    def setUp(self):
+        # Effectively disable request spacing so timing assertions are stable
+        self.settings = CryptoSettings(
+            coingecko_rate_limit_requests=60000, coingecko_max_concurrency=4
+        )
+
+    @patch("awesome_cli.core.crypto.fetcher.requests.Session")
+    def test_fetch_multiple_pages(self, mock_session_cls):
+        mock_session = MagicMock()
+        mock_session_cls.return_value = mock_session
+        mock_session.get.side_effect = lambda url, params, **kwargs: _page_response(
+            params["page"], params["per_page"]
+        )
+
+        fetcher = AsyncCryptoDataFetcher(self.settings)
+        data = fetcher.fetch_top_coins(limit=600)
+
+        self.assertEqual(len(data), 600)
+        self.assertEqual(data[0]["symbol"], "C0")
+        self.assertEqual(data[-1]["id"], "coin-599")
+        pages = sorted(
+            c.kwargs["params"]["page"] for c in mock_session.get.call_args_list
+        )
+        self.assertEqual(pages, [1, 2, 3])
+        for call in mock_session.get.call_args_list:
+            self.assertEqual(call.kwargs["params"]["per_page"], 250)
+
+    @patch("awesome_cli.core.crypto.fetcher.requests.Session")
+    def test_duplicates_across_pages_are_dropped(self, mock_session_cls):
+        mock_session = MagicMock()
+        mock_session_cls.return_value = mock_session
+
+        def fake_get(url, params, **kwargs):
+            response = _page_response(params["page"], params["per_page"])
+            if params["page"] == 2:
+                # Simulate a coin sliding down one rank between requests
+                response.json.return_value[0] = {"id": "coin-249", "symbol": "c249"}
+            return response
+
+        mock_session.get.side_effect = fake_get
+
+        fetcher = AsyncCryptoDataFetcher(self.settings)
+        data = fetcher.fetch_top_coins(limit=500)
+
+        ids = [coin["id"] for coin in data]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(len(ids), 499)
+
+    @patch("awesome_cli.core.crypto.fetcher.requests.Session")
+    def test_pages_are_fetched_concurrently(self, mock_session_cls):
+        mock_session = MagicMock()
+        mock_session_cls.return_value = mock_session
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_get(url, params, **kwargs):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.2)
+            with lock:
+                in_flight.pop()
+            return _page_response(params["page"], params["per_page"])
+
+        mock_session.get.side_effect = slow_get
+
+        fetcher = AsyncCryptoDataFetcher(self.settings)
+        start = time.monotonic()
+        asyncio.run(fetcher.fetch_top_coins_async(limit=1000))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(mock_session.get.call_count, 4)
+        self.assertLess(elapsed, 0.6)
+        self.assertLessEqual(max(peak), 4)
+        self.assertGreater(max(peak), 1)
+
+    def test_zero_limit(self):
+        fetcher = AsyncCryptoDataFetcher(self.settings)
+        self.assertEqual(fetcher.fetch_top_coins(limit=0), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.backfill import (
+    BackfillError,
+    HistoricalBackfill,
+    merge_points,
+    split_range,
+    to_ohlcv,
+)
+
+DAY = 86400
+
+
+def fake_chart(coin_id, start, end, currency="usd"):
+    """Hourly synthetic history; price equals the hour index."""
+    hours = range(start - start % 3600, end, 3600)
+    return {
+        "prices": [[ts * 1000, float(ts // 3600)] for ts in hours],
+        "total_volumes": [[ts * 1000, 10.0] for ts in hours],
+    }
+
+
+class TestBackfillHelpers(unittest.TestCase):
+    def test_split_range_is_aligned(self):
+        chunks = split_range(5 * DAY + 100, 25 * DAY, 10 * DAY)
+        self.assertEqual(
+            chunks, [(0, 10 * DAY), (10 * DAY, 20 * DAY), (20 * DAY, 30 * DAY)]
+        )
+        self.assertEqual(split_range(10, 10, DAY), [])
+
+    def test_merge_points_dedupes_and_sorts(self):
+        merged = merge_points([
+            [(300, 3.0, None), (100, 1.0, 5.0)],
+            [(200, 2.0, None), (300, 3.5, 7.0)],
+        ])
+        self.assertEqual(merged, [(100, 1.0, 5.0), (200, 2.0, None), (300, 3.5, 7.0)])
+
+    def test_to_ohlcv(self):
+        points = [
+            (0, 10.0, 1.0), (3600, 12.0, 2.0), (7200, 9.0, None), (DAY, 11.0, 3.0)
+        ]
+        candles = to_ohlcv(points, DAY)
+        self.assertEqual(len(candles), 2)
+        self.assertEqual(
+            candles[0],
+            {"timestamp": 0, "open": 10.0, "high": 12.0, "low": 9.0, "close": 9.0,
+             "volume": 2.0},
+        )
+
+
+class TestHistoricalBackfill(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.settings = CryptoSettings(
+            storage_path=str(Path(self.test_dir) / "assets.json"),
+            coingecko_max_concurrency=3,
+        )
+        self.fetcher = MagicMock()
+        self.fetcher.fetch_market_chart_range.side_effect = fake_chart
+        self.start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        self.end = datetime(2023, 3, 1, tzinfo=timezone.utc)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_backfill_merges_chunks(self):
+        engine = HistoricalBackfill(self.settings, self.fetcher, chunk_days=10)
+        points = engine.backfill("bitcoin", self.start, self.end)
+
+        start_ts, end_ts = int(self.start.timestamp()), int(self.end.timestamp())
+        self.assertEqual(len(points), (end_ts - start_ts) // 3600)
+        self.assertEqual(points[0][0], start_ts)
+        self.assertLess(points[-1][0], end_ts)
+        timestamps = [p[0] for p in points]
+        self.assertEqual(timestamps, sorted(set(timestamps)))
+        self.assertGreater(self.fetcher.fetch_market_chart_range.call_count, 5)
+
+    def test_resumes_from_checkpoints(self):
+        calls = []
+        lock = threading.Lock()
+
+        def flaky_chart(coin_id, start, end, currency="usd"):
+            with lock:
+                calls.append(start)
+            if start == 1674000000 - 1674000000 % (10 * DAY):
+                raise ConnectionError("boom")
+            return fake_chart(coin_id, start, end, currency)
+
+        self.fetcher.fetch_market_chart_range.side_effect = flaky_chart
+        engine = HistoricalBackfill(self.settings, self.fetcher, chunk_days=10)
+        with self.assertRaises(BackfillError) as ctx:
+            engine.backfill("bitcoin", self.start, self.end)
+        self.assertEqual(len(ctx.exception.failed), 1)
+        first_run = len(calls)
+
+        # A fresh engine (new process) only fetches the failed chunk
+        self.fetcher.fetch_market_chart_range.side_effect = fake_chart
+        resumed = HistoricalBackfill(self.settings, self.fetcher, chunk_days=10)
+        points = resumed.backfill("bitcoin", self.start, self.end)
+        self.assertEqual(
+            self.fetcher.fetch_market_chart_range.call_count, first_run + 1
+        )
+        self.assertEqual(len(points), 59 * 24)
+
+    def test_price_series_candles(self):
+        engine = HistoricalBackfill(self.settings, self.fetcher, chunk_days=30)
+        candles = engine.price_series("bitcoin", self.start, self.end, interval="1d")
+        self.assertEqual(len(candles), 59)
+        self.assertEqual(candles[0]["timestamp"], int(self.start.timestamp()))
+        self.assertEqual(candles[0]["close"] - candles[0]["open"], 23.0)
+        with self.assertRaises(ValueError):
+            engine.price_series("bitcoin", self.start, self.end, interval="7m")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.binary_store import (
+    BinaryFileStore,
+    BinarySnapshot,
+    binary_to_json,
+    json_to_binary,
+    write_binary_snapshot,
+)
+from awesome_cli.core.crypto.ranking import SORT_FIELDS
+from awesome_cli.core.crypto.repository import CryptoAssetRepository
+from awesome_cli.core.crypto.storage import create_store
+
+ASSETS = [
+    {"symbol": "ETH", "id": "ethereum", "name": "Ethereum", "current_price": 3000.5,
+     "market_cap": 400.0, "market_cap_rank": 2, "total_volume": 200.0,
+     "price_change_percentage_24h": -1.5, "last_updated": "2026-01-01T00:00:00Z",
+     "quotes": {"eur": {"current_price": 2800.0}}},
+    {"symbol": "BTC", "id": "bitcoin", "name": "Bitcoin", "current_price": 60000,
+     "market_cap": 900.0, "market_cap_rank": 1, "total_volume": 300.0,
+     "last_updated": "2026-01-01T00:00:00Z"},
+    {"symbol": "NEW", "id": "new", "name": "Ñew ✓", "current_price": None,
+     "market_cap": None, "market_cap_rank": None, "total_volume": 10.0,
+     "high_24h": "n/a", "metadata": {"categories": ["meme"]}},
+]
+
+
+class TestBinarySnapshot(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = Path(self.test_dir) / "assets.bin"
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_round_trip(self):
+        write_binary_snapshot(self.path, ASSETS)
+        snapshot = BinarySnapshot(self.path)
+
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual(list(snapshot), ["BTC", "ETH", "NEW"])
+        self.assertEqual(dict(snapshot), {a["symbol"]: a for a in ASSETS})
+        self.assertIsInstance(snapshot["BTC"]["current_price"], int)
+        self.assertIn("ETH", snapshot)
+        self.assertNotIn("XRP", snapshot)
+        self.assertIsNone(snapshot.get("XRP"))
+
+    def test_records_are_decoded_lazily(self):
+        write_binary_snapshot(self.path, ASSETS)
+        snapshot = BinarySnapshot(self.path)
+        self.assertEqual(snapshot._records, {})
+
+        eth = snapshot["ETH"]
+        self.assertEqual(list(snapshot._records), [1])
+        self.assertIs(snapshot["ETH"], eth)
+
+    def test_stored_orders(self):
+        write_binary_snapshot(self.path, ASSETS)
+        snapshot = BinarySnapshot(self.path)
+
+        self.assertEqual(list(snapshot.order("volume")), ["BTC", "ETH", "NEW"])
+        self.assertEqual(snapshot.order("rank")[:2], ["BTC", "ETH"])
+        # Missing values sort last
+        self.assertEqual(snapshot.order("change_24h")[0], "ETH")
+        self.assertEqual(set(snapshot.orders()), set(SORT_FIELDS))
+
+    def test_rejects_other_files(self):
+        self.path.write_text(json.dumps(ASSETS))
+        with self.assertRaises(ValueError):
+            BinarySnapshot(self.path)
+
+    def test_json_converters(self):
+        json_path = Path(self.test_dir) / "assets.json"
+        json_path.write_text(json.dumps(ASSETS))
+
+        self.assertEqual(json_to_binary(json_path, self.path), 3)
+        json_path.unlink()
+        self.assertEqual(binary_to_json(self.path, json_path), 3)
+        restored = {a["symbol"]: a for a in json.loads(json_path.read_text())}
+        self.assertEqual(restored, {a["symbol"]: a for a in ASSETS})
+
+
+class TestBinaryStorageMode(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.storage_path = Path(self.test_dir) / "crypto_assets.json"
+        self.binary_path = Path(self.test_dir) / "crypto_assets.bin"
+        self.settings = CryptoSettings(
+            storage_path=str(self.storage_path),
+            storage_mode="binary",
+            storage_write_behind_seconds=0,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def make_repo(self):
+        repo = CryptoAssetRepository(self.settings)
+        self.addCleanup(repo.close)
+        return repo
+
+    def test_create_store(self):
+        store = create_store(self.settings)
+        self.assertIsInstance(store, BinaryFileStore)
+        self.assertEqual(store.path, self.binary_path)
+
+    def test_startup_decodes_nothing(self):
+        write_binary_snapshot(self.binary_path, ASSETS)
+        repo = self.make_repo()
+        snapshot = repo.snapshot()
+
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual(repo._base._records, {})
+        self.assertEqual(
+            [a["symbol"] for a in repo.get_top_by("volume", 1)], ["BTC"]
+        )
+        self.assertEqual(list(repo._base._records), [0])
+
+    def test_first_write_copies_into_memory(self):
+        write_binary_snapshot(self.binary_path, ASSETS)
+        repo = self.make_repo()
+        generation = repo.generation
+
+        changes = repo.upsert([dict(ASSETS[2], total_volume=500.0)])
+        self.assertEqual(changes.updated, {"NEW"})
+        self.assertEqual(repo.generation, generation + 1)
+        self.assertEqual(
+            [a["symbol"] for a in repo.get_top_by_volume()], ["NEW", "BTC", "ETH"]
+        )
+
+        reloaded = BinarySnapshot(self.binary_path)
+        self.assertEqual(reloaded["NEW"]["total_volume"], 500.0)
+        self.assertEqual(len(reloaded), 3)
+
+    def test_migrates_existing_json(self):
+        self.storage_path.write_text(json.dumps(ASSETS))
+        repo = self.make_repo()
+        self.assertTrue(self.binary_path.exists())
+        self.assertEqual(repo.get_by_symbol("eth")["name"], "Ethereum")
+
+    def test_unreadable_snapshot_starts_empty(self):
+        self.binary_path.write_bytes(b"garbage")
+        with patch("awesome_cli.core.crypto.repository.logger") as mock_logger:
+            repo = self.make_repo()
+        self.assertEqual(repo.get_all(), [])
+        mock_logger.error.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
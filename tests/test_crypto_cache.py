@@ -0,0 +1,717 @@
+import asyncio
+import marshal
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.cache import (
+    CacheManager,
+    ShardedCacheManager,
+    TieredCacheManager,
+    create_cache,
+    estimate_size,
+)
+from awesome_cli.core.crypto.cache_backends import (
+    InMemoryBackend,
+    RedisBackend,
+    SQLiteBackend,
+    dumps,
+    loads,
+)
+from awesome_cli.core.crypto.stats import StatsRecorder, summarize
+
+
+class TestCacheEviction(unittest.TestCase):
+    def test_lru_evicts_least_recently_used(self):
+        cache = CacheManager(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_lfu_evicts_least_frequently_used(self):
+        cache = CacheManager(max_entries=2, eviction="lfu")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        for _ in range(3):
+            cache.get("a")
+        cache.get("b")
+        cache.set("c", 3)  # evicts b (freq 2) rather than a (freq 4)
+        cache.set("d", 4)  # evicts c, the new entry with freq 1
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual(cache.get("d"), 4)
+
+    def test_lfu_overwrite_and_invalidate(self):
+        cache = CacheManager(max_entries=2, eviction="lfu")
+        cache.set("a", 1)
+        cache.get("a")
+        cache.set("a", 2)  # overwrite resets frequency
+        cache.set("b", 3)
+        cache.get("b")
+        cache.invalidate("b")
+        cache.set("c", 4)
+        cache.set("d", 5)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("a"))
+
+    def test_byte_limit(self):
+        value = "x" * 1000
+        limit = estimate_size(value) * 3
+        cache = CacheManager(max_bytes=limit)
+        for i in range(10):
+            cache.set(f"k{i}", value)
+
+        self.assertEqual(len(cache), 3)
+        self.assertLessEqual(cache.total_bytes, limit)
+        self.assertEqual(cache.get("k9"), value)
+
+        cache.set("huge", "y" * (limit * 2))
+        self.assertIsNone(cache.get("huge"))
+
+        cache.clear()
+        self.assertEqual(cache.total_bytes, 0)
+
+    def test_estimate_size_walks_containers(self):
+        flat = estimate_size([])
+        nested = estimate_size([{"symbol": "BTC", "price": 1.0}])
+        self.assertGreater(nested, flat + estimate_size("BTC"))
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            CacheManager(eviction="fifo")
+
+
+class TestCacheExpiry(unittest.TestCase):
+    def test_expiry_ignores_wall_clock(self):
+        cache = CacheManager(ttl_minutes=1)
+        cache.set("a", 1)
+        later = time.time() + 3600
+        with patch("awesome_cli.core.crypto.cache.time.time", return_value=later):
+            self.assertEqual(cache.get("a"), 1)
+
+    @patch("awesome_cli.core.crypto.cache.time.monotonic")
+    def test_sweep_reclaims_unread_entries(self, mock_monotonic):
+        mock_monotonic.return_value = 1000.0
+        cache = CacheManager(ttl_minutes=1)
+        for i in range(10):
+            cache.set(f"old{i}", i)
+        cache.set("fresh", 1, ttl_minutes=10)
+
+        mock_monotonic.return_value = 1000.0 + 120
+        self.assertEqual(cache.sweep(batch_size=3), 10)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.expirations, 10)
+        self.assertEqual(cache.get("fresh"), 1)
+
+    def test_set_reclaims_due_entries(self):
+        cache = CacheManager(ttl_minutes=1)
+        cache.set("old", 1, ttl_minutes=-1)
+        cache.set("new", 2)
+        self.assertEqual(len(cache), 1)
+
+    def test_overwrite_keeps_new_expiry(self):
+        cache = CacheManager(ttl_minutes=1)
+        cache.set("a", 1, ttl_minutes=-1)
+        cache.set("a", 2)
+        self.assertEqual(cache.sweep(), 0)
+        self.assertEqual(cache.get("a"), 2)
+
+    def test_background_sweeper(self):
+        cache = CacheManager(ttl_minutes=1)
+        with patch("awesome_cli.core.crypto.cache.time.monotonic", return_value=0.0):
+            cache.set("a", 1)
+        cache.start_sweeper(interval_seconds=0.01)
+        try:
+            deadline = time.monotonic() + 2
+            while len(cache) and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            cache.stop_sweeper()
+        self.assertEqual(len(cache), 0)
+
+class TestSingleFlight(unittest.TestCase):
+    def test_threads_share_one_computation(self):
+        cache = CacheManager()
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(2)
+            return {"value": 42}
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_compute("k", compute))
+            )
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"value": 42}] * 8)
+        self.assertEqual(cache.get("k"), {"value": 42})
+
+    def test_errors_propagate_and_are_not_cached(self):
+        cache = CacheManager()
+        with self.assertRaises(RuntimeError):
+            cache.get_or_compute(
+                "k", lambda: (_ for _ in ()).throw(RuntimeError("boom"))
+            )
+        self.assertEqual(cache.get_or_compute("k", lambda: 1), 1)
+
+    def test_asyncio_callers_share_one_computation(self):
+        cache = CacheManager()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return "v"
+
+        async def main():
+            return await asyncio.gather(
+                *(cache.aget_or_compute("k", compute, ttl_minutes=1) for _ in range(5))
+            )
+
+        self.assertEqual(asyncio.run(main()), ["v"] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_asyncio_waiter_joins_thread_flight(self):
+        cache = CacheManager()
+        started = threading.Event()
+        release = threading.Event()
+
+        def compute():
+            started.set()
+            release.wait(2)
+            return "from-thread"
+
+        worker = threading.Thread(target=cache.get_or_compute, args=("k", compute))
+        worker.start()
+        started.wait(2)
+
+        async def waiter():
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.02, release.set)
+
+            async def never():
+                raise AssertionError("should not compute")
+
+            return await cache.aget_or_compute("k", never)
+
+        self.assertEqual(asyncio.run(waiter()), "from-thread")
+        worker.join()
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    def setUp(self):
+        self.clock = patch(
+            "awesome_cli.core.crypto.cache.time.monotonic", return_value=1000.0
+        )
+        self.monotonic = self.clock.start()
+        self.cache = CacheManager(ttl_minutes=1, stale_ttl_minutes=1)
+
+    def tearDown(self):
+        self.clock.stop()
+        self.cache.shutdown()
+
+    def test_stale_value_served_and_refreshed_once(self):
+        self.cache.set("k", "old")
+        self.monotonic.return_value = 1000.0 + 90  # past soft, before hard TTL
+        self.assertIsNone(self.cache.get("k"))
+        self.assertEqual(self.cache.get("k", allow_stale=True), "old")
+
+        release = threading.Event()
+        calls = []
+
+        def refresh():
+            calls.append(1)
+            release.wait(2)
+            return "new"
+
+        results = [self.cache.get_or_compute("k", refresh) for _ in range(5)]
+        self.assertEqual(results, ["old"] * 5)
+
+        release.set()
+        self.cache.shutdown()  # waits for the refresh
+        self.assertEqual(calls, [1])
+        self.assertEqual(self.cache.get("k"), "new")
+
+    def test_stale_window_is_opt_in(self):
+        cache = create_cache(CryptoSettings())
+        self.addCleanup(cache.shutdown)
+        cache.get_or_compute("plain", lambda: "old")
+        cache.get_or_compute("opted", lambda: "old", stale_ttl_minutes=10)
+        self.monotonic.return_value = 1000.0 + 5 * 60 + 1  # past the 5 min TTL
+
+        self.assertEqual(cache.get_or_compute("plain", lambda: "new"), "new")
+        self.assertEqual(
+            cache.get_or_compute("opted", lambda: "new", stale_ttl_minutes=10), "old"
+        )
+        cache.shutdown()  # waits for the refresh
+        # The refreshed value keeps the caller's stale window
+        self.monotonic.return_value += 5 * 60 + 1
+        self.assertEqual(cache.get("opted", allow_stale=True), "new")
+
+    def test_hard_expiry_recomputes_inline(self):
+        self.cache.set("k", "old")
+        self.monotonic.return_value = 1000.0 + 150
+        self.assertEqual(self.cache.get_or_compute("k", lambda: "new"), "new")
+
+    def test_failed_refresh_keeps_stale_value(self):
+        self.cache.set("k", "old")
+        self.monotonic.return_value = 1000.0 + 90
+
+        def failing():
+            raise RuntimeError("upstream down")
+
+        self.assertEqual(self.cache.get_or_compute("k", failing), "old")
+        self.cache.shutdown()
+        self.assertEqual(self.cache.get("k", allow_stale=True), "old")
+
+    def test_async_stale_refresh(self):
+        self.cache.set("k", "old")
+        self.monotonic.return_value = 1000.0 + 90
+
+        async def refresh():
+            return "new"
+
+        async def main():
+            first = await self.cache.aget_or_compute("k", refresh)
+            await asyncio.sleep(0)  # let the refresh task run
+            return first, await self.cache.aget_or_compute("k", refresh)
+
+        self.assertEqual(asyncio.run(main()), ("old", "new"))
+
+    def test_tiered_workers_agree_on_staleness(self):
+        backend = InMemoryBackend()
+        writer = TieredCacheManager(backend, ttl_minutes=1, stale_ttl_minutes=1)
+        writer.set("k", "v")
+        reader = TieredCacheManager(backend, ttl_minutes=1)
+        later = time.time() + 90
+        with patch("awesome_cli.core.crypto.cache.time.time", return_value=later):
+            self.assertIsNone(reader.get("k"))
+            self.assertEqual(reader.get("k", allow_stale=True), "v")
+
+
+class TestShardedCache(unittest.TestCase):
+    def test_basic_operations(self):
+        cache = ShardedCacheManager(shards=5)
+        self.assertEqual(cache.shard_count, 8)
+        cache.set_many({f"k{i}": i for i in range(100)})
+        self.assertEqual(len(cache), 100)
+        self.assertEqual(cache.get_many(["k1", "k50", "missing"]), {"k1": 1, "k50": 50})
+        cache.invalidate("k1")
+        self.assertIsNone(cache.get("k1"))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_limits_split_across_shards(self):
+        cache = ShardedCacheManager(shards=4, max_entries=40)
+        for i in range(1000):
+            cache.set(f"k{i}", i)
+        self.assertLessEqual(len(cache), 40)
+        self.assertGreater(cache.evictions, 0)
+
+    def test_buffered_reads_keep_hot_keys(self):
+        cache = ShardedCacheManager(shards=1, max_entries=2)
+        cache.set("hot", 1)
+        cache.set("cold", 2)
+        cache.get("hot")  # recorded without the lock, applied on next write
+        cache.set("new", 3)
+        self.assertEqual(cache.get("hot"), 1)
+        self.assertIsNone(cache.get("cold"))
+
+    @patch("awesome_cli.core.crypto.cache.time.monotonic", return_value=1000.0)
+    def test_expiry_and_sweep(self, mock_monotonic):
+        cache = ShardedCacheManager(ttl_minutes=1, shards=4)
+        cache.set_many({f"k{i}": i for i in range(20)})
+        mock_monotonic.return_value = 1100.0
+        self.assertIsNone(cache.get("k0"))
+        self.assertEqual(cache.sweep(), 19)
+        self.assertEqual(len(cache), 0)
+
+    def test_concurrent_readers_and_writers(self):
+        cache = ShardedCacheManager(shards=8, max_entries=64)
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(2000):
+                    key = f"k{(i * n) % 100}"
+                    if i % 5 == 0:
+                        cache.set(key, i)
+                    else:
+                        cache.get(key)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(1, 9)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(cache), 64)
+
+    def test_single_flight(self):
+        cache = ShardedCacheManager()
+        calls = []
+        results = [
+            cache.get_or_compute("k", lambda: calls.append(1) or "v") for _ in range(3)
+        ]
+        self.assertEqual(results, ["v"] * 3)
+        self.assertEqual(calls, [1])
+
+
+class TestCacheStats(unittest.TestCase):
+    def test_recorder_merges_threads(self):
+        recorder = StatsRecorder()
+
+        def work():
+            for _ in range(1000):
+                recorder.incr("hits")
+            recorder.observe("get", 0.0005)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        recorder.incr("hits")
+
+        snapshot = recorder.snapshot()
+        self.assertEqual(snapshot["counters"]["hits"], 4001)
+        self.assertEqual(snapshot["latency"]["get"]["count"], 4)
+        # Exited threads are folded into the retired totals
+        self.assertEqual(recorder.snapshot()["counters"]["hits"], 4001)
+
+        recorder.reset()
+        self.assertEqual(recorder.snapshot()["counters"], {})
+
+    def test_summarize_percentiles(self):
+        buckets = [0] * 32
+        buckets[4] = 90  # < 16us
+        buckets[10] = 9  # < 1.024ms
+        buckets[20] = 1  # < 1.05s
+        summary = summarize(buckets)
+        self.assertEqual(summary["count"], 100)
+        self.assertEqual(summary["p50_ms"], 0.016)
+        self.assertEqual(summary["p99_ms"], 1.024)
+        self.assertEqual(summary["max_ms"], 1048.576)
+        self.assertIsNone(summarize([0] * 32)["p50_ms"])
+
+    def test_cache_snapshot(self):
+        cache = ShardedCacheManager(
+            max_entries=4, ttl_minutes=1, stale_ttl_minutes=1, shards=1
+        )
+        for i in range(6):
+            cache.set(f"k{i}", i)
+        cache.get("k5")
+        cache.get("k0")
+        cache.get_or_compute("computed", lambda: "v")
+        with self.assertRaises(RuntimeError):
+            cache.get_or_compute(
+                "bad", lambda: (_ for _ in ()).throw(RuntimeError("x"))
+            )
+
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 3)
+        self.assertEqual(stats["computes"], 2)
+        self.assertEqual(stats["compute_errors"], 1)
+        self.assertEqual(stats["evictions"], 3)
+        self.assertEqual(stats["entries"], 4)
+        self.assertEqual(stats["latency"]["compute"]["count"], 2)
+
+        cache.reset_stats()
+        self.assertEqual(cache.stats()["hits"], 0)
+        cache.shutdown()
+
+
+class FakeRedis:
+    """Minimal redis-py client stand-in recording round trips."""
+
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+
+    def mget(self, names):
+        self.commands.append("MGET")
+        return [self.data.get(name) for name in names]
+
+    def pipeline(self, transaction=True):
+        client = self
+
+        class Pipeline:
+            def __init__(self):
+                self.ops = []
+
+            def set(self, name, value, px=None):
+                self.ops.append((name, value, px))
+
+            def execute(self):
+                client.commands.append(f"PIPELINE x{len(self.ops)}")
+                for name, value, _ in self.ops:
+                    client.data[name] = value
+
+        return Pipeline()
+
+    def delete(self, *names):
+        self.commands.append("DEL")
+        for name in names:
+            self.data.pop(name, None)
+
+    def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        return [name for name in list(self.data) if name.startswith(prefix)]
+
+
+class TestTieredCache(unittest.TestCase):
+    def test_codec_roundtrip(self):
+        values = [
+            {"symbol": "BTC", "price": 1.5, "tags": ["a", None], "ok": True},
+            [{"id": i, "name": "coin" * 50} for i in range(50)],
+            {1, 2, 3},
+            (1.5, frozenset({b"x"}), 2j),
+        ]
+        for value in values:
+            self.assertEqual(loads(dumps(value)), value)
+        # Large payloads are compressed
+        self.assertLess(len(dumps(values[1])), len(repr(values[1])) // 2)
+
+    def test_codec_only_accepts_plain_data(self):
+        when = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for value in (when, [len], {"a": object()}):
+            with self.subTest(value=value):
+                with self.assertRaises(TypeError):
+                    dumps(value)
+
+        header = dumps(None)[:4]
+        rejected = {
+            "pickle": b"\x01" + pickle.dumps({"a": 1}),
+            "code object": header + marshal.dumps(compile("1", "x", "eval")),
+            "other Python": header[:2] + bytes((2, 7)) + marshal.dumps(1),
+        }
+        for name, payload in rejected.items():
+            with self.subTest(payload=name):
+                with self.assertRaises(ValueError):
+                    loads(payload)
+
+    def test_non_data_values_stay_in_l1(self):
+        backend = InMemoryBackend()
+        cache = TieredCacheManager(backend)
+        when = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        cache.set_many({"when": when, "n": 1})
+
+        self.assertEqual(cache.get("when"), when)
+        self.assertEqual(TieredCacheManager(backend).get_many(["when", "n"]), {"n": 1})
+
+    def test_workers_share_l2(self):
+        backend = InMemoryBackend()
+        worker_a = TieredCacheManager(backend)
+        worker_b = TieredCacheManager(backend)
+
+        worker_a.set("metadata:bitcoin", {"categories": ["Layer 1"]})
+        self.assertEqual(worker_b.get("metadata:bitcoin"), {"categories": ["Layer 1"]})
+
+        # Now served from worker B's L1
+        trips = backend.round_trips
+        worker_b.get("metadata:bitcoin")
+        self.assertEqual(backend.round_trips, trips)
+
+        worker_a.invalidate("metadata:bitcoin")
+        self.assertIsNone(worker_a.get("metadata:bitcoin"))
+
+    def test_get_many_batches_misses(self):
+        backend = InMemoryBackend()
+        writer = TieredCacheManager(backend)
+        writer.set_many({f"k{i}": i for i in range(20)})
+        reader = TieredCacheManager(backend)
+        reader.set("k0", 0)
+
+        trips = backend.round_trips
+        found = reader.get_many([f"k{i}" for i in range(25)])
+
+        self.assertEqual(found, {f"k{i}": i for i in range(20)})
+        self.assertEqual(backend.round_trips, trips + 1)
+
+    def test_backend_failure_degrades_to_l1(self):
+        backend = MagicMock()
+        backend.get_many.side_effect = ConnectionError("down")
+        backend.set_many.side_effect = ConnectionError("down")
+        cache = TieredCacheManager(backend)
+
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+
+    def test_redis_backend_pipelines_writes(self):
+        client = FakeRedis()
+        cache = TieredCacheManager(RedisBackend(client=client, prefix="t:"))
+
+        cache.set_many({"a": 1, "b": [1, 2]}, ttl_minutes=1)
+        self.assertEqual(client.commands, ["PIPELINE x2"])
+        self.assertEqual(set(client.data), {"t:a", "t:b"})
+
+        other = TieredCacheManager(RedisBackend(client=client, prefix="t:"))
+        self.assertEqual(other.get_many(["a", "b", "c"]), {"a": 1, "b": [1, 2]})
+        self.assertEqual(client.commands[-1], "MGET")
+
+        other.clear()
+        self.assertEqual(client.data, {})
+
+    def test_create_cache(self):
+        self.assertIs(type(create_cache(CryptoSettings(cache_shards=1))), CacheManager)
+        self.assertIsInstance(create_cache(CryptoSettings()), ShardedCacheManager)
+        with patch("awesome_cli.core.crypto.cache.RedisBackend") as mock_backend:
+            cache = create_cache(CryptoSettings(use_redis=True, redis_url="redis://x:1/0"))
+        self.assertIsInstance(cache, TieredCacheManager)
+        mock_backend.assert_called_once_with(url="redis://x:1/0")
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "cache", "cache.db")
+
+    def test_restart_starts_warm(self):
+        cache = TieredCacheManager(
+            SQLiteBackend(self.path), l1_ttl_seconds=float("inf")
+        )
+        cache.set("metadata:bitcoin", {"categories": ["Layer 1"]}, ttl_minutes=5)
+        cache.set("metadata:old", {"categories": []}, ttl_minutes=5)
+        cache.shutdown()
+
+        # Entries that expire while the process is down are not loaded
+        with patch("awesome_cli.core.crypto.cache_backends.time.time",
+                   return_value=time.time() + 60):
+            backend = SQLiteBackend(self.path)
+            backend.set_many({"metadata:old": dumps("x")}, ttl_seconds=1)
+            backend.close()
+
+        restarted = TieredCacheManager(
+            SQLiteBackend(self.path), l1_ttl_seconds=float("inf")
+        )
+        self.addCleanup(restarted.shutdown)
+        self.assertEqual(restarted.get("metadata:bitcoin"), {"categories": ["Layer 1"]})
+        with patch("awesome_cli.core.crypto.cache_backends.time.time",
+                   return_value=time.time() + 120):
+            self.assertIsNone(restarted.get("metadata:old"))
+
+    def test_restart_keeps_expiry_of_stale_entries(self):
+        cache = TieredCacheManager(
+            SQLiteBackend(self.path), l1_ttl_seconds=float("inf")
+        )
+        cache.set("metadata:bitcoin", "v1", ttl_minutes=1, stale_ttl_minutes=1)
+        cache.shutdown()
+
+        restarted = TieredCacheManager(
+            SQLiteBackend(self.path), l1_ttl_seconds=float("inf")
+        )
+        self.addCleanup(restarted.shutdown)
+        with patch("awesome_cli.core.crypto.cache.time.time",
+                   return_value=time.time() + 90):
+            self.assertIsNone(restarted.get("metadata:bitcoin"))
+            self.assertEqual(restarted.get("metadata:bitcoin", allow_stale=True), "v1")
+
+        # Promoted to L1 only for what is left of the 120s L2 lifetime
+        entry = restarted._cache["metadata:bitcoin"]
+        self.assertLessEqual(entry.expiry - time.monotonic(), 30)
+        self.assertLessEqual(entry.stale_at, entry.expiry)
+
+    def test_entries_from_another_python_are_dropped(self):
+        cache = TieredCacheManager(SQLiteBackend(self.path))
+        cache.set("metadata:bitcoin", {"categories": ["Layer 1"]})
+        cache.shutdown()
+        with sqlite3.connect(self.path) as conn:
+            (payload,) = conn.execute("SELECT payload FROM cache").fetchone()
+            conn.execute(
+                "UPDATE cache SET payload = ?",
+                (payload[:2] + bytes((3, 0)) + payload[4:],),
+            )
+        conn.close()
+
+        restarted = TieredCacheManager(SQLiteBackend(self.path))
+        self.addCleanup(restarted.shutdown)
+        with self.assertLogs("awesome_cli.core.crypto.cache", "WARNING"):
+            self.assertIsNone(restarted.get("metadata:bitcoin"))
+
+    def test_writes_are_batched_and_visible_before_flush(self):
+        backend = SQLiteBackend(self.path, flush_interval=3600)
+        self.addCleanup(backend.close)
+        backend.set_many({f"k{i}": dumps(i) for i in range(10)}, ttl_seconds=60)
+        backend.delete(["k0"])
+
+        found = backend.get_many([f"k{i}" for i in range(12)])
+        self.assertEqual({k: loads(v) for k, v in found.items()},
+                         {f"k{i}": i for i in range(1, 10)})
+
+        # Nothing hits the file until the batch is committed
+        reader = sqlite3.connect(self.path)
+        self.addCleanup(reader.close)
+        count = "SELECT COUNT(*) FROM cache"
+        self.assertEqual(reader.execute(count).fetchone()[0], 0)
+        backend.flush()
+        self.assertEqual(reader.execute(count).fetchone()[0], 9)
+        self.assertEqual(len(backend.get_many([f"k{i}" for i in range(10)])), 9)
+
+        backend.clear()
+        self.assertEqual(backend.get_many(["k1"]), {})
+
+    def test_full_batch_wakes_writer(self):
+        backend = SQLiteBackend(self.path, flush_interval=3600, batch_size=5)
+        self.addCleanup(backend.close)
+        backend.set_many({f"k{i}": dumps(i) for i in range(5)}, ttl_seconds=60)
+
+        deadline = time.monotonic() + 5
+        while backend._pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(backend._pending, {})
+        self.assertEqual(len(backend.get_many(["k0", "k4"])), 2)
+
+    def test_purge_expired(self):
+        backend = SQLiteBackend(self.path)
+        self.addCleanup(backend.close)
+        backend.set_many({"a": dumps(1)}, ttl_seconds=0.001)
+        backend.set_many({"b": dumps(2)}, ttl_seconds=60)
+        backend.flush()
+        time.sleep(0.01)
+        self.assertEqual(backend.purge_expired(), 1)
+
+    def test_create_cache(self):
+        cache = create_cache(CryptoSettings(cache_disk_path=self.path))
+        self.addCleanup(cache.shutdown)
+        self.assertIsInstance(cache, TieredCacheManager)
+        self.assertIsInstance(cache.backend, SQLiteBackend)
+
+
+if __name__ == "__main__":
+    unittest.main()
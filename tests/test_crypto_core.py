@@ -149,6 +149,53 @@ class TestCryptoDataFetcher(unittest.TestCase):
         with self.assertRaises(ValueError):
             fetcher.fetch_top_coins(limit=10)
 
+    @patch("awesome_cli.core.crypto.fetcher.requests.Session")
+    def test_conditional_fetch_sends_validators_and_handles_304(self, mock_session_cls):
+        mock_session = MagicMock()
+        mock_session_cls.return_value = mock_session
+        fetcher = CryptoDataFetcher(self.settings)
+
+        first = MagicMock()
+        first.status_code = 200
+        first.content = b'[{"id": "bitcoin", "symbol": "btc"}]'
+        first.headers = {
+            "ETag": 'W/"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"
+        }
+        first.json.return_value = [{"id": "bitcoin", "symbol": "btc"}]
+        not_modified = MagicMock()
+        not_modified.status_code = 304
+        mock_session.get.side_effect = [first, not_modified]
+
+        self.assertEqual(len(fetcher.fetch_top_coins(limit=1, if_changed=True)), 1)
+        self.assertIsNone(fetcher.fetch_top_coins(limit=1, if_changed=True))
+
+        headers = mock_session.get.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], 'W/"abc"')
+        self.assertEqual(headers["If-Modified-Since"], "Mon, 01 Jan 2024 00:00:00 GMT")
+        not_modified.json.assert_not_called()
+
+    @patch("awesome_cli.core.crypto.fetcher.requests.Session")
+    def test_conditional_fetch_skips_identical_payload(self, mock_session_cls):
+        mock_session = MagicMock()
+        mock_session_cls.return_value = mock_session
+        fetcher = CryptoDataFetcher(self.settings)
+
+        def make_response():
+            response = MagicMock()
+            response.status_code = 200
+            response.content = b'[{"id": "bitcoin", "symbol": "btc"}]'
+            response.headers = {}
+            response.json.return_value = [{"id": "bitcoin", "symbol": "btc"}]
+            return response
+
+        second = make_response()
+        mock_session.get.side_effect = [make_response(), second]
+
+        self.assertIsNotNone(fetcher.fetch_top_coins(limit=1, if_changed=True))
+        self.assertIsNone(fetcher.fetch_top_coins(limit=1, if_changed=True))
+        second.json.assert_not_called()
+        self.assertEqual(mock_session.get.call_args.kwargs["headers"], {})
+
 
 class TestCacheManager(unittest.TestCase):
     def setUp(self):
@@ -222,6 +269,7 @@ class TestCryptoAssetRepository(unittest.TestCase):
         self.repo = CryptoAssetRepository(self.settings)
 
     def tearDown(self):
+        self.repo.close()
         shutil.rmtree(self.test_dir)
 
     def test_upsert_and_get(self):
@@ -235,6 +283,7 @@ class TestCryptoAssetRepository(unittest.TestCase):
         self.assertEqual(self.repo.get_by_symbol("BTC")["name"], "Bitcoin")
 
         # Verify persistence
+        self.repo.flush()
         new_repo = CryptoAssetRepository(self.settings)
         self.assertEqual(len(new_repo.get_all()), 2)
 
@@ -281,6 +330,70 @@ class TestCryptoAssetRepository(unittest.TestCase):
         self.assertEqual(len(repo.get_all()), 0)
 
 
+class TestRepositoryWriteBehind(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.storage_path = Path(self.test_dir) / "assets.json"
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def make_repo(self, window):
+        settings = CryptoSettings(
+            storage_path=str(self.storage_path), storage_write_behind_seconds=window
+        )
+        return CryptoAssetRepository(settings)
+
+    def test_upserts_coalesce_into_one_compact_write(self):
+        repo = self.make_repo(0.2)
+        save_all = repo.store.save_all
+        with patch.object(repo.store, "save_all", wraps=save_all) as mock_write:
+            for i in range(5):
+                repo.upsert([{"symbol": "BTC", "current_price": 100.0 + i}])
+            self.assertFalse(self.storage_path.exists())
+
+            deadline = time.monotonic() + 5
+            while not self.storage_path.exists() and time.monotonic() < deadline:
+                time.sleep(0.02)
+            repo.close()
+
+        mock_write.assert_called_once()
+        text = self.storage_path.read_text()
+        self.assertNotIn(" ", text)
+        self.assertEqual(json.loads(text)[0]["current_price"], 104.0)
+
+    def test_flush_and_close_are_durable(self):
+        repo = self.make_repo(3600)
+        repo.upsert([{"symbol": "BTC", "current_price": 1.0}])
+        repo.flush()
+        self.assertEqual(len(self.make_repo(0).get_all()), 1)
+
+        repo.upsert([{"symbol": "ETH", "current_price": 2.0}])
+        repo.close()
+        self.assertEqual(len(self.make_repo(0).get_all()), 2)
+
+        # After close, writes are saved synchronously
+        repo.upsert([{"symbol": "SOL", "current_price": 3.0}])
+        self.assertEqual(len(json.loads(self.storage_path.read_text())), 3)
+
+    def test_failed_write_stays_pending(self):
+        repo = self.make_repo(3600)
+        repo.upsert([{"symbol": "BTC", "current_price": 1.0}])
+        with patch.object(repo.store, "save_changes", side_effect=OSError("disk full")):
+            repo.flush()
+        save_all = repo.store.save_all
+        with patch.object(repo.store, "save_all", wraps=save_all) as mock_write:
+            repo.close()
+        mock_write.assert_called_once()
+        self.assertTrue(self.storage_path.exists())
+
+    def test_zero_window_saves_synchronously(self):
+        repo = self.make_repo(0)
+        repo.upsert([{"symbol": "BTC", "current_price": 1.0}])
+        self.assertTrue(self.storage_path.exists())
+        self.assertIsNone(repo._flusher)
+
+
 class TestCryptoDataScheduler(unittest.TestCase):
     def test_refresh_now(self):
         settings = CryptoSettings()
@@ -293,7 +406,45 @@ class TestCryptoDataScheduler(unittest.TestCase):
         scheduler.refresh_now()
 
         mock_fetcher.fetch_top_coins.assert_called_once()
-        mock_repo.upsert.assert_called_once_with([{"symbol": "BTC"}])
+        mock_repo.upsert.assert_called_once_with([{"symbol": "BTC"}], prune=False)
+
+    def test_refresh_now_skips_unchanged_data(self):
+        settings = CryptoSettings()
+        mock_fetcher = MagicMock()
+        mock_repo = MagicMock()
+
+        mock_fetcher.fetch_top_coins.return_value = None
+
+        scheduler = CryptoDataScheduler(settings, mock_fetcher, mock_repo)
+        self.assertFalse(scheduler.refresh_now())
+
+        self.assertTrue(mock_fetcher.fetch_top_coins.call_args.kwargs["if_changed"])
+        mock_repo.upsert.assert_not_called()
+
+    def test_full_refresh_is_unconditional_and_prunes(self):
+        settings = CryptoSettings()
+        mock_fetcher = MagicMock()
+        mock_repo = MagicMock()
+        mock_fetcher.fetch_top_coins.return_value = [{"symbol": "BTC"}]
+
+        scheduler = CryptoDataScheduler(settings, mock_fetcher, mock_repo)
+        scheduler.refresh_now(full=True)
+
+        self.assertFalse(mock_fetcher.fetch_top_coins.call_args.kwargs["if_changed"])
+        mock_repo.upsert.assert_called_once_with([{"symbol": "BTC"}], prune=True)
+
+    def test_every_nth_scheduled_refresh_is_full(self):
+        settings = CryptoSettings(scheduler_full_refresh_every=2)
+        scheduler = CryptoDataScheduler(settings, MagicMock(), MagicMock())
+
+        stops = [False, False, True]
+        with patch.object(scheduler, "refresh_now") as mock_refresh, \
+                patch.object(scheduler._stop_event, "wait", side_effect=stops):
+            scheduler._run_loop()
+
+        self.assertEqual(
+            [c.kwargs["full"] for c in mock_refresh.call_args_list], [True, False, True]
+        )
 
     def test_scheduler_lifecycle(self):
         settings = CryptoSettings(scheduler_interval_minutes=1)
@@ -0,0 +1,121 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.diff import ChangeSet, record_changed, values_equal
+from awesome_cli.core.crypto.repository import CryptoAssetRepository
+from awesome_cli.core.crypto.scheduler import CryptoDataScheduler
+
+
+class TestRecordDiff(unittest.TestCase):
+    def test_float_tolerance(self):
+        self.assertTrue(values_equal(100.0, 100.0000001, rel_tol=1e-6))
+        self.assertFalse(values_equal(100.0, 100.1, rel_tol=1e-6))
+        self.assertFalse(values_equal(100.0, 100.0000001))
+        self.assertTrue(values_equal({"eur": [1.0, None]}, {"eur": [1.0, None]}))
+        self.assertFalse(values_equal(1.0, None))
+
+    def test_ignored_fields(self):
+        old = {
+            "symbol": "BTC", "current_price": 1.0, "last_updated": "a", "metadata": {}
+        }
+        self.assertFalse(record_changed(
+            old, {"symbol": "BTC", "current_price": 1.0, "last_updated": "b"}
+        ))
+        self.assertTrue(record_changed(old, {"symbol": "BTC", "current_price": 2.0}))
+        self.assertTrue(record_changed(
+            old, {"symbol": "BTC", "current_price": 1.0, "name": "Bitcoin"}
+        ))
+
+    def test_changeset_merge(self):
+        first = ChangeSet(added=frozenset({"A"}), removed=frozenset({"B"}))
+        second = ChangeSet(added=frozenset({"B"}), updated=frozenset({"A", "C"}))
+        merged = first.merge(second)
+        self.assertEqual(merged.added, {"A"})
+        self.assertEqual(merged.updated, {"B", "C"})
+        self.assertEqual(merged.removed, frozenset())
+        self.assertFalse(ChangeSet())
+
+
+class TestRepositoryChanges(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.storage_path = Path(self.test_dir) / "assets.json"
+        self.settings = CryptoSettings(storage_path=str(self.storage_path))
+        self.repo = CryptoAssetRepository(self.settings)
+        self.repo.upsert([
+            {"symbol": "BTC", "current_price": 50000.0, "last_updated": "t0"},
+            {"symbol": "ETH", "current_price": 4000.0, "last_updated": "t0"},
+        ])
+
+    def tearDown(self):
+        self.repo.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_only_changed_records_are_applied(self):
+        eth = self.repo.get_by_symbol("ETH")
+        changes = self.repo.upsert([
+            {"symbol": "BTC", "current_price": 51000.0, "last_updated": "t1"},
+            {"symbol": "ETH", "current_price": 4000.0, "last_updated": "t1"},
+            {"symbol": "SOL", "current_price": 100.0, "last_updated": "t1"},
+        ])
+
+        self.assertEqual(changes.added, {"SOL"})
+        self.assertEqual(changes.updated, {"BTC"})
+        self.assertEqual(changes.removed, frozenset())
+        self.assertIs(self.repo.get_by_symbol("ETH"), eth)
+        self.repo.flush()
+        with self.storage_path.open() as f:
+            self.assertEqual(len(json.load(f)), 3)
+
+    def test_unchanged_upsert_skips_save(self):
+        with patch.object(self.repo, "save") as mock_save:
+            changes = self.repo.upsert([
+                {"symbol": "BTC", "current_price": 50000.0, "last_updated": "t1"},
+            ])
+        self.assertFalse(changes)
+        mock_save.assert_not_called()
+
+    def test_prune_and_subscribe(self):
+        listener = MagicMock()
+        self.repo.subscribe(listener)
+
+        changes = self.repo.upsert(
+            [{"symbol": "BTC", "current_price": 50000.0}], prune=True
+        )
+
+        self.assertEqual(changes.removed, {"ETH"})
+        self.assertIsNone(self.repo.get_by_symbol("ETH"))
+        listener.assert_called_once_with(changes)
+
+        self.repo.upsert([{"symbol": "BTC", "current_price": 50000.0}], prune=True)
+        listener.assert_called_once()
+
+    def test_scheduler_reports_no_change(self):
+        mock_fetcher = MagicMock()
+        mock_fetcher.fetch_top_coins.return_value = [
+            {"symbol": "BTC", "current_price": 50000.0, "last_updated": "t2"},
+        ]
+        scheduler = CryptoDataScheduler(self.settings, mock_fetcher, self.repo)
+
+        self.assertFalse(scheduler.refresh_now())
+
+    def test_full_refresh_removes_dropped_assets(self):
+        mock_fetcher = MagicMock()
+        mock_fetcher.fetch_top_coins.return_value = [
+            {"symbol": "BTC", "current_price": 50000.0},
+        ]
+        scheduler = CryptoDataScheduler(self.settings, mock_fetcher, self.repo)
+
+        self.assertFalse(scheduler.refresh_now())
+        self.assertIsNotNone(self.repo.get_by_symbol("ETH"))
+        self.assertTrue(scheduler.refresh_now(full=True))
+        self.assertIsNone(self.repo.get_by_symbol("ETH"))
+
+
+if __name__ == "__main__":
+    unittest.main()
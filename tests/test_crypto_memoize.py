@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from awesome_cli.core.crypto.cache import CacheManager
+from awesome_cli.core.crypto.memoize import canonical, memoize
+
+
+class TestMemoize(unittest.TestCase):
+    def setUp(self):
+        self.cache = CacheManager()
+        self.addCleanup(self.cache.shutdown)
+        self.calls = []
+
+    def test_equivalent_calls_share_a_key(self):
+        @memoize(self.cache, ttl_minutes=1)
+        def top_coins(limit=50, currency="usd"):
+            self.calls.append((limit, currency))
+            return [limit, currency]
+
+        self.assertEqual(top_coins(), [50, "usd"])
+        self.assertEqual(top_coins(50), [50, "usd"])
+        self.assertEqual(top_coins(currency="usd", limit=50), [50, "usd"])
+        self.assertEqual(top_coins(10, "eur"), [10, "eur"])
+        self.assertEqual(self.calls, [(50, "usd"), (10, "eur")])
+        self.assertEqual(top_coins.cache_key(), top_coins.cache_key(limit=50))
+
+    def test_methods_ignore_self(self):
+        cache = self.cache
+        calls = self.calls
+
+        class Fetcher:
+            @memoize(cache)
+            def fetch_top_coins(self, limit, currency="usd"):
+                calls.append(limit)
+                return {"limit": limit}
+
+        Fetcher().fetch_top_coins(5)
+        Fetcher().fetch_top_coins(5)
+        self.assertEqual(calls, [5])
+        self.assertIn("Fetcher.fetch_top_coins:limit=5,currency='usd'",
+                      Fetcher.fetch_top_coins.cache_key(None, 5))
+
+    def test_canonical_is_order_independent(self):
+        self.assertEqual(
+            canonical({"b": 1, "a": [1, {2}]}), canonical({"a": (1, {2}), "b": 1})
+        )
+        self.assertNotEqual(canonical("1"), canonical(1))
+
+    def test_invalidate_by_pattern(self):
+        @memoize(self.cache)
+        def price(symbol, currency="usd"):
+            self.calls.append((symbol, currency))
+            return 1.0
+
+        for symbol in ("btc", "eth"):
+            for currency in ("usd", "eur"):
+                price(symbol, currency)
+
+        self.assertEqual(price.invalidate(currency="eur"), 2)
+        price("btc", "eur")
+        price("btc", "usd")
+        self.assertEqual(self.calls[-1], ("btc", "eur"))
+        self.assertEqual(len(self.calls), 5)
+
+        self.assertEqual(price.invalidate(), 3)
+        with self.assertRaises(TypeError):
+            price.invalidate(coin="btc")
+
+    def test_tracked_keys_are_bounded(self):
+        @memoize(self.cache)
+        def square(n):
+            return n * n
+
+        with patch("awesome_cli.core.crypto.memoize.MAX_TRACKED_KEYS", 3):
+            for n in range(5):
+                square(n)
+        # Results that fell out of tracking were dropped from the cache too
+        self.assertIsNone(self.cache.get(square.cache_key(0)))
+        self.assertEqual(self.cache.get(square.cache_key(4)), 16)
+        self.assertEqual(square.invalidate(), 3)
+
+    def test_single_flight(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        @memoize(self.cache)
+        def slow(n):
+            self.calls.append(n)
+            started.set()
+            release.wait(5)
+            return n
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(slow(1))) for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        started.wait(5)
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [1] * 5)
+        self.assertEqual(self.calls, [1])
+
+    def test_without_single_flight_and_none_results(self):
+        @memoize(self.cache, single_flight=False)
+        def lookup(key):
+            self.calls.append(key)
+            return None if key == "missing" else key
+
+        lookup("a")
+        lookup("a")
+        lookup("missing")
+        lookup("missing")
+        self.assertEqual(self.calls, ["a", "missing", "missing"])
+
+    def test_async_functions(self):
+        @memoize(self.cache)
+        async def fetch(limit):
+            self.calls.append(limit)
+            await asyncio.sleep(0.01)
+            return limit
+
+        async def main():
+            return await asyncio.gather(*(fetch(3) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(main()), [3] * 5)
+        self.assertEqual(asyncio.run(fetch(3)), 3)
+        self.assertEqual(self.calls, [3])
+        self.assertTrue(asyncio.iscoroutinefunction(fetch))
+
+    def test_lazy_cache_source(self):
+        source = {"cache": None}
+
+        @memoize(lambda: source["cache"])
+        def double(n):
+            self.calls.append(n)
+            return n * 2
+
+        double(1)
+        double(1)
+        source["cache"] = self.cache
+        double(1)
+        double(1)
+        self.assertEqual(self.calls, [1, 1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
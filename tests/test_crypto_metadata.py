@@ -0,0 +1,230 @@
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.cache import CacheManager
+from awesome_cli.core.crypto.fetcher import CryptoDataFetcher
+from awesome_cli.core.crypto.metadata import CoinMetadataEnricher
+from awesome_cli.core.crypto.repository import CryptoAssetRepository
+
+
+class TestCoinMetadataEnricher(unittest.TestCase):
+    def setUp(self):
+        self.settings = CryptoSettings(
+            cache_ttl_metadata_hours=24, coingecko_max_concurrency=3
+        )
+        self.cache = CacheManager()
+        self.fetcher = MagicMock()
+        self.fetcher.fetch_coin_metadata.side_effect = (
+            lambda coin_id: {"description": coin_id}
+        )
+        self.enricher = CoinMetadataEnricher(self.settings, self.fetcher, self.cache)
+
+    def test_one_upstream_call_per_coin(self):
+        def slow_fetch(coin_id):
+            time.sleep(0.05)
+            return {"description": coin_id}
+
+        self.fetcher.fetch_coin_metadata.side_effect = slow_fetch
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(self.enricher.get_metadata("bitcoin"))
+            )
+            for _ in range(10)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(self.fetcher.fetch_coin_metadata.call_count, 1)
+        self.assertEqual(results, [{"description": "bitcoin"}] * 10)
+
+    def test_uses_metadata_ttl(self):
+        with patch.object(self.cache, "set", wraps=self.cache.set) as mock_set:
+            self.enricher.get_metadata("bitcoin")
+
+        # Stale metadata is served for one more TTL while it is refreshed
+        mock_set.assert_called_once_with(
+            "metadata:bitcoin", {"description": "bitcoin"}, 24 * 60, 24 * 60
+        )
+
+    def test_failures_are_not_retried_immediately(self):
+        self.fetcher.fetch_coin_metadata.side_effect = RuntimeError("upstream down")
+
+        self.assertIsNone(self.enricher.get_metadata("bitcoin"))
+        self.assertIsNone(self.enricher.get_metadata("bitcoin"))
+        self.assertEqual(self.fetcher.fetch_coin_metadata.call_count, 1)
+
+    def test_failed_refresh_keeps_stale_metadata(self):
+        cache = CacheManager()  # the enricher opts into a stale window
+        self.addCleanup(cache.shutdown)
+        enricher = CoinMetadataEnricher(self.settings, self.fetcher, cache)
+        self.assertEqual(enricher.get_metadata("bitcoin"), {"description": "bitcoin"})
+
+        self.fetcher.fetch_coin_metadata.side_effect = RuntimeError("upstream down")
+        # Past the 24h TTL but within the stale window
+        later = time.monotonic() + 24 * 3600 + 60
+        with patch("awesome_cli.core.crypto.cache.time.monotonic", return_value=later):
+            self.assertEqual(
+                enricher.get_metadata("bitcoin"), {"description": "bitcoin"}
+            )
+            cache.shutdown(wait=True)  # let the background refresh finish
+            self.assertEqual(
+                enricher.get_metadata("bitcoin"), {"description": "bitcoin"}
+            )
+        self.assertEqual(cache.stats()["refresh_errors"], 1)
+
+    def test_prefetch_bounded_concurrency(self):
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_fetch(coin_id):
+            with lock:
+                in_flight.append(coin_id)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.remove(coin_id)
+            return {"description": coin_id}
+
+        self.fetcher.fetch_coin_metadata.side_effect = slow_fetch
+        result = self.enricher.prefetch([f"coin-{i}" for i in range(12)] + ["coin-0"])
+
+        self.assertEqual(len(result), 12)
+        self.assertLessEqual(max(peak), 3)
+        self.assertEqual(self.fetcher.fetch_coin_metadata.call_count, 12)
+
+
+    def test_enrich_many_skips_enriched_and_unavailable_records(self):
+        def fetch(coin_id):
+            if coin_id == "broken":
+                raise RuntimeError("upstream down")
+            return {"description": coin_id}
+
+        self.fetcher.fetch_coin_metadata.side_effect = fetch
+        done = {"id": "done", "metadata": {"description": "cached"}}
+        records = [{"id": "bitcoin"}, done, {"id": "broken"}, {"symbol": "X"}]
+
+        result = self.enricher.enrich_many(records)
+
+        self.assertEqual(result[0]["metadata"], {"description": "bitcoin"})
+        self.assertIs(result[1], done)
+        self.assertIs(result[2], records[2])
+        self.assertIs(result[3], records[3])
+        self.assertEqual(self.fetcher.fetch_coin_metadata.call_count, 2)
+        # The failure is remembered as a dict marker, not returned as metadata
+        self.assertIsNone(self.enricher.get_metadata("broken"))
+        self.assertIsInstance(self.cache.get("metadata:broken"), dict)
+        self.assertEqual(self.fetcher.fetch_coin_metadata.call_count, 2)
+
+
+class TestLazyRepositoryEnrichment(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.settings = CryptoSettings(
+            storage_path=str(Path(self.test_dir) / "assets.json")
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_metadata_merged_on_first_request(self):
+        fetcher = MagicMock()
+        fetcher.fetch_coin_metadata.return_value = {"categories": ["Layer 1"]}
+        enricher = CoinMetadataEnricher(self.settings, fetcher, CacheManager())
+        repo = CryptoAssetRepository(self.settings, metadata_enricher=enricher)
+        repo.upsert([
+            {"id": "bitcoin", "symbol": "BTC"}, {"id": "ethereum", "symbol": "ETH"}
+        ])
+
+        fetcher.fetch_coin_metadata.assert_not_called()
+        self.assertNotIn("metadata", repo.get_all()[0])
+
+        for _ in range(3):
+            asset = repo.get_by_symbol("btc")
+        self.assertEqual(asset["metadata"], {"categories": ["Layer 1"]})
+        fetcher.fetch_coin_metadata.assert_called_once_with("bitcoin")
+
+        # A new tick replaces the record; metadata comes back from the cache
+        repo.upsert([{"id": "bitcoin", "symbol": "BTC", "total_volume": 1}])
+        self.assertIn("metadata", repo.get_by_symbol("BTC"))
+        fetcher.fetch_coin_metadata.assert_called_once()
+        repo.close()
+
+    def test_listing_loads_metadata_with_bounded_concurrency(self):
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_fetch(coin_id):
+            with lock:
+                in_flight.append(coin_id)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.remove(coin_id)
+            return {"description": coin_id}
+
+        fetcher = MagicMock()
+        fetcher.fetch_coin_metadata.side_effect = slow_fetch
+        settings = CryptoSettings(
+            storage_path=self.settings.storage_path, coingecko_max_concurrency=4
+        )
+        enricher = CoinMetadataEnricher(settings, fetcher, CacheManager())
+        repo = CryptoAssetRepository(settings, metadata_enricher=enricher)
+        self.addCleanup(repo.close)
+        repo.upsert([
+            {"id": f"coin-{i}", "symbol": f"C{i}", "total_volume": i}
+            for i in range(12)
+        ])
+
+        page = repo.with_metadata(repo.get_top_by("volume", limit=10))
+
+        self.assertEqual(len(page), 10)
+        self.assertTrue(all("metadata" in asset for asset in page))
+        self.assertGreater(max(peak), 1)
+        self.assertLessEqual(max(peak), 4)
+        self.assertEqual(fetcher.fetch_coin_metadata.call_count, 10)
+        # Stored, so the next listing makes no upstream calls
+        repo.with_metadata(repo.get_top_by("volume", limit=10))
+        self.assertEqual(fetcher.fetch_coin_metadata.call_count, 10)
+
+
+class TestFetchCoinMetadata(unittest.TestCase):
+    @patch("awesome_cli.core.crypto.fetcher.requests.Session")
+    def test_normalizes_detail_response(self, mock_session_cls):
+        mock_session = MagicMock()
+        mock_session_cls.return_value = mock_session
+        mock_session.get.return_value.json.return_value = {
+            "id": "bitcoin",
+            "description": {"en": "Digital gold"},
+            "categories": ["Cryptocurrency", None],
+            "links": {
+                "homepage": ["https://bitcoin.org", "", ""],
+                "whitepaper": "",
+                "repos_url": {"github": ["https://github.com/bitcoin/bitcoin"]},
+            },
+        }
+
+        fetcher = CryptoDataFetcher(CryptoSettings())
+        metadata = fetcher.fetch_coin_metadata("bitcoin")
+
+        self.assertEqual(metadata["description"], "Digital gold")
+        self.assertEqual(metadata["categories"], ["Cryptocurrency"])
+        self.assertEqual(metadata["links"]["homepage"], ["https://bitcoin.org"])
+        self.assertIsNone(metadata["links"]["whitepaper"])
+        self.assertIn("coins/bitcoin", mock_session.get.call_args.args[0])
+        params = mock_session.get.call_args.kwargs["params"]
+        self.assertEqual(params["tickers"], "false")
+
+
+if __name__ == "__main__":
+    unittest.main()
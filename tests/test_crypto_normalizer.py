@@ -0,0 +1,83 @@
+import math
+import unittest
+
+from awesome_cli.core.crypto.normalizer import (
+    MARKET_SCHEMA,
+    normalize_market_item,
+    normalize_markets,
+    normalize_markets_columnar,
+)
+
+
+class TestNormalizer(unittest.TestCase):
+    def test_normalizes_all_fields(self):
+        coin = normalize_market_item({
+            "id": "bitcoin",
+            "symbol": "btc",
+            "name": "Bitcoin",
+            "current_price": "50000",
+            "market_cap": 10,
+            "market_cap_rank": 1,
+            "total_volume": None,
+            "high_24h": "not-a-number",
+            "extra": "dropped",
+        })
+        self.assertEqual(coin["symbol"], "BTC")
+        self.assertEqual(coin["current_price"], 50000.0)
+        self.assertIsInstance(coin["market_cap"], float)
+        self.assertEqual(coin["market_cap_rank"], 1)
+        self.assertIsNone(coin["total_volume"])
+        self.assertIsNone(coin["high_24h"])
+        self.assertIsNone(coin["ath"])
+        self.assertNotIn("extra", coin)
+
+    def test_skips_invalid_entries(self):
+        data = [
+            {"id": "bitcoin", "symbol": "btc"},
+            {"symbol": "eth"},
+            {"id": "x", "symbol": ""},
+            {"id": "y", "symbol": 42},
+            "not_a_dict",
+            None,
+        ]
+        self.assertEqual([c["id"] for c in normalize_markets(data)], ["bitcoin"])
+
+    def test_output_follows_schema(self):
+        coin = normalize_market_item({"id": "bitcoin", "symbol": "btc"})
+        self.assertEqual(list(coin), [name for name, _ in MARKET_SCHEMA])
+
+
+class TestColumnarNormalizer(unittest.TestCase):
+    def test_columns_and_index(self):
+        columns = normalize_markets_columnar([
+            {"id": "bitcoin", "symbol": "btc", "current_price": 50000,
+             "total_volume": None},
+            {"symbol": "bad"},
+            {"id": "ethereum", "symbol": "eth", "current_price": "4000.5"},
+            {"id": "bitcoin-dup", "symbol": "BTC", "current_price": 1},
+        ])
+
+        self.assertEqual(len(columns), 2)
+        self.assertEqual(columns.symbols, ["BTC", "ETH"])
+        self.assertEqual(columns.ids, ["bitcoin", "ethereum"])
+        self.assertEqual(list(columns.column("current_price")), [50000.0, 4000.5])
+        self.assertTrue(math.isnan(columns.column("total_volume")[0]))
+        self.assertEqual(columns.row("eth")["current_price"], 4000.5)
+        self.assertIsNone(columns.row("btc")["total_volume"])
+        self.assertIsNone(columns.row("doge"))
+
+    def test_matches_row_normalizer(self):
+        data = [
+            {"id": f"c{i}", "symbol": f"s{i}", "market_cap": i * 1.5, "ath": str(i)}
+            for i in range(20)
+        ]
+        rows = normalize_markets(data)
+        columns = normalize_markets_columnar(data)
+        for row in rows:
+            position = columns.index[row["symbol"]]
+            self.assertEqual(columns.column("market_cap")[position], row["market_cap"])
+            self.assertEqual(columns.column("ath")[position], row["ath"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.async_fetcher import AsyncCryptoDataFetcher
+from awesome_cli.core.crypto.fetcher import CryptoDataFetcher
+from awesome_cli.core.crypto.quotes import (
+    QUOTE_FIELDS,
+    merge_currency_quotes,
+    project_currency,
+)
+from awesome_cli.core.crypto.scheduler import CryptoDataScheduler
+
+RATES = {"usd": 1.0, "eur": 0.9, "btc": 0.00002}
+
+
+def _markets_response(url, params, **kwargs):
+    rate = RATES[params["vs_currency"]]
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = [
+        {"id": "bitcoin", "symbol": "btc", "current_price": 50000 * rate,
+         "total_volume": 10 * rate},
+        {"id": "ethereum", "symbol": "eth", "current_price": 4000 * rate,
+         "total_volume": 5 * rate},
+    ]
+    return response
+
+
+class TestQuotes(unittest.TestCase):
+    def test_merge_and_project(self):
+        merged = merge_currency_quotes(
+            {
+                "usd": [{"id": "bitcoin", "symbol": "BTC", "current_price": 50000.0}],
+                "eur": [{"id": "bitcoin", "symbol": "BTC", "current_price": 45000.0}],
+            },
+            "usd",
+        )
+        self.assertEqual(len(merged), 1)
+        record = merged[0]
+        self.assertEqual(record["current_price"], 50000.0)
+        self.assertEqual(len(record["quotes"]["eur"]), len(QUOTE_FIELDS))
+
+        eur = project_currency(record, "EUR", "usd")
+        self.assertEqual(eur["current_price"], 45000.0)
+        self.assertEqual(eur["currency"], "eur")
+        self.assertNotIn("quotes", eur)
+        self.assertEqual(
+            project_currency(record, "usd", "usd")["current_price"], 50000.0
+        )
+        self.assertIsNone(project_currency(record, "btc", "usd")["current_price"])
+
+    def test_base_currency_defines_universe(self):
+        merged = merge_currency_quotes(
+            {"usd": [{"id": "a", "symbol": "A"}], "eur": [{"id": "b", "symbol": "B"}]},
+            "usd",
+        )
+        self.assertEqual([r["id"] for r in merged], ["a"])
+        self.assertNotIn("quotes", merged[0])
+
+
+class TestMultiCurrencyFetch(unittest.TestCase):
+    def setUp(self):
+        self.settings = CryptoSettings(coingecko_rate_limit_requests=60000)
+
+    @patch("awesome_cli.core.crypto.fetcher.requests.Session")
+    def test_sequential_fetcher(self, mock_session_cls):
+        mock_session = MagicMock()
+        mock_session_cls.return_value = mock_session
+        mock_session.get.side_effect = _markets_response
+
+        fetcher = CryptoDataFetcher(self.settings)
+        records = fetcher.fetch_top_coins_multi(["usd", "eur", "btc"], limit=2)
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["current_price"], 50000.0)
+        eur_price = records[0]["quotes"]["eur"][QUOTE_FIELDS.index("current_price")]
+        self.assertAlmostEqual(eur_price, 45000.0)
+        self.assertIn("btc", records[1]["quotes"])
+
+    @patch("awesome_cli.core.crypto.fetcher.requests.Session")
+    def test_async_fetcher_refetches_unchanged_currencies(self, mock_session_cls):
+        mock_session = MagicMock()
+        mock_session_cls.return_value = mock_session
+
+        def conditional(url, params, headers=None, **kwargs):
+            if headers and params["vs_currency"] == "eur":
+                response = MagicMock()
+                response.status_code = 304
+                return response
+            response = _markets_response(url, params)
+            response.content = repr(params).encode()
+            response.headers = {"ETag": params["vs_currency"]}
+            return response
+
+        mock_session.get.side_effect = conditional
+        fetcher = AsyncCryptoDataFetcher(self.settings)
+
+        first = fetcher.fetch_top_coins_multi(["usd", "eur"], limit=2, if_changed=True)
+        self.assertIn("eur", first[0]["quotes"])
+
+        # usd payload unchanged by hash, eur answered 304: nothing changed
+        self.assertIsNone(
+            fetcher.fetch_top_coins_multi(["usd", "eur"], limit=2, if_changed=True)
+        )
+
+        # A usd change must still produce complete eur quotes
+        fetcher.reset_validators()
+        fetcher.fetch_top_coins(limit=2, currency="eur", if_changed=True)
+        second = fetcher.fetch_top_coins_multi(["usd", "eur"], limit=2, if_changed=True)
+        self.assertIn("eur", second[0]["quotes"])
+
+    @patch("awesome_cli.core.crypto.fetcher.requests.Session")
+    def test_sequential_fetcher_requests_currencies_concurrently(
+        self, mock_session_cls
+    ):
+        mock_session = MagicMock()
+        mock_session_cls.return_value = mock_session
+        # Every currency must be in flight at once for the barrier to open
+        barrier = threading.Barrier(3, timeout=5)
+
+        def concurrent(url, params, **kwargs):
+            barrier.wait()
+            return _markets_response(url, params)
+
+        mock_session.get.side_effect = concurrent
+        settings = CryptoSettings(
+            coingecko_rate_limit_requests=60000, coingecko_max_concurrency=3
+        )
+        fetcher = CryptoDataFetcher(settings)
+
+        records = fetcher.fetch_top_coins_multi(["usd", "eur", "btc"], limit=2)
+        self.assertEqual(sorted(records[0]["quotes"]), ["btc", "eur"])
+
+    @patch("awesome_cli.core.crypto.fetcher.requests.Session")
+    def test_unchanged_currencies_are_merged_from_last_payload(
+        self, mock_session_cls
+    ):
+        mock_session = MagicMock()
+        mock_session_cls.return_value = mock_session
+        usd_scale = [1.0]
+
+        def conditional(url, params, headers=None, **kwargs):
+            currency = params["vs_currency"]
+            if headers and currency == "eur":
+                response = MagicMock()
+                response.status_code = 304
+                return response
+            response = _markets_response(url, params)
+            if currency == "usd":
+                for coin in response.json.return_value:
+                    coin["current_price"] *= usd_scale[0]
+            response.content = repr(response.json.return_value).encode()
+            response.headers = {"ETag": currency}
+            return response
+
+        for fetcher_cls in (CryptoDataFetcher, AsyncCryptoDataFetcher):
+            with self.subTest(fetcher=fetcher_cls.__name__):
+                mock_session.get.reset_mock()
+                mock_session.get.side_effect = conditional
+                usd_scale[0] = 1.0
+                fetcher = fetcher_cls(self.settings)
+                fetcher.fetch_top_coins_multi(["usd", "eur"], limit=2, if_changed=True)
+
+                usd_scale[0] = 2.0
+                records = fetcher.fetch_top_coins_multi(
+                    ["usd", "eur"], limit=2, if_changed=True
+                )
+
+                self.assertEqual(records[0]["current_price"], 100000.0)
+                eur = records[0]["quotes"]["eur"]
+                self.assertAlmostEqual(
+                    eur[QUOTE_FIELDS.index("current_price")], 45000.0
+                )
+                # Two requests per refresh; the 304 for eur is not refetched
+                self.assertEqual(mock_session.get.call_count, 4)
+
+    def test_scheduler_uses_multi_fetch(self):
+        settings = CryptoSettings(quote_currencies=["usd", "eur"])
+        mock_fetcher = MagicMock()
+        mock_repo = MagicMock()
+        mock_fetcher.fetch_top_coins_multi.return_value = [{"symbol": "BTC"}]
+
+        scheduler = CryptoDataScheduler(settings, mock_fetcher, mock_repo)
+        self.assertTrue(scheduler.refresh_now())
+
+        mock_fetcher.fetch_top_coins_multi.assert_called_once_with(
+            ["usd", "eur"], limit=50, if_changed=True
+        )
+        mock_fetcher.fetch_top_coins.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import random
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.ranking import SORT_FIELDS, RankIndex
+from awesome_cli.core.crypto.repository import CryptoAssetRepository
+
+
+class TestRankIndex(unittest.TestCase):
+    def test_updates_keep_order(self):
+        index = RankIndex(SORT_FIELDS["volume"])
+        index.update("A", {"total_volume": 10})
+        index.update("B", {"total_volume": 30})
+        index.update("C", {"total_volume": None})
+        index.update("D", {"total_volume": 20})
+        self.assertEqual(index.top(), ["B", "D", "A", "C"])
+
+        index.update("A", {"total_volume": 40})
+        index.remove("B")
+        index.remove("missing")
+        self.assertEqual(index.top(2), ["A", "D"])
+        self.assertEqual(len(index), 3)
+
+    def test_ascending_rank_and_ties(self):
+        index = RankIndex(SORT_FIELDS["rank"])
+        index.rebuild({
+            "B": {"market_cap_rank": 2},
+            "A": {"market_cap_rank": 2},
+            "C": {"market_cap_rank": 1},
+            "D": {},
+            "E": {"market_cap_rank": float("nan")},
+        })
+        self.assertEqual(index.top(), ["C", "A", "B", "D", "E"])
+
+
+class TestRepositoryRankings(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        settings = CryptoSettings(
+            storage_path=str(Path(self.test_dir) / "assets.json"),
+            storage_write_behind_seconds=0,
+        )
+        self.repo = CryptoAssetRepository(settings)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def expected(self, sort, limit):
+        field, descending = SORT_FIELDS[sort]
+        present = [a for a in self.repo.get_all() if a.get(field) is not None]
+        missing = [a for a in self.repo.get_all() if a.get(field) is None]
+        present.sort(key=lambda a: (-a[field] if descending else a[field], a["symbol"]))
+        missing.sort(key=lambda a: a["symbol"])
+        return [a["symbol"] for a in present + missing][:limit]
+
+    def test_indexes_track_upserts_and_prunes(self):
+        rng = random.Random(3)
+
+        def tick(count):
+            return [
+                {
+                    "symbol": f"C{i}",
+                    "total_volume": rng.choice([None, rng.uniform(0, 1e6)]),
+                    "market_cap": rng.uniform(0, 1e9),
+                    "market_cap_rank": rng.randint(1, 100),
+                    "price_change_percentage_24h": rng.uniform(-20, 20),
+                    "price_change_percentage_7d_in_currency": rng.uniform(-50, 50),
+                }
+                for i in rng.sample(range(80), count)
+            ]
+
+        for count in (60, 30, 50):
+            self.repo.upsert(tick(count), prune=count == 50)
+            for sort in SORT_FIELDS:
+                got = [a["symbol"] for a in self.repo.get_top_by(sort, limit=10)]
+                self.assertEqual(got, self.expected(sort, 10), sort)
+
+        reloaded = CryptoAssetRepository(
+            CryptoSettings(storage_path=str(self.repo.store.path))
+        )
+        self.assertEqual(
+            [a["symbol"] for a in reloaded.get_top_by("market_cap", limit=5)],
+            self.expected("market_cap", 5),
+        )
+
+    def test_unknown_sort(self):
+        with self.assertRaises(ValueError):
+            self.repo.get_top_by("name")
+
+
+if __name__ == "__main__":
+    unittest.main()
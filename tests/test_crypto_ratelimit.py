@@ -0,0 +1,142 @@
+import asyncio
+import multiprocessing
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.fetcher import CryptoDataFetcher
+from awesome_cli.core.crypto.ratelimit import (
+    FileTokenBucket,
+    TokenBucket,
+    create_rate_limiter,
+)
+
+
+def _drain_bucket(path, rate, capacity, results):
+    bucket = FileTokenBucket(path, rate, capacity)
+    results.put(sum(bucket.try_acquire() for _ in range(10)))
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_empty(self):
+        bucket = TokenBucket(rate_per_second=1.0, capacity=3)
+        self.assertTrue(all(bucket.try_acquire() for _ in range(3)))
+        self.assertFalse(bucket.try_acquire())
+
+    def test_acquire_waits_for_refill(self):
+        bucket = TokenBucket(rate_per_second=20.0, capacity=1)
+        bucket.try_acquire()
+        start = time.monotonic()
+        self.assertTrue(bucket.acquire())
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    def test_acquire_timeout(self):
+        bucket = TokenBucket(rate_per_second=0.1, capacity=1)
+        bucket.try_acquire()
+        self.assertFalse(bucket.acquire(timeout=0.05))
+
+    def test_acquire_async(self):
+        bucket = TokenBucket(rate_per_second=50.0, capacity=1)
+
+        async def take_three():
+            return [await bucket.acquire_async() for _ in range(3)]
+
+        start = time.monotonic()
+        self.assertEqual(asyncio.run(take_three()), [True, True, True])
+        self.assertGreaterEqual(time.monotonic() - start, 0.035)
+
+    def test_threads_never_exceed_capacity(self):
+        bucket = TokenBucket(rate_per_second=0.01, capacity=5)
+        granted = []
+
+        def worker():
+            for _ in range(10):
+                if bucket.try_acquire():
+                    granted.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(granted), 5)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate_per_second=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate_per_second=1, capacity=0)
+
+
+class TestFileTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = str(Path(self.test_dir) / "bucket.state")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_budget_shared_between_instances(self):
+        first = FileTokenBucket(self.path, rate_per_second=0.01, capacity=4)
+        second = FileTokenBucket(self.path, rate_per_second=0.01, capacity=4)
+        self.assertTrue(first.try_acquire())
+        self.assertTrue(second.try_acquire())
+        self.assertTrue(first.try_acquire())
+        self.assertTrue(second.try_acquire())
+        self.assertFalse(first.try_acquire())
+        self.assertFalse(second.try_acquire())
+        first.close()
+        second.close()
+
+    def test_budget_shared_between_processes(self):
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+        procs = [
+            ctx.Process(target=_drain_bucket, args=(self.path, 0.01, 6, results))
+            for _ in range(3)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        self.assertEqual(sum(results.get() for _ in procs), 6)
+
+
+class TestRateLimiterWiring(unittest.TestCase):
+    def test_create_rate_limiter_defaults(self):
+        limiter = create_rate_limiter(CryptoSettings())
+        self.assertIsInstance(limiter, TokenBucket)
+        self.assertEqual(limiter.capacity, 5)
+
+    def test_create_rate_limiter_shared(self):
+        test_dir = tempfile.mkdtemp()
+        try:
+            settings = CryptoSettings(
+                rate_limit_state_path=str(Path(test_dir) / "shared.state")
+            )
+            limiter = create_rate_limiter(settings)
+            self.assertIsInstance(limiter, FileTokenBucket)
+            limiter.close()
+        finally:
+            shutil.rmtree(test_dir)
+
+    @patch("awesome_cli.core.crypto.fetcher.requests.Session")
+    def test_fetcher_uses_injected_limiter(self, mock_session_cls):
+        mock_session = MagicMock()
+        mock_session_cls.return_value = mock_session
+        mock_session.get.return_value.json.return_value = []
+        limiter = MagicMock()
+
+        fetcher = CryptoDataFetcher(CryptoSettings(), rate_limiter=limiter)
+        fetcher.fetch_top_coins(limit=1)
+
+        limiter.acquire.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.repository import CryptoAssetRepository
+
+
+def tick(generation, count=20):
+    return [
+        {"symbol": f"C{i}", "total_volume": float(i), "gen": generation}
+        for i in range(count)
+    ]
+
+
+class TestAssetSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        settings = CryptoSettings(
+            storage_path=str(Path(self.test_dir) / "assets.json"),
+            storage_write_behind_seconds=3600,
+        )
+        self.repo = CryptoAssetRepository(settings)
+
+    def tearDown(self):
+        self.repo.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_generation_and_immutability(self):
+        start = self.repo.generation
+        self.repo.upsert(tick(1))
+        before = self.repo.snapshot()
+        self.assertEqual(before.generation, start + 1)
+
+        self.repo.upsert(tick(1))  # unchanged
+        self.assertEqual(self.repo.generation, start + 1)
+
+        self.repo.upsert(tick(2), prune=True)
+        self.assertEqual(self.repo.generation, start + 2)
+        self.assertEqual(before.assets["C0"]["gen"], 1)
+        self.assertEqual([a["symbol"] for a in before.top("volume", 2)], ["C19", "C18"])
+        with self.assertRaises(TypeError):
+            before.assets["C0"] = {}
+
+    def test_upsert_iter_publishes_once(self):
+        start = self.repo.generation
+        self.repo.upsert_iter(iter(tick(1, count=50)), batch_size=10)
+        self.assertEqual(self.repo.generation, start + 1)
+        self.assertEqual(len(self.repo.snapshot()), 50)
+
+    def test_unmoved_orders_are_shared_between_snapshots(self):
+        self.repo.upsert(tick(1))
+        before = self.repo.snapshot().orders()
+
+        # Only the volume order moves
+        self.repo.upsert([{"symbol": "C0", "total_volume": 100.0, "gen": 1}])
+        after = self.repo.snapshot().orders()
+        self.assertEqual(after["volume"][0], "C0")
+        for name in set(before) - {"volume"}:
+            self.assertIs(after[name], before[name])
+
+        # A write that moves no order, like metadata enrichment
+        self.repo.upsert([{"symbol": "C0", "total_volume": 100.0, "gen": 2}])
+        latest = self.repo.snapshot().orders()
+        self.assertTrue(all(latest[name] is after[name] for name in after))
+
+    def test_reads_do_not_wait_for_writers(self):
+        self.repo.upsert(tick(1))
+        results = []
+        with self.repo._lock:  # a writer mid-upsert
+            reader = threading.Thread(target=lambda: results.append((
+                len(self.repo.get_all()),
+                self.repo.get_by_symbol("c1")["gen"],
+                len(self.repo.get_top_by("volume", 5)),
+            )))
+            reader.start()
+            reader.join(5)
+            self.assertFalse(reader.is_alive())
+        self.assertEqual(results, [(20, 1, 5)])
+
+    def test_readers_see_consistent_generations(self):
+        stop = threading.Event()
+        errors = []
+
+        def read():
+            while not stop.is_set():
+                snapshot = self.repo.snapshot()
+                gens = {a["gen"] for a in snapshot.top("volume")}
+                if len(gens) > 1 or len(snapshot) not in (0, 20):
+                    errors.append((snapshot.generation, gens))
+
+        start = self.repo.generation
+        readers = [threading.Thread(target=read) for _ in range(3)]
+        for t in readers:
+            t.start()
+        for generation in range(1, 50):
+            self.repo.upsert(tick(generation))
+        stop.set()
+        for t in readers:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.repo.generation, start + 49)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.ranking import SORT_FIELDS
+from awesome_cli.core.crypto.repository import CryptoAssetRepository, create_repository
+from awesome_cli.core.crypto.sqlite_repository import SQLiteAssetRepository
+
+ASSETS = [
+    {"symbol": "BTC", "id": "bitcoin", "total_volume": 300.0, "market_cap": 900.0,
+     "market_cap_rank": 1},
+    {"symbol": "ETH", "id": "ethereum", "total_volume": 200.0, "market_cap": 400.0,
+     "market_cap_rank": 2},
+    {"symbol": "SOL", "id": "solana", "total_volume": 250.0, "market_cap": 100.0,
+     "market_cap_rank": 5},
+    {"symbol": "NEW", "id": "new", "total_volume": None, "market_cap": None,
+     "market_cap_rank": None},
+]
+
+
+class TestSQLiteAssetRepository(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.storage_path = Path(self.test_dir) / "crypto_assets.json"
+        self.settings = CryptoSettings(
+            storage_path=str(self.storage_path), storage_mode="sqlite"
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def open(self, **kwargs):
+        repo = SQLiteAssetRepository(self.settings, **kwargs)
+        self.addCleanup(repo.close)
+        return repo
+
+    def test_queries_match_in_memory_repository(self):
+        memory = CryptoAssetRepository(
+            CryptoSettings(
+                storage_path=str(self.storage_path), storage_write_behind_seconds=0
+            )
+        )
+        sqlite = self.open()
+        for repo in (memory, sqlite):
+            repo.upsert(ASSETS)
+
+        def symbols(assets):
+            return [a["symbol"] for a in assets]
+
+        self.assertEqual(symbols(sqlite.get_top_by_volume(3)), ["BTC", "SOL", "ETH"])
+        self.assertEqual(symbols(sqlite.get_top_by_volume(3)),
+                         symbols(memory.get_top_by_volume(3)))
+        for sort in SORT_FIELDS:
+            self.assertEqual(symbols(sqlite.get_top_by(sort, 4)),
+                             symbols(memory.get_top_by(sort, 4)), sort)
+        queries = [
+            {"min_market_cap": 150}, {"max_rank": 2},
+            {"min_volume": 210, "max_rank": 5},
+            {"limit": 2}, {"limit": 0}, {"limit": -1}, {},
+        ]
+        for bounds in queries:
+            self.assertEqual(symbols(sqlite.filter_assets(**bounds)),
+                             symbols(memory.filter_assets(**bounds)), bounds)
+        self.assertEqual(sqlite.get_top_by("volume", -1), [])
+        self.assertEqual(memory.get_top_by("volume", -1), [])
+        self.assertEqual(sqlite.get_by_symbol("eth"), memory.get_by_symbol("eth"))
+        self.assertEqual(len(sqlite.get_all()), 4)
+
+    def test_snapshot_is_not_supported(self):
+        with self.assertRaises(NotImplementedError):
+            self.open().snapshot()
+
+    def test_generation_counts_committed_changes(self):
+        repo = self.open()
+        start = repo.generation
+        repo.upsert(ASSETS)
+        self.assertEqual(repo.generation, start + 1)
+        repo.upsert(ASSETS)
+        self.assertEqual(repo.generation, start + 1)
+        repo.upsert_iter(iter([dict(ASSETS[0], total_volume=1.0)]))
+        self.assertEqual(repo.generation, start + 2)
+
+    def test_reads_do_not_wait_for_the_writer_lock(self):
+        repo = self.open()
+        repo.upsert(ASSETS)
+        results = []
+
+        def read():
+            results.append(
+                (repo.count(), repo.get_by_symbol("BTC")["id"],
+                 len(repo.get_top_by("volume")), len(repo.filter_assets()))
+            )
+
+        with repo._lock:
+            reader = threading.Thread(target=read)
+            reader.start()
+            reader.join(5)
+        self.assertEqual(results, [(4, "bitcoin", 4, 4)])
+        # Top queries run their two scans in one read transaction
+        for sort in SORT_FIELDS:
+            self.assertEqual(len(repo.get_top_by(sort)), 4)
+        self.assertFalse(repo._reader().in_transaction)
+
+    def test_changes_are_checkpointed_write_behind(self):
+        repo = self.open()
+        statements = []
+        repo._conn.set_trace_callback(statements.append)
+        repo.upsert(ASSETS)
+        repo.flush()
+        self.assertIn("PRAGMA wal_checkpoint(PASSIVE)", statements)
+
+        # Nothing pending, nothing to checkpoint
+        statements.clear()
+        repo.flush()
+        self.assertEqual(statements, [])
+
+    def test_changes_and_prune(self):
+        repo = self.open()
+        self.assertEqual(repo.upsert(ASSETS).added, {"BTC", "ETH", "SOL", "NEW"})
+        self.assertFalse(repo.upsert([dict(ASSETS[0], last_updated="later")]))
+
+        changes = repo.upsert(
+            [dict(ASSETS[0], total_volume=1.0), ASSETS[1]], prune=True
+        )
+        self.assertEqual(changes.updated, {"BTC"})
+        self.assertEqual(changes.removed, {"SOL", "NEW"})
+        self.assertEqual(repo.count(), 2)
+
+        repo.close()
+        self.assertEqual(self.open().get_by_symbol("BTC")["total_volume"], 1.0)
+
+    def test_upsert_is_one_transaction(self):
+        repo = self.open()
+        statements = []
+        repo._conn.set_trace_callback(statements.append)
+        repo.upsert([{"symbol": f"C{i}", "total_volume": i} for i in range(50)])
+        self.assertEqual(sum(s.startswith("BEGIN") for s in statements), 1)
+
+    def test_top_query_uses_index(self):
+        repo = self.open()
+        plan = repo._conn.execute(
+            "EXPLAIN QUERY PLAN "
+            "SELECT data FROM assets ORDER BY total_volume DESC LIMIT 5"
+        ).fetchall()
+        self.assertIn("assets_total_volume", " ".join(str(row) for row in plan))
+
+    def test_filter_ties_ordered_by_symbol(self):
+        memory = CryptoAssetRepository(
+            CryptoSettings(
+                storage_path=str(self.storage_path), storage_write_behind_seconds=0
+            )
+        )
+        sqlite = self.open()
+        tied = [{"symbol": s, "total_volume": 5.0} for s in ("ZED", "ABC", "MID")]
+        for repo in (memory, sqlite):
+            repo.upsert(tied)
+        self.assertEqual(
+            [a["symbol"] for a in sqlite.filter_assets()], ["ABC", "MID", "ZED"]
+        )
+        self.assertEqual(sqlite.filter_assets(), memory.filter_assets())
+
+    def test_migration_leaves_journal_untouched(self):
+        self.storage_path.write_text(json.dumps(ASSETS[:1]))
+        journal = self.storage_path.with_suffix(".journal")
+        torn = (
+            json.dumps({"op": "put", "asset": ASSETS[1]}) + "\n"
+            + '{"op":"put","asset":{'
+        ).encode()
+        journal.write_bytes(torn)
+
+        self.assertEqual(self.open().count(), 2)
+        self.assertEqual(journal.read_bytes(), torn)
+
+    def test_migrates_existing_json(self):
+        self.storage_path.write_text(json.dumps(ASSETS[:2]))
+        repo = self.open()
+        self.assertEqual(repo.count(), 2)
+        self.assertEqual(repo.get_by_symbol("BTC")["id"], "bitcoin")
+        repo.close()
+
+        # Only an empty database is migrated
+        self.storage_path.write_text(json.dumps(ASSETS))
+        self.assertEqual(self.open().count(), 2)
+
+    def test_enrichment_is_stored(self):
+        enricher = MagicMock()
+        enricher.enrich_many.side_effect = lambda assets: [
+            dict(asset, metadata={"categories": []}) for asset in assets
+        ]
+        repo = self.open(metadata_enricher=enricher)
+        repo.upsert(ASSETS)
+
+        self.assertIn("metadata", repo.get_by_symbol("BTC"))
+        self.assertIn("metadata", repo.get_by_symbol("BTC"))
+        enricher.enrich_many.assert_called_once()
+
+        listed = repo.with_metadata(repo.get_top_by("volume"))
+        self.assertTrue(all("metadata" in asset for asset in listed))
+        self.assertTrue(all("metadata" in asset for asset in repo.get_all()))
+        # BTC was passed along already enriched
+        page = enricher.enrich_many.call_args.args[0]
+        self.assertEqual(sum("metadata" not in asset for asset in page), 3)
+
+    def test_create_repository(self):
+        repo = create_repository(self.settings)
+        self.addCleanup(repo.close)
+        self.assertIsInstance(repo, SQLiteAssetRepository)
+        self.assertEqual(repo.db_path, Path(self.test_dir) / "crypto_assets.db")
+        self.assertIs(type(create_repository(CryptoSettings(storage_path=str(self.storage_path)))),
+                      CryptoAssetRepository)
+
+
+if __name__ == "__main__":
+    unittest.main()
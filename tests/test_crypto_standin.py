@@ -0,0 +1,108 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.async_fetcher import AsyncCryptoDataFetcher
+from awesome_cli.core.crypto.fetcher import CryptoDataFetcher
+from awesome_cli.core.crypto.repository import CryptoAssetRepository
+from awesome_cli.core.crypto.scheduler import CryptoDataScheduler
+from awesome_cli.core.crypto.standin import CoinGeckoStandIn, synthetic_markets
+
+
+class TestCoinGeckoStandIn(unittest.TestCase):
+    """End-to-end tests of the fetcher stack over real local HTTP."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.standin = CoinGeckoStandIn(coin_count=600).start()
+        self.settings = CryptoSettings(
+            coingecko_api_base_url=self.standin.base_url,
+            coingecko_rate_limit_requests=60000,
+            storage_path=str(Path(self.test_dir) / "assets.json"),
+        )
+
+    def tearDown(self):
+        self.standin.stop()
+        shutil.rmtree(self.test_dir)
+
+    def test_fetch_and_conditional_refetch(self):
+        fetcher = CryptoDataFetcher(self.settings)
+
+        coins = fetcher.fetch_top_coins(limit=50, if_changed=True)
+        self.assertEqual(len(coins), 50)
+        volumes = [c["total_volume"] for c in coins]
+        self.assertEqual(volumes, sorted(volumes, reverse=True))
+
+        self.assertIsNone(fetcher.fetch_top_coins(limit=50, if_changed=True))
+        self.assertEqual(self.standin.not_modified_count, 1)
+
+    def test_async_multi_page_fetch(self):
+        fetcher = AsyncCryptoDataFetcher(self.settings)
+        coins = fetcher.fetch_top_coins(limit=600)
+        self.assertEqual(len({c["id"] for c in coins}), 600)
+        self.assertEqual(self.standin.request_count, 3)
+
+    def test_streaming_fetch(self):
+        fetcher = CryptoDataFetcher(self.settings)
+        coins = list(fetcher.iter_top_coins(limit=300, chunk_size=1024))
+        self.assertEqual(len(coins), 300)
+
+    def test_conditional_streaming_fetch_sees_later_pages(self):
+        fetcher = CryptoDataFetcher(self.settings)
+        first = list(fetcher.iter_top_coins(limit=600, if_changed=True))
+        self.assertEqual(len(first), 600)
+
+        # Change a coin served on page 2; pages 1 and 3 answer 304
+        coins = sorted(
+            synthetic_markets(600), key=lambda c: c["total_volume"], reverse=True
+        )
+        coins[300]["current_price"] += 1
+        self.standin.set_coins(coins)
+        changed = list(fetcher.iter_top_coins(limit=600, if_changed=True))
+
+        self.assertEqual(self.standin.not_modified_count, 2)
+        self.assertEqual(len(changed), 250)
+        self.assertIn(coins[300]["id"], {c["id"] for c in changed})
+
+    def test_injected_429_is_retried(self):
+        self.standin.error_every = 2
+        fetcher = CryptoDataFetcher(self.settings)
+
+        self.assertEqual(len(fetcher.fetch_top_coins(limit=10)), 10)
+        self.assertEqual(len(fetcher.fetch_top_coins(limit=10)), 10)
+        self.assertEqual(self.standin.error_count, 1)
+
+    def test_scheduler_refresh_end_to_end(self):
+        repository = CryptoAssetRepository(self.settings)
+        scheduler = CryptoDataScheduler(
+            self.settings, AsyncCryptoDataFetcher(self.settings), repository
+        )
+
+        self.assertTrue(scheduler.refresh_now())
+        self.assertEqual(len(repository.get_all()), 50)
+        self.assertFalse(scheduler.refresh_now())
+
+        self.standin.set_coins(synthetic_markets(600, seed=7))
+        self.assertTrue(scheduler.refresh_now())
+        repository.close()
+
+    def test_recording_and_detail_endpoints(self):
+        recording = Path(self.test_dir) / "markets.json"
+        recording.write_text('[{"id": "bitcoin", "symbol": "btc", "total_volume": 1}]')
+        with CoinGeckoStandIn.from_recording(str(recording)) as standin:
+            settings = CryptoSettings(
+                coingecko_api_base_url=standin.base_url,
+                coingecko_rate_limit_requests=60000,
+            )
+            fetcher = CryptoDataFetcher(settings)
+            self.assertEqual(fetcher.fetch_top_coins(limit=5)[0]["symbol"], "BTC")
+            metadata = fetcher.fetch_coin_metadata("bitcoin")
+            self.assertEqual(metadata["categories"], ["Synthetic"])
+            chart = fetcher.fetch_market_chart_range("bitcoin", 0, 86400)
+            self.assertEqual(len(chart["prices"]), 23)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.repository import CryptoAssetRepository
+from awesome_cli.core.crypto.storage import (
+    JournalStore,
+    JSONFileStore,
+    create_store,
+)
+
+
+def coins(count, price=1.0):
+    return [{"symbol": f"C{i}", "current_price": price + i} for i in range(count)]
+
+
+class TestJournalStore(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.storage_path = Path(self.test_dir) / "assets.json"
+        self.journal_path = Path(self.test_dir) / "assets.journal"
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def make_repo(self, **overrides):
+        settings = CryptoSettings(
+            storage_path=str(self.storage_path),
+            storage_mode="journal",
+            storage_write_behind_seconds=0,
+            **overrides,
+        )
+        repo = CryptoAssetRepository(settings)
+        self.addCleanup(repo.close)
+        return repo
+
+    def test_writes_only_changed_records(self):
+        repo = self.make_repo()
+        repo.upsert(coins(100))
+        self.assertEqual(len(self.journal_path.read_text().splitlines()), 100)
+        self.assertFalse(self.storage_path.exists())
+
+        with patch.object(repo.store, "save_all") as mock_save_all:
+            repo.upsert([{"symbol": "C3", "current_price": 99.0}])
+        mock_save_all.assert_not_called()
+        lines = self.journal_path.read_text().splitlines()
+        self.assertEqual(len(lines), 101)
+        self.assertEqual(json.loads(lines[-1])["asset"]["current_price"], 99.0)
+
+    def test_reload_replays_journal(self):
+        repo = self.make_repo()
+        repo.upsert(coins(5))
+        repo.upsert(
+            [{"symbol": "C0", "current_price": 42.0}, {"symbol": "C1"}], prune=True
+        )
+        repo.close()
+
+        reloaded = self.make_repo()
+        self.assertEqual(sorted(a["symbol"] for a in reloaded.get_all()), ["C0", "C1"])
+        self.assertEqual(reloaded.get_by_symbol("C0")["current_price"], 42.0)
+
+    def test_torn_tail_is_dropped(self):
+        repo = self.make_repo()
+        repo.upsert(coins(3))
+        repo.close()
+        with self.journal_path.open("ab") as f:
+            f.write(b'{"op":"put","asset":{"symbol":"C9"')
+
+        reloaded = self.make_repo()
+        self.assertEqual(len(reloaded.get_all()), 3)
+        # Later appends start on a fresh line
+        reloaded.upsert([{"symbol": "C9", "current_price": 9.0}])
+        reloaded.close()
+        self.assertEqual(len(self.make_repo().get_all()), 4)
+
+    def test_compaction_folds_journal_into_snapshot(self):
+        repo = self.make_repo(storage_journal_max_records=10)
+        for price in range(4):
+            repo.upsert(coins(4, price=price * 10.0))
+        repo.store._compactor.join()
+
+        snapshot = json.loads(self.storage_path.read_text())
+        self.assertEqual(len(snapshot), 4)
+        self.assertFalse(repo.store.rotated_path.exists())
+        # Only the entries written after rotation are left to replay
+        self.assertEqual(len(self.journal_path.read_text().splitlines()), 4)
+
+        repo.close()
+        reloaded = self.make_repo()
+        self.assertEqual(reloaded.get_by_symbol("C3")["current_price"], 33.0)
+
+    def test_crash_during_compaction_loads_consistent_store(self):
+        # Old snapshot, rotated journal not yet folded in, and newer entries
+        self.storage_path.write_text(
+            json.dumps([{"symbol": "A", "v": 1}, {"symbol": "B", "v": 1}])
+        )
+        JournalStore(str(self.storage_path)).rotated_path.write_text(
+            '{"op":"put","asset":{"symbol":"A","v":2}}\n{"op":"delete","symbol":"B"}\n'
+        )
+        self.journal_path.write_text('{"op":"put","asset":{"symbol":"A","v":3}}\n')
+
+        store = JournalStore(str(self.storage_path))
+        self.assertEqual(store.load(), {"A": {"symbol": "A", "v": 3}})
+
+    def test_compaction_snapshot_is_taken_at_rotation(self):
+        state = {}
+        store = JournalStore(str(self.storage_path), max_records=2)
+        with patch("awesome_cli.core.crypto.storage.threading.Thread") as mock_thread:
+            state.update(BTC={"symbol": "BTC", "v": 1}, ETH={"symbol": "ETH", "v": 1})
+            store.save_changes(dict(state), lambda: list(state.values()))  # rotates
+            state["BTC"] = {"symbol": "BTC", "v": 2}
+            store.save_changes({"BTC": state["BTC"]}, lambda: list(state.values()))
+            # Changed but not yet journaled when the compactor gets to run
+            state.update(BTC={"symbol": "BTC", "v": 3}, ETH={"symbol": "ETH", "v": 3})
+            compactor = mock_thread.call_args.kwargs
+            compactor["target"](*compactor["args"])
+        store.close()
+
+        self.assertEqual(
+            JournalStore(str(self.storage_path)).load(),
+            {"BTC": {"symbol": "BTC", "v": 2}, "ETH": {"symbol": "ETH", "v": 1}},
+        )
+
+    def test_failed_compaction_is_retried_with_both_journals(self):
+        store = JournalStore(str(self.storage_path), max_records=1)
+        state = {"A": {"symbol": "A", "v": 1}}
+        with patch("awesome_cli.core.crypto.storage.write_snapshot",
+                   side_effect=OSError("disk full")):
+            store.save_changes(dict(state), lambda: list(state.values()))
+            store._compactor.join()
+        self.assertTrue(store.rotated_path.exists())
+
+        state["A"] = {"symbol": "A", "v": 2}
+        store.save_changes(dict(state), lambda: list(state.values()))
+        store.close()
+
+        self.assertFalse(store.rotated_path.exists())
+        self.assertFalse(self.journal_path.exists())
+        self.assertEqual(JournalStore(str(self.storage_path)).load(), state)
+
+    def test_full_save_resets_journal(self):
+        repo = self.make_repo()
+        repo.upsert(coins(3))
+        repo.save()
+        self.assertFalse(self.journal_path.exists())
+        self.assertEqual(len(json.loads(self.storage_path.read_text())), 3)
+
+    def test_create_store(self):
+        self.assertIsInstance(create_store(CryptoSettings()), JSONFileStore)
+        self.assertIsInstance(
+            create_store(CryptoSettings(storage_mode="journal")), JournalStore
+        )
+        with self.assertRaises(ValueError):
+            create_store(CryptoSettings(storage_mode="csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
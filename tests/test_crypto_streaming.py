@@ -0,0 +1,151 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from awesome_cli.config import CryptoSettings
+from awesome_cli.core.crypto.diff import ChangeSet
+from awesome_cli.core.crypto.fetcher import CryptoDataFetcher
+from awesome_cli.core.crypto.repository import CryptoAssetRepository
+from awesome_cli.core.crypto.scheduler import CryptoDataScheduler
+from awesome_cli.core.crypto.streaming import iter_json_array
+
+
+def _chunked(payload, size):
+    return [payload[i:i + size] for i in range(0, len(payload), size)]
+
+
+class TestIterJsonArray(unittest.TestCase):
+    def test_any_chunk_size(self):
+        data = [
+            {"id": i, "name": "é" * i, "nested": [i, {"x": None}]} for i in range(30)
+        ]
+        data += [1, 23.5, None, True, "text"]
+        payload = json.dumps(data).encode("utf-8")
+        for size in (1, 2, 7, 64, len(payload)):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_json_array(_chunked(payload, size))), data)
+
+    def test_yields_before_stream_ends(self):
+        def chunks():
+            yield b'[{"id": 1}, '
+            raise AssertionError("read past the first element")
+
+        self.assertEqual(next(iter_json_array(chunks())), {"id": 1})
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array([b" [ ] "])), [])
+
+    def test_malformed_input(self):
+        for payload in (b'{"a": 1}', b"[1,]", b"[1 2]", b"[1", b'[{"a":'):
+            with self.subTest(payload=payload):
+                with self.assertRaises(ValueError):
+                    list(iter_json_array(_chunked(payload, 2)))
+
+
+class TestStreamingFetch(unittest.TestCase):
+    def setUp(self):
+        self.settings = CryptoSettings(coingecko_rate_limit_requests=60000)
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    @patch("awesome_cli.core.crypto.fetcher.requests.Session")
+    def test_iter_top_coins_streams_normalized_coins(self, mock_session_cls):
+        mock_session = MagicMock()
+        mock_session_cls.return_value = mock_session
+        payload = json.dumps([
+            {"id": "bitcoin", "symbol": "btc", "current_price": "50000"},
+            {"symbol": "bad"},
+            {"id": "ethereum", "symbol": "eth", "current_price": 4000},
+        ]).encode()
+        response = MagicMock()
+        response.status_code = 200
+        response.iter_content.return_value = _chunked(payload, 16)
+        mock_session.get.return_value = response
+
+        fetcher = CryptoDataFetcher(self.settings)
+        coins = list(fetcher.iter_top_coins(limit=3, chunk_size=16))
+
+        self.assertEqual([c["symbol"] for c in coins], ["BTC", "ETH"])
+        self.assertEqual(coins[0]["current_price"], 50000.0)
+        self.assertTrue(mock_session.get.call_args.kwargs["stream"])
+        response.iter_content.assert_called_once_with(16)
+        response.close.assert_called_once()
+
+    def test_repository_upsert_iter(self):
+        settings = CryptoSettings(storage_path=str(Path(self.test_dir) / "assets.json"))
+        repo = CryptoAssetRepository(settings)
+
+        changes = repo.upsert_iter(
+            ({"symbol": f"C{i}", "total_volume": i} for i in range(25)), batch_size=10
+        )
+
+        self.assertEqual(len(changes.added), 25)
+        repo.close()
+        self.assertEqual(len(CryptoAssetRepository(settings).get_all()), 25)
+
+    def test_upsert_iter_keeps_batches_applied_before_a_failure(self):
+        settings = CryptoSettings(
+            storage_path=str(Path(self.test_dir) / "assets.json"),
+            storage_mode="journal",
+        )
+        repo = CryptoAssetRepository(settings)
+        repo.upsert([{"symbol": f"C{i}", "total_volume": 1.0} for i in range(5)])
+
+        def source():
+            for i in range(15):
+                yield {"symbol": f"C{i}", "total_volume": 2.0}
+            raise ConnectionError("stream cut")
+
+        with self.assertRaises(ConnectionError):
+            repo.upsert_iter(source(), batch_size=10, prune=True)
+
+        # The first batch is visible and persisted; nothing was pruned
+        self.assertEqual(repo.get_by_symbol("C0")["total_volume"], 2.0)
+        self.assertEqual(len(repo.get_all()), 10)
+        repo.close()
+        reloaded = CryptoAssetRepository(settings)
+        self.assertEqual(reloaded.get_by_symbol("C0")["total_volume"], 2.0)
+        reloaded.close()
+
+    def test_scheduler_streaming_refresh_logs_source_errors(self):
+        settings = CryptoSettings(
+            coingecko_stream_responses=True,
+            storage_path=str(Path(self.test_dir) / "assets.json"),
+        )
+        repo = CryptoAssetRepository(settings)
+
+        def coins(**kwargs):
+            # One full upsert_iter batch, then the connection drops
+            for i in range(500):
+                yield {"symbol": f"C{i}", "total_volume": 1.0}
+            raise ConnectionError("stream cut")
+
+        mock_fetcher = MagicMock()
+        mock_fetcher.iter_top_coins.side_effect = coins
+        scheduler = CryptoDataScheduler(settings, mock_fetcher, repo)
+
+        with self.assertLogs("awesome_cli.core.crypto.scheduler", "ERROR"):
+            self.assertTrue(scheduler._refresh_streaming(full=False))
+        self.assertEqual(len(repo.get_all()), 500)
+        repo.close()
+
+    def test_scheduler_streaming_refresh(self):
+        settings = CryptoSettings(coingecko_stream_responses=True)
+        mock_fetcher = MagicMock()
+        mock_repo = MagicMock()
+        mock_repo.upsert_iter.return_value = ChangeSet()
+
+        scheduler = CryptoDataScheduler(settings, mock_fetcher, mock_repo)
+
+        self.assertFalse(scheduler.refresh_now())
+        mock_fetcher.iter_top_coins.assert_called_once()
+        mock_repo.upsert.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()